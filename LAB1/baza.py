@@ -1,7 +1,17 @@
-import serial
-import threading
-import time
-from tkinter import Tk, Label, Button, Entry, StringVar, Text, Scrollbar, END, OptionMenu, messagebox, Frame
+import codecs
+import os
+import sys
+from tkinter import Tk, Label, Button, Entry, StringVar, BooleanVar, Checkbutton, Text, Scrollbar, END, OptionMenu, messagebox, Frame
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from netlab.metrics import Registry
+from netlab.multilink import MultiLink, open_links, parse_pairs
+from netlab.receive import Receiver
+from netlab.sink import OutputSink
+from netlab.transmit import Transmitter
+from netlab.transport import TRANSPORT_LABELS, open_link
+
+METRICS_INTERVAL_MS = 1000  # Период обновления скоростей и выгрузки метрик
 
 
 # Функция для выбора направления
@@ -16,85 +26,185 @@ def update_ports_direction(*args):
     receive_var.set(receive_port)
 
 
-# Функция для посимвольной отправки данных
+# Функция для отправки данных: сообщение уходит в фоновый передатчик целиком,
+# при включённом темпировании - побайтно со скоростью линии
 def send_data():
     message = entry_message.get()
     if message:
-        try:
-            sent_message = "".join(send_char(char) for char in message)
-            update_state(len(sent_message))
-            entry_message.set("")  
-        except serial.SerialException as e:
-            messagebox.showerror("Ошибка отправки", f"Ошибка при отправке данных: {e}")
+        if multilink is not None:
+            # Несколько каналов: сообщение уходит в передатчик каждого канала
+            for link in multilink.links:
+                if link.error is None:
+                    link_transmitters[link.name].submit(message.encode('utf-8'), paced=pacing_var.get())
+        else:
+            transmitter.submit(message.encode('utf-8'), paced=pacing_var.get())
+        entry_message.set("")
+
+
+def on_data_sent(bytes_sent, elapsed):
+    sent_bytes.inc(bytes_sent)
+    root.after(0, update_state)
 
 
-def send_char(char):
-    ser1.write(char.encode('utf-8'))  
-    time.sleep(0.1)  
-    return char
+def on_send_error(e):
+    root.after(0, messagebox.showerror, "Ошибка отправки", f"Ошибка при отправке данных: {e}")
 
 
-# Функция для чтения данных
-def read_data():
-    while True:
-        try:
-            if ser2.in_waiting > 0:
-                received_data = ser2.read(1)
-                display_received_data(received_data)
-            time.sleep(0.1)
-        except serial.SerialException as e:
-            messagebox.showerror("Ошибка приёма", f"Ошибка при чтении данных: {e}")
-            break
+# Функция для обработки ошибок чтения данных
+def on_receive_error(e):
+    root.after(0, messagebox.showerror, "Ошибка приёма", f"Ошибка при чтении данных: {e}")
 
 
+# Вывод принятых байт из потока приёма через очередь output_sink; декодер
+# сохраняет неполный многобайтовый символ до следующей порции данных
 def display_received_data(received_data):
+    received_bytes.inc(len(received_data))
     try:
-        decoded_char = received_data.decode('utf-8')
-        text_output.insert(END, decoded_char)
+        decoded_text = decoder.decode(received_data)
+        output_sink.put(decoded_text)
     except UnicodeDecodeError:
+        decoder.reset()
         hex_data = received_data.hex()
-        text_output.insert(END, f"[не декодировано: 0x{hex_data}]")
-    text_output.see(END)
+        output_sink.put(f"[не декодировано: 0x{hex_data}]")
+
+
+# Приём в режиме нескольких каналов: у каждого канала свой декодер
+def display_link_data(link, received_data):
+    decoder = link_decoders[link.name]
+    try:
+        output_sink.put(f"[{link.name}] {decoder.decode(received_data)}\n")
+    except UnicodeDecodeError:
+        decoder.reset()
+        output_sink.put(f"[{link.name}] [не декодировано: 0x{received_data.hex()}]\n")
+
+
+def on_link_error(link, e):
+    root.after(0, messagebox.showerror, "Ошибка приёма", f"Канал {link.name}: {e}")
+
+
+def on_link_sent(link, bytes_sent):
+    link.bytes_sent += bytes_sent
+
+
+def on_link_send_error(link, e):
+    root.after(0, messagebox.showerror, "Ошибка отправки", f"Канал {link.name}: {e}")
 
 
-# Функция для обновления состояния (количество переданных байт и скорость порта)
-def update_state(bytes_sent):
-    global total_bytes
-    total_bytes += bytes_sent
-    state_label.config(text=f"Скорость: {ser1.baudrate} бод, Передано байт: {total_bytes}")
+# Скорость каждого канала и суммарная раз в секунду
+def update_links_state():
+    if multilink is None or not multilink.running:
+        return
+    sent, received, rate = multilink.totals()
+    state_label.config(text=f"Каналов: {len(multilink.links)}, Передано байт: {sent}, "
+                            f"Принято: {received}, {rate:.0f} Б/с")
+    text_debug.delete("1.0", END)
+    text_debug.insert(END, "\n".join(multilink.report()))
+    root.after(1000, update_links_state)
+
+
+# Функция для обновления состояния (переданные байты и скорости за последние секунды)
+def update_state():
+    state_label.config(text=f"Скорость: {ser1.baudrate} бод, Передано байт: {sent_bytes.value}, "
+                            f"{metrics.rate('bytes_sent'):.0f} Б/с, Принято: {metrics.rate('bytes_received'):.0f} Б/с, "
+                            f"Факт: {transmitter.achieved_rate():.0f} из {transmitter.max_rate():.0f} Б/с")
+
+
+# Раз в секунду: скорости по счётчикам, строка состояния и выгрузка метрик
+def refresh_metrics():
+    metrics.tick()
+    if 'transmitter' in globals() and multilink is None:
+        update_state()
+    metrics.flush()
+    root.after(METRICS_INTERVAL_MS, refresh_metrics)
 
 
 # Функция для запуска программы
 def start_program():
-    global ser1, ser2, total_bytes
-    total_bytes = 0
+    global ser1, ser2, transmitter, receiver
+
+    if links_var.get().strip():
+        start_links()
+        return
+    close_links()
 
     send_port = send_var.get()
     receive_port = receive_var.get()
     baudrate = int(baudrate_var.get())
 
     try:
-        ser1 = serial.Serial(send_port, baudrate=baudrate, timeout=1)
-        ser2 = serial.Serial(receive_port, baudrate=baudrate, timeout=1)
+        ser1, ser2 = open_link(transport_var.get(), send_port, receive_port, baudrate)
+
+        transmitter = Transmitter(ser1, on_sent=on_data_sent, on_error=on_send_error)
+        receiver = Receiver(ser2, display_received_data, on_error=on_receive_error)
+
+        update_state()
+    except OSError as e:
+        messagebox.showerror("Ошибка порта", f"Не удалось открыть порт: {e}")
 
-        threading.Thread(target=read_data, daemon=True).start()
 
-        update_state(0)
-    except serial.SerialException as e:
+# Режим нескольких каналов: пары портов из поля "Каналы", приём всех
+# каналов одним потоком MultiLink
+def start_links():
+    global multilink
+    close_links()
+    try:
+        pairs = parse_pairs(links_var.get())
+        links = open_links(transport_var.get(), pairs, int(baudrate_var.get()))
+    except ValueError as e:
+        messagebox.showerror("Ошибка", str(e))
+        return
+    except OSError as e:
         messagebox.showerror("Ошибка порта", f"Не удалось открыть порт: {e}")
+        return
+    link_decoders.clear()
+    link_decoders.update((link.name, codecs.getincrementaldecoder('utf-8')()) for link in links)
+    # Передача по каждому каналу в своём потоке, чтобы запись не держала окно
+    link_transmitters.clear()
+    for link in links:
+        link_transmitters[link.name] = Transmitter(
+            link.tx, on_sent=lambda count, elapsed, link=link: on_link_sent(link, count),
+            on_error=lambda e, link=link: on_link_send_error(link, e))
+    multilink = MultiLink(links, display_link_data, on_error=on_link_error)
+    update_links_state()
+
+
+def close_links():
+    global multilink
+    if multilink is not None:
+        # Сначала передатчики отправляют поставленные сообщения, потом порты закрываются
+        for link_transmitter in link_transmitters.values():
+            link_transmitter.close(wait=True)
+        link_transmitters.clear()
+        multilink.stop(wait=True)
+        for link in multilink.links:
+            link.close()
+        multilink = None
 
 
 def close_ports():
+    close_links()
+    if 'transmitter' in globals():
+        transmitter.close(wait=True)
+    if 'receiver' in globals():
+        receiver.stop()
     if 'ser1' in globals() and ser1.is_open:
         ser1.close()
     if 'ser2' in globals() and ser2.is_open:
         ser2.close()
 
 
+decoder = codecs.getincrementaldecoder('utf-8')()
+metrics = Registry()
+sent_bytes = metrics.counter("bytes_sent", "Передано байт")
+received_bytes = metrics.counter("bytes_received", "Принято байт")
+multilink = None
+link_decoders = {}
+link_transmitters = {}
+
 # Создаем главное окно
 root = Tk()
 root.title("COM-порты: Передача и приём данных")
-root.geometry("800x600")  
+root.geometry("800x650")  
 root.configure(bg="#0D1B2A")  
 root.resizable(False, False)
 
@@ -125,6 +235,23 @@ baudrate_var.set("9600")
 baudrate_menu = OptionMenu(frame_top, baudrate_var, "9600", "19200", "38400", "57600", "115200")
 baudrate_menu.grid(row=3, column=1, padx=5, pady=5)
 
+Label(frame_top, text="Транспорт:", bg="#0D1B2A", fg="lightgray", font=("Arial", 12)).grid(row=4, column=0, sticky="w", pady=5)
+transport_var = StringVar(root)
+transport_var.set("COM-порты")
+transport_menu = OptionMenu(frame_top, transport_var, *TRANSPORT_LABELS)
+transport_menu.grid(row=4, column=1, padx=5, pady=5)
+
+pacing_var = BooleanVar(root)
+pacing_var.set(False)
+Checkbutton(frame_top, text="Побайтно со скоростью линии", variable=pacing_var, bg="#0D1B2A", fg="lightgray",
+            selectcolor="#0D1B2A", activebackground="#0D1B2A", font=("Arial", 12)).grid(row=5, column=0, sticky="w", pady=5)
+
+# Несколько каналов: пары ПЕРЕДАЧА:ПРИЁМ через пробел, например "COM1:COM2 COM6:COM5";
+# пустое поле - один канал по выбранному направлению
+Label(frame_top, text="Каналы (ПЕРЕДАЧА:ПРИЁМ ...):", bg="#0D1B2A", fg="lightgray", font=("Arial", 12)).grid(row=6, column=0, sticky="w", pady=5)
+links_var = StringVar(root)
+Entry(frame_top, textvariable=links_var, width=30).grid(row=6, column=1, padx=5, pady=5)
+
 # Средний фрейм для отправки сообщения
 frame_middle = Frame(root, bg="#0D1B2A")
 frame_middle.pack(pady=10, padx=20, fill="x")
@@ -160,6 +287,8 @@ scrollbar_debug = Scrollbar(frame_bottom, command=text_debug.yview)
 scrollbar_debug.grid(row=1, column=3, sticky='ns')
 text_debug.config(yscrollcommand=scrollbar_debug.set)
 
+output_sink = OutputSink(text_output)
+
 # Фрейм для состояния и кнопки запуска программы
 frame_bottom_buttons = Frame(root, bg="#0D1B2A")
 frame_bottom_buttons.pack(pady=20, padx=20, fill="x")
@@ -174,4 +303,5 @@ state_label.pack(side="right")
 
 # Завершение работы программы
 root.protocol("WM_DELETE_WINDOW", lambda: [close_ports(), root.destroy()])
+root.after(METRICS_INTERVAL_MS, refresh_metrics)
 root.mainloop()
@@ -1,135 +1,169 @@
-import serial
-import threading
-import time
-from tkinter import Tk, Label, Button, Entry, StringVar, Text, Scrollbar, END, OptionMenu, messagebox, Frame
-from tkinter import font
+import os
+import sys
+from tkinter import Tk, Label, Button, Entry, StringVar, BooleanVar, Checkbutton, Text, Scrollbar, OptionMenu, messagebox, Frame
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from netlab.fcs import FCS_NAMES, crc32
+from netlab.frame import DATA_LENGTH, HEADER_LENGTH, build_frame, port_address, stuff_frame, unpack_frame
+from netlab.metrics import LatencyProbe, Registry
+from netlab.receive import Receiver
+from netlab.ringbuffer import RingBuffer
+from netlab.segment import Reassembler, check_segment, create_segments, parse_segment, segment_frame_length
+from netlab.sink import OutputSink
+from netlab.transmit import Transmitter
+from netlab.transport import TRANSPORT_LABELS, open_link
 
-n = 5  
-FLAG = f"${chr(ord('a') + n)}"
-DATA_LENGTH = n + 1
-ESCAPE_BYTE = b'\x1b'
-FLAG_BYTE = b'$'
 
+FCS_LENGTH = 4  # В кадре фиксированной длины FCS - CRC-32 поля данных
+FRAME_LENGTH = HEADER_LENGTH + DATA_LENGTH + FCS_LENGTH  # Длина кадра после де-стаффинга
+METRICS_INTERVAL_MS = 1000  # Период обновления скоростей и выгрузки метрик
 
-def create_frame(data, source_port, dest_port):
-    flag = FLAG.encode('utf-8')
+
+def frame_addresses(source_port, dest_port):
     try:
-        destination_address = int(dest_port[-1]).to_bytes(1, 'big')
+        destination_address = port_address(dest_port)
     except ValueError:
         destination_address = b'\x00'  
     try:
-        source_address = int(source_port[-1]).to_bytes(1, 'big')
+        source_address = port_address(source_port)
     except ValueError:
         source_address = b'\x00'  
-    fcs = b'\x00' * 4
+    return destination_address, source_address
+
+
+def create_frame(data, source_port, dest_port):
+    destination_address, source_address = frame_addresses(source_port, dest_port)
     data_bytes = data.encode('utf-8').ljust(DATA_LENGTH, b'\x00')
-    frame = flag + destination_address + source_address + data_bytes + fcs
-    return byte_stuffing(frame)
-
-
-def byte_stuffing(frame):
-    stuffed_frame = frame.replace(ESCAPE_BYTE, ESCAPE_BYTE + ESCAPE_BYTE) 
-    stuffed_frame = stuffed_frame.replace(FLAG_BYTE, ESCAPE_BYTE + FLAG_BYTE) 
-    return stuffed_frame
-
-
-def byte_destuffing(stuffed_frame):
-    destuffed_frame = b''
-    i = 0
-    while i < len(stuffed_frame):
-        if stuffed_frame[i:i+1] == ESCAPE_BYTE:
-            if i + 1 < len(stuffed_frame):
-                destuffed_frame += stuffed_frame[i + 1:i + 2]
-                i += 2
-            else:
-                break  
-        else:
-            destuffed_frame += stuffed_frame[i:i+1]
-            i += 1
-    return destuffed_frame
+    frame = build_frame(data_bytes, destination_address, source_address, crc32(data_bytes))
+    return stuff_frame(frame)
+
+
+# Длинное сообщение режется на кадры переменной длины, которые уходят подряд
+def create_message_frames(data, source_port, dest_port):
+    global message_id
+    destination_address, source_address = frame_addresses(source_port, dest_port)
+    message_id = (message_id + 1) % 256
+    return create_segments(data.encode('utf-8'), destination_address[0], source_address[0], message_id,
+                           FCS_NAMES[fcs_var.get()])
 
 
 def send_data():
     message = entry_message.get()
     if message:
-        try:
-            frame = create_frame(message, send_var.get(), receive_var.get())
-            ser1.write(frame)
-            update_state(len(frame))
-            entry_message.set("") 
-        except serial.SerialException as e:
-            messagebox.showerror("Ошибка отправки", f"Ошибка при отправке данных: {e}")
-
-def read_data():
-    while True:
-        try:
-            if ser2.in_waiting > 0:
-                received_frame = ser2.read(ser2.in_waiting)
-                display_received_data(received_frame)
-            time.sleep(0.1)
-        except serial.SerialException as e:
-            messagebox.showerror("Ошибка приёма", f"Ошибка при чтении данных: {e}")
-            break
+        if variable_frames:
+            frames = b"".join(create_message_frames(message, send_var.get(), receive_var.get()))
+            latency.sent(message_id)
+        else:
+            frames = create_frame(message, send_var.get(), receive_var.get())
+            latency.sent()
+        transmitter.submit(frames)
+        entry_message.set("") 
+
+
+def on_data_sent(bytes_sent, elapsed):
+    sent_bytes.inc(bytes_sent)
+    root.after(0, update_state)
+
+
+def on_send_error(e):
+    root.after(0, messagebox.showerror, "Ошибка отправки", f"Ошибка при отправке данных: {e}")
+
+
+# Приём идёт в кольцо ring без промежуточных копий: received и кадры -
+# memoryview его буферов, действительные только внутри вызова
+def read_data(received):
+    received_bytes.inc(len(received))
+    debug_sink.put(f"Принятые байты (до де-стаффинга): {received.hex()}\n")
+    for frame in ring.frames():
+        received_frames.inc()
+        if variable_frames:
+            display_received_segment(frame)
+        else:
+            display_received_data(frame)
+
+
+def display_received_segment(frame):
+    dest_addr, src_addr, msg_id, seq, last, payload, fcs = parse_segment(frame)
+    if not check_segment(frame):
+        fcs_errors.inc()
+        latency.discard(msg_id)
+        reassembler.discard(src_addr, msg_id)
+        debug_sink.put(f"Сегмент {seq} сообщения {msg_id}: ошибка FCS, сообщение отброшено\n")
+        return
+    debug_sink.put(f"Сегмент {seq} сообщения {msg_id}: {len(payload)} байт{' (последний)' if last else ''}, "
+                   f"FCS {fcs.hex()}\n")
+    message = reassembler.add(src_addr, msg_id, seq, last, payload)
+    if message is not None:
+        latency.received(msg_id)
+        text = message.decode('utf-8', errors='replace')
+        output_sink.put(f"Dest: {dest_addr}, Src: {src_addr}, Сообщение {msg_id} ({len(message)} байт, "
+                        f"кадров: {seq + 1}): {text}\n")
+
+
+def on_receive_error(e):
+    root.after(0, messagebox.showerror, "Ошибка приёма", f"Ошибка при чтении данных: {e}")
 
 def display_received_data(received_frame):
-    try:
-        
-        text_debug.insert(END, f"Принятые байты (до де-стаффинга): {received_frame.hex()}\n")
-        text_debug.see(END)
-        
-        
-        received_frame = byte_destuffing(received_frame)
-        
-        
-        min_length = 4 + DATA_LENGTH
-        if len(received_frame) < min_length:
-            text_output.insert(END, f"[Ошибка: некорректная длина принятого кадра, минимальная длина {min_length}, получено {len(received_frame)}]\n")
-            text_output.insert(END, f"Принятые байты: {received_frame.hex()}\n")
-            text_output.see(END)
-            return
-        
-        
-        flag = received_frame[:2].decode('utf-8', errors='replace')
-        dest_addr = int.from_bytes(received_frame[2:3], 'big')
-        src_addr = int.from_bytes(received_frame[3:4], 'big')
-        data = received_frame[4:4 + DATA_LENGTH].decode('utf-8', errors='replace').rstrip('\x00')
-        fcs = received_frame[4 + DATA_LENGTH:].hex()
-        
-        text_output.insert(END, f"Flag: {flag}, Dest: {dest_addr}, Src: {src_addr}, Data: {data}, FCS: {fcs}\n")
-        text_output.insert(END, f"Принятые байты: {received_frame.hex()}\n")
-        text_output.see(END)
-    except UnicodeDecodeError:
-        text_output.insert(END, "[Ошибка декодирования данных]\n")
-        text_output.see(END)
-
-
-def update_state(bytes_sent):
-    global total_bytes
-    total_bytes += bytes_sent
-    state_label.config(text=f"Скорость: {ser1.baudrate} бод, Передано байт: {total_bytes}")
+    flag = str(received_frame[:2], 'utf-8', errors='replace')
+    dest_addr, src_addr, data_bytes, fcs = unpack_frame(received_frame)
+    data = str(data_bytes, 'utf-8', errors='replace').rstrip('\x00')
+    if crc32(data_bytes) == fcs:
+        status = "FCS корректен"
+    else:
+        status = "Ошибка FCS"
+        fcs_errors.inc()
+    latency.received()
+    output_sink.put(f"Flag: {flag}, Dest: {dest_addr}, Src: {src_addr}, Data: {data}, FCS: {fcs.hex()} [{status}]\n"
+                    f"Принятые байты: {received_frame.hex()}\n")
+
+
+def update_state():
+    frames = received_frames.value
+    errors = f"{fcs_errors.value / frames:.1%}" if frames else "-"
+    state_label.config(text=f"Скорость: {ser1.baudrate} бод, Передано байт: {sent_bytes.value}, "
+                            f"{metrics.rate('bytes_sent'):.0f} Б/с, {metrics.rate('frames_received'):.1f} кадр/с, "
+                            f"ошибки FCS: {errors}, задержка p50/p99: "
+                            f"{latency_histogram.percentile(50) * 1000:.1f}/{latency_histogram.percentile(99) * 1000:.1f} мс")
+
+
+# Раз в секунду: скорости по счётчикам, строка состояния и выгрузка метрик
+def refresh_metrics():
+    metrics.tick()
+    if 'ser1' in globals():
+        update_state()
+    metrics.flush()
+    root.after(METRICS_INTERVAL_MS, refresh_metrics)
 
 
 def start_program():
-    global ser1, ser2, total_bytes
-    total_bytes = 0
+    global ser1, ser2, receiver, transmitter, ring, reassembler, variable_frames
+    variable_frames = variable_var.get()
 
     send_port = send_var.get()
     receive_port = receive_var.get()
     baudrate = int(baudrate_var.get())
 
     try:
-        ser1 = serial.Serial(send_port, baudrate=baudrate, timeout=1)
-        ser2 = serial.Serial(receive_port, baudrate=baudrate, timeout=1)
+        ser1, ser2 = open_link(transport_var.get(), send_port, receive_port, baudrate)
 
-        threading.Thread(target=read_data, daemon=True).start()
+        if variable_frames:
+            ring = RingBuffer(segment_frame_length())
+        else:
+            ring = RingBuffer(FRAME_LENGTH)
+        reassembler = Reassembler()
+        transmitter = Transmitter(ser1, on_sent=on_data_sent, on_error=on_send_error)
+        receiver = Receiver(ser2, read_data, on_error=on_receive_error, ring=ring)
 
-        update_state(0)
-    except serial.SerialException as e:
+        update_state()
+    except OSError as e:
         messagebox.showerror("Ошибка порта", f"Не удалось открыть порт: {e}")
 
 
 def close_ports():
+    if 'transmitter' in globals():
+        transmitter.close()
+    if 'receiver' in globals():
+        receiver.stop()
     if 'ser1' in globals() and ser1.is_open:
         ser1.close()
     if 'ser2' in globals() and ser2.is_open:
@@ -146,6 +180,15 @@ def update_ports_direction():
         receive_var.set("COM5")
 
 
+message_id = 0
+metrics = Registry()
+sent_bytes = metrics.counter("bytes_sent", "Передано байт")
+received_bytes = metrics.counter("bytes_received", "Принято байт")
+received_frames = metrics.counter("frames_received", "Принято кадров")
+fcs_errors = metrics.counter("fcs_errors", "Кадров с ошибкой FCS")
+latency_histogram = metrics.histogram("latency_seconds", "Задержка от отправки до приёма сообщения, с")
+latency = LatencyProbe(latency_histogram)
+
 root = Tk()
 root.title("COM-порты: Передача и приём данных")
 root.geometry("800x600")  
@@ -179,6 +222,21 @@ baudrate_var.set("9600")
 baudrate_menu = OptionMenu(frame_top, baudrate_var, "9600", "19200", "38400", "57600", "115200")
 baudrate_menu.grid(row=3, column=1, padx=5, pady=5)
 
+Label(frame_top, text="Транспорт:", bg="#FFB6C1", fg="black", font=("Arial", 12)).grid(row=4, column=0, sticky="w", pady=5)
+transport_var = StringVar(root)
+transport_var.set("COM-порты")
+transport_menu = OptionMenu(frame_top, transport_var, *TRANSPORT_LABELS)
+transport_menu.grid(row=4, column=1, padx=5, pady=5)
+
+variable_var = BooleanVar(root)
+variable_var.set(False)
+Checkbutton(frame_top, text="Кадры переменной длины", variable=variable_var, bg="#FFB6C1", fg="black",
+            activebackground="#FFB6C1", font=("Arial", 12)).grid(row=5, column=0, sticky="w", pady=5)
+fcs_var = StringVar(root)
+fcs_var.set("CRC-32")
+fcs_menu = OptionMenu(frame_top, fcs_var, *FCS_NAMES)
+fcs_menu.grid(row=5, column=1, padx=5, pady=5)
+
 
 frame_middle = Frame(root, bg="#FFB6C1")
 frame_middle.pack(pady=10, padx=20, fill="x")
@@ -214,6 +272,10 @@ scrollbar_debug = Scrollbar(frame_bottom, command=text_debug.yview)
 scrollbar_debug.grid(row=1, column=3, sticky='ns')
 text_debug.config(yscrollcommand=scrollbar_debug.set)
 
+# Очереди вывода: потоки приёма пишут в них, виджеты обновляются из цикла Tk
+output_sink = OutputSink(text_output)
+debug_sink = OutputSink(text_debug)
+
 
 frame_bottom_buttons = Frame(root, bg="#FFB6C1")
 frame_bottom_buttons.pack(pady=20, padx=20, fill="x")
@@ -228,4 +290,5 @@ state_label.pack(side="right")
 
 
 root.protocol("WM_DELETE_WINDOW", lambda: [close_ports(), root.destroy()])
+root.after(METRICS_INTERVAL_MS, refresh_metrics)
 root.mainloop()
@@ -1,45 +1,30 @@
-import serial
-import threading
+import os
+import sys
 import time
-import random
-from tkinter import Tk, Label, Button, Entry, StringVar, Text, Scrollbar, END, OptionMenu, messagebox, Frame
-
-n = 5  
-FLAG = f"${chr(ord('a') + n)}"
-DATA_LENGTH = n + 1
-ESCAPE_BYTE = b'\x1b'
-FLAG_BYTE = b'$'
-CRC_POLYNOMIAL = 0x1D
-
-def crc8(data):
-    """Вычисление CRC-8 для данных."""
-    crc = 0
-    for byte in data:
-        crc ^= byte
-        for _ in range(8):
-            if crc & 0x80:
-                crc = (crc << 1) ^ CRC_POLYNOMIAL
-            else:
-                crc <<= 1
-            crc &= 0xFF
-    return crc.to_bytes(1, 'big')
-
-def correct_single_error(data, received_fcs, polynomial=0x1D):
-    """Исправление одиночной ошибки в данных."""
-    for i in range(len(data)):
-        for bit in range(8):
-            # Инвертируем каждый бит по очереди
-            modified_data = bytearray(data)
-            modified_data[i] ^= (1 << bit)
-            
-            # Вычисляем CRC для модифицированных данных
-            calculated_fcs = crc8(modified_data)
-            
-            # Проверяем, совпадает ли вычисленный FCS с переданным
-            if calculated_fcs == received_fcs:
-                return modified_data, True  # Ошибка исправлена
-            
-    return data, False  # Ошибка не исправлена
+from collections import deque
+from tkinter import Tk, Label, Button, Entry, StringVar, BooleanVar, Checkbutton, Text, Scrollbar, END, OptionMenu, messagebox, Frame
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from netlab.arq import MODES, ArqReceiver, ArqSender, RetransmissionTimer, ack_frame, data_frame, parse_arq_frame
+from netlab.channel import corrupt_data
+from netlab.crc import crc8, correct_single_error, error_candidates
+from netlab.deframer import Deframer
+from netlab.fcs import FCS_CRC8, FCS_NAMES, fcs_length
+from netlab.fec import fec_decode, fec_length
+from netlab.frame import DATA_LENGTH, create_frame, port_address, stuff_frame
+from netlab.metrics import LatencyProbe, Registry
+from netlab.receive import Receiver
+from netlab.segment import (HEADER_LENGTH, Reassembler, check_segment, create_segments, parse_segment, segment_body,
+                            segment_fcs_type, segment_frame_length)
+from netlab.transmit import Transmitter
+from netlab.transport import TRANSPORT_LABELS, open_link
+
+# Синдромы CRC-8 различимы только в пределах 255 бит, поэтому кадры с
+# исправлением одиночной ошибки должны быть короче 32 байт
+SEGMENT_SIZE = 16
+ARQ_TICK_MS = 10    # Период проверки тайм-аутов повтора
+ARQ_MAX_RTO = 2.0   # При искажении 70% кадров удвоение тайм-аута быстро упирается в потолок
+METRICS_INTERVAL_MS = 1000  # Период обновления скоростей и выгрузки метрик
 
 def display_received_data(frame):
     """Отображение принятого кадра в интерфейсе."""
@@ -69,119 +54,301 @@ def display_received_data(frame):
         text_output.insert(END, "Ошибка декодирования данных\n")
         text_output.see(END)
 
-def create_frame(data, source_port, dest_port):
-    """Создание кадра с флагом, адресами, данными и FCS."""
-    flag = FLAG.encode('utf-8')
-    destination_address = int(dest_port[-1]).to_bytes(1, 'big')
-    source_address = int(source_port[-1]).to_bytes(1, 'big')
-    data_bytes = data.encode('utf-8').ljust(DATA_LENGTH, b'\x00')
-    fcs = crc8(data_bytes)  # Вычисление FCS (CRC-8)
-    frame = flag + destination_address + source_address + data_bytes + fcs
-    return byte_stuffing(frame)
-
-def byte_stuffing(frame):
-    """Экранирование флага и управляющих символов."""
-    return frame.replace(ESCAPE_BYTE, ESCAPE_BYTE + ESCAPE_BYTE).replace(FLAG_BYTE, ESCAPE_BYTE + FLAG_BYTE)
-
-def byte_destuffing(stuffed_frame):
-    """Удаление экранирующих байтов."""
-    result = b''
-    i = 0
-    while i < len(stuffed_frame):
-        if stuffed_frame[i:i+1] == ESCAPE_BYTE and i + 1 < len(stuffed_frame):
-            i += 1
-        result += stuffed_frame[i:i+1]
-        i += 1
-    return result
-
-def corrupt_data(data):
-    """Случайное искажение одного бита в данных."""
-    if random.random() < 0.7:  # 70% вероятность искажения
-        byte_index = random.randint(0, len(data) - 1)
-        bit_index = random.randint(0, 7)
-        corrupted_byte = data[byte_index] ^ (1 << bit_index)
-        data = data[:byte_index] + bytes([corrupted_byte]) + data[byte_index + 1:]
-    return data
+def create_message_frames(message, source_port, dest_port):
+    """Разбиение сообщения на кадры переменной длины с CRC-8."""
+    global message_id
+    message_id = (message_id + 1) % 256
+    destination = port_address(dest_port)[0]
+    source = port_address(source_port)[0]
+    return b"".join(create_segments(message.encode('utf-8'), destination, source, message_id,
+                                    FCS_NAMES[fcs_var.get()], SEGMENT_SIZE))
 
 def send_data():
     """Отправка данных через COM-порт."""
     message = entry_message.get()
     if message:
         try:
-            frame = create_frame(message, send_var.get(), receive_var.get())
-            ser1.write(frame)
-            update_state(len(frame))
-            entry_message.set("")  # Очистка поля ввода
-        except serial.SerialException as e:
+            if arq_mode:
+                arq_enqueue(message, send_var.get(), receive_var.get())
+                latency.sent()
+            elif variable_frames:
+                transmitter.submit(create_message_frames(message, send_var.get(), receive_var.get()))
+                latency.sent(message_id)
+            else:
+                transmitter.submit(create_frame(message, send_var.get(), receive_var.get(), fec=use_fec))
+                latency.sent()
+        except ValueError as e:
             messagebox.showerror("Ошибка отправки", str(e))
-
-def read_data():
-    """Чтение данных с COM-порта."""
-    while True:
+            return
+        entry_message.set("")  # Очистка поля ввода
+
+def arq_enqueue(message, source_port, dest_port):
+    """Постановка сообщения в очередь надёжной передачи по кускам SEGMENT_SIZE."""
+    global arq_addresses
+    arq_addresses = (port_address(dest_port)[0], port_address(source_port)[0])
+    data = message.encode('utf-8')
+    for offset in range(0, len(data), SEGMENT_SIZE):
+        arq_queue.append((data[offset:offset + SEGMENT_SIZE], offset + SEGMENT_SIZE >= len(data)))
+    arq_pump()
+
+def arq_pump():
+    """Отправка кадров из очереди, пока есть место в окне."""
+    while arq_queue and arq_sender.can_send():
+        payload, last = arq_queue.popleft()
+        seq = arq_sender.send((payload, last), time.monotonic())
+        arq_transmit(seq, payload, last)
+
+def arq_transmit(seq, payload, last):
+    transmitter.submit(stuff_frame(data_frame(seq, payload, last, *arq_addresses, FCS_NAMES[fcs_var.get()])))
+
+def arq_tick():
+    """Повтор кадров с истёкшим тайм-аутом; вызывается циклом Tk."""
+    if not ser1.is_open:
+        return
+    for seq, (payload, last) in arq_sender.poll(time.monotonic()):
+        text_debug.insert(END, f"Тайм-аут, повтор кадра {seq} (RTO {arq_sender.timer.rto * 1000:.0f} мс)\n")
+        text_debug.see(END)
+        arq_transmit(seq, payload, last)
+    arq_pump()
+    root.after(ARQ_TICK_MS, arq_tick)
+
+def on_data_sent(bytes_sent, elapsed):
+    """Кадры записаны в порт (вызывается из потока передачи)."""
+    sent_bytes.inc(bytes_sent)
+    root.after(0, update_state)
+
+def on_send_error(e):
+    """Ошибка записи в COM-порт."""
+    root.after(0, messagebox.showerror, "Ошибка отправки", str(e))
+
+def read_data(received):
+    """Обработка данных, принятых с COM-порта."""
+    received_bytes.inc(len(received))
+    # Одна порция - не обязательно один кадр: кадры выделяет deframer
+    for frame in deframer.feed(received):
+        if arq_mode:
+            root.after(0, receive_arq_frame, corrupt_segment(frame))
+        elif variable_frames:
+            root.after(0, display_received_segment, corrupt_segment(frame))
+        elif use_fec:
+            field_end = 4 + fec_length(DATA_LENGTH)
+            frame = frame[:4] + corrupt_data(frame[4:field_end]) + frame[field_end:]
+            root.after(0, display_fec_frame, frame)
+        else:
+            corrupted_data = corrupt_data(frame[4:4 + DATA_LENGTH])
+            frame = frame[:4] + corrupted_data + frame[4 + DATA_LENGTH:]
+            root.after(0, display_received_data, frame)
+
+def display_fec_frame(frame):
+    """Отображение кадра с полем данных в коде SECDED: исправление без перебора."""
+    field_end = 4 + fec_length(DATA_LENGTH)
+    flag = frame[:2].decode('utf-8', errors='replace')
+    dest_addr = frame[2]
+    src_addr = frame[3]
+    data, corrected, detected = fec_decode(frame[4:field_end], DATA_LENGTH)
+    text = data.decode('utf-8', errors='replace').rstrip('\x00')
+    received_fcs = frame[field_end:]
+    calculated_fcs = crc8(data)
+    received_frames.inc()
+    if detected:
+        status = "FEC: двойная ошибка обнаружена, не исправлена"
+    elif corrected:
+        status = "FEC: ошибка исправлена"
+        corrected_frames.inc()
+    else:
+        status = "FEC: ошибок нет"
+    if received_fcs == calculated_fcs:
+        fcs_status = "FCS корректен"
+    else:
+        fcs_status = "Ошибка FCS"
+        fcs_errors.inc()
+    latency.received()
+    text_output.insert(END, f"Принято | {flag} | Dest: {dest_addr} | Src: {src_addr} | "
+                            f"Data: {text} | "
+                            f"FCS: {received_fcs.hex()} / {calculated_fcs.hex()} [{status}; {fcs_status}]\n")
+    text_output.see(END)
+
+def corrupt_segment(frame):
+    """Искажение поля данных кадра переменной длины."""
+    payload_end = len(frame) - fcs_length(segment_fcs_type(frame))
+    return frame[:HEADER_LENGTH] + corrupt_data(frame[HEADER_LENGTH:payload_end]) + frame[payload_end:]
+
+def receive_arq_frame(frame):
+    """Приём кадра данных ARQ: без исправления, искажённый кадр ждёт повтора."""
+    global arq_message
+    received_frames.inc()
+    parsed = parse_arq_frame(frame)
+    if parsed is None:
+        fcs_errors.inc()
+        text_debug.insert(END, "Ошибка FCS, кадр отброшен\n")
+        text_debug.see(END)
+        return
+    dest_addr, src_addr, is_ack, seq, last, payload = parsed
+    delivered, ack = arq_receiver.on_frame(seq, (payload, last))
+    if ack is not None:
         try:
-            if ser2.in_waiting > 0:
-                frame = byte_destuffing(ser2.read(ser2.in_waiting))
-                corrupted_data = corrupt_data(frame[4:4 + DATA_LENGTH])
-                frame = frame[:4] + corrupted_data + frame[4 + DATA_LENGTH:]
-                display_received_data(frame)
-            time.sleep(0.1)
-        except serial.SerialException as e:
-            messagebox.showerror("Ошибка приёма", str(e))
-            break
-
-def display_received_data(frame):
-    """Отображение принятого кадра с ошибкой и исправленного кадра в интерфейсе."""
-    try:
-        flag = frame[:2].decode('utf-8')
-        dest_addr = int.from_bytes(frame[2:3], 'big')
-        src_addr = int.from_bytes(frame[3:4], 'big')
-        data = frame[4:4 + DATA_LENGTH].decode('utf-8').rstrip('\x00')
-        received_fcs = frame[4 + DATA_LENGTH:]
-        calculated_fcs = crc8(frame[4:4 + DATA_LENGTH])
-
-        # Сначала выводим принятый кадр как есть
-        status = "Ошибка FCS" if received_fcs != calculated_fcs else "FCS корректен"
-        text_output.insert(END, f"Принято | {flag} | Dest: {dest_addr} | Src: {src_addr} | "
-                                f"Data: {data} | FCS: {received_fcs.hex()} / {calculated_fcs.hex()} [{status}]\n")
+            ser2.write(stuff_frame(ack_frame(ack, src_addr, dest_addr, segment_fcs_type(frame))))
+        except OSError as e:
+            messagebox.showerror("Ошибка отправки", str(e))
+    for payload, last in delivered:
+        arq_message += payload
+        if last:
+            latency.received()
+            text_output.insert(END, f"Dest: {dest_addr} | Src: {src_addr} | Сообщение ({len(arq_message)} байт): "
+                                    f"{arq_message.decode('utf-8', errors='replace')}\n")
+            text_output.see(END)
+            arq_message = bytearray()
+
+def read_acks(received):
+    """Подтверждения, пришедшие на порт отправки."""
+    for frame in ack_deframer.feed(received):
+        root.after(0, receive_ack, frame)
+
+def receive_ack(frame):
+    parsed = parse_arq_frame(frame)
+    if parsed is not None and parsed[2]:
+        arq_sender.on_ack(parsed[3], time.monotonic())
+        arq_pump()
+        update_state()
+
+def display_received_segment(frame):
+    """Проверка FCS сегмента, исправление одиночной ошибки и сборка сообщения."""
+    dest_addr, src_addr, msg_id, seq, last, payload, received_fcs = parse_segment(frame)
+    body = segment_body(frame)
+    received_frames.inc()
+    if check_segment(frame):
+        status = "FCS корректен"
+    else:
+        fcs_errors.inc()
+        # Исправление одиночной ошибки по синдрому есть только для CRC-8
+        if segment_fcs_type(frame) == FCS_CRC8:
+            corrected_body, error_fixed = correct_single_error(body, received_fcs)
+        else:
+            error_fixed = False
+        if not error_fixed:
+            # Искажённый сегмент не собрать - отбрасываем всё сообщение
+            reassembler.discard(src_addr, msg_id)
+            latency.discard(msg_id)
+            text_debug.insert(END, f"Сегмент {seq} сообщения {msg_id}: ошибка FCS не исправлена, сообщение отброшено\n")
+            text_debug.see(END)
+            return
+        frame = frame[:len(frame) - len(body) - len(received_fcs)] + bytes(corrected_body) + received_fcs
+        dest_addr, src_addr, msg_id, seq, last, payload, received_fcs = parse_segment(frame)
+        status = "Ошибка исправлена"
+        corrected_frames.inc()
+    text_debug.insert(END, f"Сегмент {seq} сообщения {msg_id}: {len(payload)} байт [{status}]\n")
+    text_debug.see(END)
+    message = reassembler.add(src_addr, msg_id, seq, last, payload)
+    if message is not None:
+        latency.received(msg_id)
+        text_output.insert(END, f"Dest: {dest_addr} | Src: {src_addr} | Сообщение {msg_id} "
+                                f"({len(message)} байт, кадров: {seq + 1}): {message.decode('utf-8', errors='replace')}\n")
         text_output.see(END)
 
-        # Если обнаружена ошибка FCS, пытаемся исправить
-        if received_fcs != calculated_fcs:
-            corrected_data, error_fixed = correct_single_error(frame[4:4 + DATA_LENGTH], received_fcs)
-            if error_fixed:
-                # Если ошибка исправлена, заново декодируем данные
-                corrected_data_str = corrected_data.decode('utf-8').rstrip('\x00')
-                calculated_fcs = crc8(corrected_data)
-                status = "Ошибка исправлена"
-                text_output.insert(END, f"Исправлено | {flag} | Dest: {dest_addr} | Src: {src_addr} | "
-                                        f"Data: {corrected_data_str} | FCS: {received_fcs.hex()} / {calculated_fcs.hex()} [{status}]\n")
-            else:
-                status = "Ошибка не исправлена"
-        text_output.see(END)
-    except UnicodeDecodeError:
-        text_output.insert(END, "Ошибка декодирования данных\n")
-        text_output.see(END)
+def on_receive_error(e):
+    """Ошибка чтения с COM-порта (из потока приёма)."""
+    root.after(0, messagebox.showerror, "Ошибка приёма", str(e))
 
-def update_state(bytes_sent):
-    """Обновление состояния передачи."""
-    global total_bytes
-    total_bytes += bytes_sent
-    state_label.config(text=f"Скорость: {ser1.baudrate} бод | Передано байт: {total_bytes}")
+def display_received_data(frame):
+    """Отображение принятого кадра с ошибкой и исправленного кадра в интерфейсе."""
+    received_fcs = frame[4 + DATA_LENGTH:]
+    calculated_fcs = crc8(frame[4:4 + DATA_LENGTH])
+    # Счётчики и задержка - до декодирования: искажённый байт может оказаться
+    # недопустимым в UTF-8, но кадр всё равно принят
+    received_frames.inc()
+    latency.received()
+    if received_fcs != calculated_fcs:
+        fcs_errors.inc()
+
+    flag = frame[:2].decode('utf-8', errors='replace')
+    dest_addr = int.from_bytes(frame[2:3], 'big')
+    src_addr = int.from_bytes(frame[3:4], 'big')
+    data = frame[4:4 + DATA_LENGTH].decode('utf-8', errors='replace').rstrip('\x00')
+
+    # Сначала выводим принятый кадр как есть
+    status = "Ошибка FCS" if received_fcs != calculated_fcs else "FCS корректен"
+    text_output.insert(END, f"Принято | {flag} | Dest: {dest_addr} | Src: {src_addr} | "
+                            f"Data: {data} | FCS: {received_fcs.hex()} / {calculated_fcs.hex()} [{status}]\n")
+
+    # Если обнаружена ошибка FCS, пытаемся исправить
+    if received_fcs != calculated_fcs:
+        corrected_data, error_fixed = correct_single_error(frame[4:4 + DATA_LENGTH], received_fcs)
+        if error_fixed:
+            corrected_frames.inc()
+            # Если ошибка исправлена, заново декодируем данные
+            corrected_data_str = corrected_data.decode('utf-8', errors='replace').rstrip('\x00')
+            calculated_fcs = crc8(corrected_data)
+            status = "Ошибка исправлена"
+            text_output.insert(END, f"Исправлено | {flag} | Dest: {dest_addr} | Src: {src_addr} | "
+                                    f"Data: {corrected_data_str} | FCS: {received_fcs.hex()} / {calculated_fcs.hex()} [{status}]\n")
+        elif len(error_candidates(frame[4:4 + DATA_LENGTH], received_fcs)) > 1:
+            # Синдром соответствует нескольким позициям - исправлять наугад нельзя
+            status = "Неоднозначный синдром, ошибка не исправлена"
+            text_output.insert(END, f"{status}\n")
+        else:
+            status = "Ошибка не исправлена"
+    text_output.see(END)
+
+def update_state():
+    """Обновление состояния передачи: счётчики и скорости за последние секунды."""
+    frames = received_frames.value
+    errors = f"{fcs_errors.value / frames:.1%}" if frames else "-"
+    state = (f"Скорость: {ser1.baudrate} бод | Передано байт: {sent_bytes.value} | "
+             f"{metrics.rate('bytes_sent'):.0f} Б/с, {metrics.rate('frames_received'):.1f} кадр/с | "
+             f"Ошибки FCS: {errors}, исправлено: {corrected_frames.value} | "
+             f"Задержка p50/p99: {latency_histogram.percentile(50) * 1000:.1f}/"
+             f"{latency_histogram.percentile(99) * 1000:.1f} мс")
+    if arq_mode:
+        state += f" | Повторы: {arq_sender.retransmissions} из {arq_sender.sent}"
+    state_label.config(text=state)
+
+def refresh_metrics():
+    """Раз в секунду: скорости по счётчикам, строка состояния и выгрузка метрик."""
+    metrics.tick()
+    if 'ser1' in globals():
+        update_state()
+    metrics.flush()
+    root.after(METRICS_INTERVAL_MS, refresh_metrics)
 
 def start_program():
     """Запуск программы и открытие портов."""
-    global ser1, ser2, total_bytes
-    total_bytes = 0
+    global ser1, ser2, receiver, transmitter, deframer, reassembler, variable_frames
+    global arq_mode, arq_sender, arq_receiver, arq_queue, arq_message, ack_deframer, ack_receiver, use_fec
+    variable_frames = variable_var.get()
+    use_fec = fec_var.get()
+    arq_mode = MODES.get(arq_var.get())
     try:
-        ser1 = serial.Serial(send_var.get(), baudrate=int(baudrate_var.get()), timeout=1)
-        ser2 = serial.Serial(receive_var.get(), baudrate=int(baudrate_var.get()), timeout=1)
-        threading.Thread(target=read_data, daemon=True).start()
-        update_state(0)
-    except serial.SerialException as e:
+        ser1, ser2 = open_link(transport_var.get(), send_var.get(), receive_var.get(), int(baudrate_var.get()))
+        if variable_frames or arq_mode:
+            deframer = Deframer(segment_frame_length(SEGMENT_SIZE))
+        else:
+            # Кадр фиксированной длины: флаг и адреса, поле данных (в коде SECDED с FEC), CRC-8
+            data_length = fec_length(DATA_LENGTH) if use_fec else DATA_LENGTH
+            deframer = Deframer(4 + data_length + fcs_length(FCS_CRC8))
+        reassembler = Reassembler()
+        transmitter = Transmitter(ser1, on_sent=on_data_sent, on_error=on_send_error)
+        receiver = Receiver(ser2, read_data, on_error=on_receive_error)
+        if arq_mode:
+            window = int(window_var.get())
+            arq_sender = ArqSender(arq_mode, window, RetransmissionTimer(maximum=ARQ_MAX_RTO))
+            arq_receiver = ArqReceiver(arq_mode, window)
+            arq_queue = deque()
+            arq_message = bytearray()
+            ack_deframer = Deframer(segment_frame_length(SEGMENT_SIZE))
+            ack_receiver = Receiver(ser1, read_acks, on_error=on_receive_error)
+            root.after(ARQ_TICK_MS, arq_tick)
+        update_state()
+    except OSError as e:
         messagebox.showerror("Ошибка порта", str(e))
 
 def close_ports():
     """Закрытие портов при завершении программы."""
+    if 'transmitter' in globals():
+        transmitter.close()
+    if 'receiver' in globals():
+        receiver.stop()
+    if 'ack_receiver' in globals():
+        ack_receiver.stop()
     if 'ser1' in globals() and ser1.is_open:
         ser1.close()
     if 'ser2' in globals() and ser2.is_open:
@@ -197,6 +364,16 @@ def update_ports_direction():
         send_var.set("COM6")
         receive_var.set("COM5")
 
+message_id = 0
+metrics = Registry()
+sent_bytes = metrics.counter("bytes_sent", "Передано байт")
+received_bytes = metrics.counter("bytes_received", "Принято байт")
+received_frames = metrics.counter("frames_received", "Принято кадров")
+fcs_errors = metrics.counter("fcs_errors", "Кадров с ошибкой FCS")
+corrected_frames = metrics.counter("frames_corrected", "Кадров с исправленной ошибкой")
+latency_histogram = metrics.histogram("latency_seconds", "Задержка от отправки до приёма сообщения, с")
+latency = LatencyProbe(latency_histogram)
+
 # Интерфейс программы
 root = Tk()
 root.title("COM-порты: Передача и приём данных")
@@ -230,6 +407,36 @@ baudrate_var.set("9600")
 baudrate_menu = OptionMenu(frame_top, baudrate_var, "9600", "19200", "38400", "57600", "115200")
 baudrate_menu.grid(row=3, column=1, padx=5, pady=5)
 
+Label(frame_top, text="Транспорт:", bg="#FFB6C1", fg="black", font=("Arial", 12)).grid(row=4, column=0, sticky="w", pady=5)
+transport_var = StringVar(root)
+transport_var.set("COM-порты")
+transport_menu = OptionMenu(frame_top, transport_var, *TRANSPORT_LABELS)
+transport_menu.grid(row=4, column=1, padx=5, pady=5)
+
+variable_var = BooleanVar(root)
+variable_var.set(False)
+Checkbutton(frame_top, text="Кадры переменной длины", variable=variable_var, bg="#FFB6C1", fg="black",
+            activebackground="#FFB6C1", font=("Arial", 12)).grid(row=5, column=0, sticky="w", pady=5)
+fcs_var = StringVar(root)
+fcs_var.set("CRC-8")
+fcs_menu = OptionMenu(frame_top, fcs_var, *FCS_NAMES)
+fcs_menu.grid(row=5, column=1, padx=5, pady=5)
+
+Label(frame_top, text="Надёжная доставка (окно):", bg="#FFB6C1", fg="black", font=("Arial", 12)).grid(row=6, column=0, sticky="w", pady=5)
+arq_var = StringVar(root)
+arq_var.set("Без ARQ")
+arq_menu = OptionMenu(frame_top, arq_var, "Без ARQ", *MODES)
+arq_menu.grid(row=6, column=1, padx=5, pady=5)
+window_var = StringVar(root)
+window_var.set("8")
+window_menu = OptionMenu(frame_top, window_var, "1", "4", "8", "16", "32")
+window_menu.grid(row=6, column=2, padx=5, pady=5)
+
+fec_var = BooleanVar(root)
+fec_var.set(False)
+Checkbutton(frame_top, text="Исправление SECDED (FEC)", variable=fec_var, bg="#FFB6C1", fg="black",
+            activebackground="#FFB6C1", font=("Arial", 12)).grid(row=7, column=0, sticky="w", pady=5)
+
 frame_middle = Frame(root, bg="#FFB6C1")
 frame_middle.pack(pady=10, padx=20, fill="x")
 
@@ -270,4 +477,5 @@ state_label = Label(frame_bottom_buttons, text="Скорость: неизвес
 state_label.pack(side="right")
 
 root.protocol("WM_DELETE_WINDOW", lambda: [close_ports(), root.destroy()])
+root.after(METRICS_INTERVAL_MS, refresh_metrics)
 root.mainloop()
@@ -1,95 +1,112 @@
-import serial
-import threading
+import os
+import sys
 import time
-import random
+from collections import Counter
 from tkinter import Tk, Label, Button, Entry, StringVar, Text, Scrollbar, END, OptionMenu, messagebox, Frame
 
-# Параметры передачи и эмуляции
-n = 5  
-FLAG = f"${chr(ord('a') + n)}"
-DATA_LENGTH = n + 1
-ESCAPE_BYTE = b'\x1b'
-FLAG_BYTE = b'$'
-CRC_POLYNOMIAL = 0x1D
-
-CHANNEL_BUSY_PROBABILITY = 0.5
-COLLISION_PROBABILITY = 0.6
-
-total_bytes = 0  # Общее количество переданных байт
-
-JAM_SIGNAL = b'JAM'  # Определение jam-сигнала
-
-
-def crc8(data):
-    """Вычисление CRC-8 для данных."""
-    crc = 0
-    for byte in data:
-        crc ^= byte
-        for _ in range(8):
-            if crc & 0x80:
-                crc = (crc << 1) ^ CRC_POLYNOMIAL
-            else:
-                crc <<= 1
-            crc &= 0xFF
-    return crc.to_bytes(1, 'big')
-
-def is_channel_busy():
-    """Эмуляция занятости канала."""
-    return random.random() < CHANNEL_BUSY_PROBABILITY
-
-def is_collision_occurred():
-    """Эмуляция коллизии."""
-    return random.random() < COLLISION_PROBABILITY
-
-def calculate_backoff(attempt):
-    """Рассчет задержки (backoff) с учетом номера попытки."""
-    k = min(attempt, 10)  # k = min(n, 10), где n — номер попытки
-    return random.uniform(0, (2 ** k) - 1) / 100  # Задержка в миллисекундах
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from netlab import frame as link_frame
+from netlab.backoff import SLOT_TIME, STRATEGIES, efficiency, make_backoff
+from netlab.csma import JAM_SIGNAL, MAX_ATTEMPTS, csma_cd
+from netlab.des import run_realtime, simulate_csma_cd
+from netlab.frame import DATA_LENGTH, HEADER_LENGTH
+from netlab.metrics import LatencyProbe, Registry
+from netlab.receive import Receiver
+from netlab.deframer import Deframer
+from netlab.transport import TRANSPORT_LABELS, open_link
+from netlab.txqueue import TxQueue
+
+METRICS_INTERVAL_MS = 1000  # Период обновления скоростей и выгрузки метрик
+SIMULATED_FRAMES = 1000     # Кадров в одном прогоне модели
+TX_QUEUE_SIZE = 16          # Сколько кадров может ждать передачи
+FRAME_LENGTH = HEADER_LENGTH + DATA_LENGTH + 1  # Кадр после де-стаффинга, FCS - CRC-8
+
+metrics = Registry()
+sent_bytes = metrics.counter("bytes_sent", "Передано байт")
+sent_frames = metrics.counter("frames_sent", "Передано кадров")
+received_frames = metrics.counter("frames_received", "Принято кадров")
+collisions = metrics.counter("collisions", "Коллизий")
+dropped_frames = metrics.counter("frames_dropped", "Кадров, отброшенных после предельного числа попыток")
+jams_received = metrics.counter("jams_received", "Принято jam-сигналов")
+latency_histogram = metrics.histogram("latency_seconds", "Задержка от записи кадра до приёма, с")
+latency = LatencyProbe(latency_histogram)
+
+
+def count_csma_event(frame, event, attempt, delay):
+    """Шаг CSMA/CD в потоке передачи: только счётчики, вывод - в потоке Tk."""
+    if event == "collision":
+        collisions.inc()
+    elif event == "sent":
+        sent_bytes.inc(len(frame))
+        sent_frames.inc()
+    elif event == "dropped":
+        # Если превышено число попыток, игнорируем кадр
+        dropped_frames.inc()
+    root.after(0, show_csma_event, frame, event, attempt, delay)
+
+
+def show_csma_event(frame, event, attempt, delay):
+    """Отображение шага CSMA/CD: канал занят, jam-сигнал, коллизия, передача, отказ."""
+    if event == "busy":
+        text_debug.insert(END, "Канал занят, ожидание...\n")
+    elif event == "jam":
+        text_debug.insert(END, "Jam-сигнал отправлен!\n")
+    elif event == "collision":
+        display_frame_status(frame, collision_occurred=True)
+        text_debug.insert(END, f"Коллизия {attempt}, ожидание {delay:.3f} сек.\n")
+    elif event == "sent":
+        display_frame_status(frame, collision_occurred=False)
+        update_state()
+    elif event == "dropped":
+        text_debug.insert(END, f"Кадр проигнорирован после {attempt} попыток.\n")
+    text_debug.see(END)
 
 
-def jam_signal():
-    """Отправка jam-сигнала."""
-    text_debug.insert(END, "Jam-сигнал отправлен!\n")
+def write_to_line(data):
+    """Запись кадра или jam-сигнала в порт."""
+    if data != JAM_SIGNAL:
+        latency.sent()
+    ser1.write(data)
+
+
+def send_frame_with_csma_cd(item):
+    """Отправка кадра с использованием CSMA/CD в реальном времени.
+
+    Логика (netlab.csma.csma_cd) та же, что и в моделировании, только
+    паузы - настоящие time.sleep. Выполняется в потоке очереди передачи,
+    поэтому число попыток приходит вместе с кадром, а не из виджета.
+    """
+    frame, max_attempts = item
+    process = csma_cd(frame, on_event=lambda event, attempt, delay: count_csma_event(frame, event, attempt, delay),
+                      backoff=backoff, max_attempts=max_attempts)
+    run_realtime(process, write_to_line)
+
+
+def update_backoff():
+    """Новая стратегия backoff или слот (адаптивная начинает оценку частоты коллизий заново)."""
+    global backoff
+    backoff = make_backoff(backoff_var.get(), float(slot_var.get()))
+
+
+def simulate_frames():
+    """Прогон SIMULATED_FRAMES кадров той же логикой CSMA/CD в модельном времени."""
+    frame = create_frame(entry_message.get() or "hello", send_var.get(), receive_var.get())
+    if frame is None:
+        return
+    start = time.perf_counter()
+    log, model_time, _, delays = simulate_csma_cd(SIMULATED_FRAMES, int(baudrate_var.get()), seed=None, frame=frame,
+                                                  backoff=make_backoff(backoff_var.get(), float(slot_var.get())),
+                                                  max_attempts=int(attempts_var.get()))
+    elapsed = time.perf_counter() - start
+    events = Counter(event for _, event, _, _ in log)
+    result = efficiency(events["sent"], events["dropped"], delays, model_time)
+    text_debug.insert(END, f"Модель ({backoff_var.get()}, слот {slot_var.get()} с, {attempts_var.get()} попыток): "
+                           f"{SIMULATED_FRAMES} кадров, "
+                           f"передано {events['sent']}, коллизий {events['collision']}, канал занят {events['busy']}; "
+                           f"{result['throughput']:.2f} кадр/с, задержка доступа ср/p99 "
+                           f"{result['mean_delay']:.3f}/{result['p99_delay']:.3f} с, отброшено {result['drop_rate']:.1%}; "
+                           f"модельное время {model_time:.0f} с, расчёт {elapsed:.2f} с\n")
     text_debug.see(END)
-    time.sleep(0.1)  # Пауза перед отправкой
-    ser1.write(JAM_SIGNAL)  # Отправляем jam-сигнал
-
-
-def send_frame_with_csma_cd(frame):
-    """Отправка кадра с использованием CSMA/CD."""
-    global total_bytes
-    jam_attempts = 0  # Счётчик попыток
-
-    while jam_attempts < 2:  
-        if not is_channel_busy():
-            if is_collision_occurred():
-                # Коллизия: отправляем jam-сигнал
-                jam_signal()
-                jam_attempts += 1  # Увеличиваем счётчик попыток
-                display_frame_status(frame, collision_occurred=True)
-
-                # Розыгрыш задержки (backoff)
-                backoff = calculate_backoff(jam_attempts)  # Передаем номер попытки
-                text_debug.insert(END, f"Коллизия {jam_attempts}, ожидание {backoff:.3f} сек.\n")
-                text_debug.see(END)
-                time.sleep(backoff)  # Задержка перед повторной попыткой
-            else:
-                # Успешная передача кадра
-                ser1.write(frame)
-                display_frame_status(frame, collision_occurred=False)
-                total_bytes += len(frame)
-                update_state(len(frame))
-                break  # Завершаем передачу
-        else:
-            # Канал занят, повторная попытка
-            text_debug.insert(END, "Канал занят, ожидание...\n")
-            text_debug.see(END)
-            time.sleep(0.5)
-
-    if jam_attempts >= 2:
-        # Если превышено число попыток, игнорируем кадр
-        text_debug.insert(END, "Кадр проигнорирован после 2 попыток.\n")
-        text_debug.see(END)
 
 
 def display_frame_status(frame, collision_occurred):
@@ -128,93 +145,100 @@ def send_data():
         try:
             frame = create_frame(message, send_var.get(), receive_var.get())
             if frame is not None:  # Продолжаем, только если кадр создан успешно
-                threading.Thread(target=send_frame_with_csma_cd, args=(frame,), daemon=True).start()
-                entry_message.set("")  # Очистка поля ввода
-        except serial.SerialException as e:
+                if tx_queue.submit((frame, int(attempts_var.get()))):
+                    entry_message.set("")  # Очистка поля ввода
+                else:
+                    # Сообщение остаётся в поле ввода, его можно отправить позже
+                    messagebox.showwarning("Очередь передачи", "Очередь передачи заполнена, повторите позже.")
+        except OSError as e:
             messagebox.showerror("Ошибка отправки", str(e))
 
 
 def create_frame(data, source_port, dest_port):
     """Создание кадра с флагом, адресами, данными и FCS."""
-    flag = b'$f'  # Фиксированный флаг для предсказуемости
-
     try:
-        # Извлекаем последние символы портов и преобразуем их в числа
-        destination_address = int(dest_port[-1])  # Например, "1" -> 1
-        source_address = int(source_port[-1])  # Например, "2" -> 2
+        return link_frame.create_frame(data, source_port, dest_port)
     except ValueError:
         messagebox.showerror("Ошибка порта", "Некорректный номер порта!")
         return None  # Прерываем создание кадра при ошибке
 
-    # Преобразуем адреса в 1-байтовые значения (0-255)
-    destination_address = destination_address.to_bytes(1, 'big')
-    source_address = source_address.to_bytes(1, 'big')
 
-    # Кодируем данные и вычисляем контрольную сумму (FCS)
-    data_bytes = data.encode('utf-8').ljust(DATA_LENGTH, b'\x00')  # Заполнение до нужной длины
-    fcs = crc8(data_bytes)  # Вычисляем CRC-8
+def read_data(received):
+    """Обработка данных, принятых с COM-порта: порция может содержать часть кадра или несколько кадров."""
+    for frame in deframer.feed(received):
+        received_frames.inc()
+        latency.received()
+        root.after(0, display_frame_status, frame, False)
 
-    # Формируем кадр: флаг + адреса + данные + FCS
-    frame = flag + destination_address + source_address + data_bytes + fcs
-    return byte_stuffing(frame)  # Применяем экранирование
 
+def read_gap(data):
+    """Байты между кадрами: jam-сигнал идёт без флага и попадает сюда, возможно, по частям."""
+    gap.extend(data)
+    jams = gap.count(JAM_SIGNAL)
+    if jams:
+        del gap[:gap.rfind(JAM_SIGNAL) + len(JAM_SIGNAL)]
+    del gap[:-(len(JAM_SIGNAL) - 1)]  # Хвост может оказаться началом следующего jam-сигнала
+    for _ in range(jams):
+        jams_received.inc()
+        root.after(0, show_jam)
 
 
-def byte_stuffing(frame):
-    """Экранирование флага и управляющих символов."""
-    return frame.replace(ESCAPE_BYTE, ESCAPE_BYTE + ESCAPE_BYTE).replace(FLAG_BYTE, ESCAPE_BYTE + FLAG_BYTE)
+def show_jam():
+    text_output.insert(END, "Обнаружен jam-сигнал! Коллизия произошла.\n")
+    text_output.see(END)
 
-def read_data():
-    """Чтение данных с COM-порта."""
-    while True:
-        try:
-            if ser2.in_waiting > 0:
-                frame = byte_destuffing(ser2.read(ser2.in_waiting))
 
-                if frame == JAM_SIGNAL:
-                    # Обнаружен jam-сигнал
-                    text_output.insert(END, "Обнаружен jam-сигнал! Коллизия произошла.\n")
-                    text_output.see(END)
-                else:
-                    # Обычный кадр
-                    display_frame_status(frame, collision_occurred=False)
-
-            time.sleep(0.1)
-        except serial.SerialException as e:
-            messagebox.showerror("Ошибка приёма", str(e))
-            break
+def on_send_error(e):
+    """Ошибка записи в COM-порт (из потока передачи)."""
+    root.after(0, messagebox.showerror, "Ошибка отправки", str(e))
 
 
+def on_receive_error(e):
+    """Ошибка чтения с COM-порта (из потока приёма)."""
+    root.after(0, messagebox.showerror, "Ошибка приёма", str(e))
 
 
-def byte_destuffing(stuffed_frame):
-    """Удаление экранирующих байтов."""
-    result = b''
-    i = 0
-    while i < len(stuffed_frame):
-        if stuffed_frame[i:i+1] == ESCAPE_BYTE and i + 1 < len(stuffed_frame):
-            i += 1
-        result += stuffed_frame[i:i+1]
-        i += 1
-    return result
+def update_state():
+    """Обновление состояния передачи: счётчики и скорости за последние секунды."""
+    state_label.config(text=f"Скорость: {ser1.baudrate} бод | Передано байт: {sent_bytes.value} | "
+                            f"{metrics.rate('frames_sent'):.1f} кадр/с | Коллизии: {collisions.value}, "
+                            f"отброшено: {dropped_frames.value} | Очередь: {len(tx_queue)}/{TX_QUEUE_SIZE} | Задержка p50/p99: "
+                            f"{latency_histogram.percentile(50) * 1000:.1f}/{latency_histogram.percentile(99) * 1000:.1f} мс")
 
-def update_state(bytes_sent):
-    """Обновление состояния передачи."""
-    state_label.config(text=f"Скорость: {ser1.baudrate} бод | Передано байт: {total_bytes}")
+def refresh_metrics():
+    """Раз в секунду: скорости по счётчикам, строка состояния и выгрузка метрик."""
+    metrics.tick()
+    if 'ser1' in globals():
+        update_state()
+    metrics.flush()
+    root.after(METRICS_INTERVAL_MS, refresh_metrics)
 
 def start_program():
     """Запуск программы и открытие портов."""
-    global ser1, ser2
+    global ser1, ser2, receiver, tx_queue, deframer, gap
     try:
-        ser1 = serial.Serial(send_var.get(), baudrate=int(baudrate_var.get()), timeout=1)
-        ser2 = serial.Serial(receive_var.get(), baudrate=int(baudrate_var.get()), timeout=1)
-        threading.Thread(target=read_data, daemon=True).start()
-        update_state(0)
-    except serial.SerialException as e:
+        ser1, ser2 = open_link(transport_var.get(), send_var.get(), receive_var.get(), int(baudrate_var.get()))
+        gap = bytearray()
+        deframer = Deframer(FRAME_LENGTH, on_gap=read_gap)
+        receiver = Receiver(ser2, read_data, on_error=on_receive_error)
+        # Кадры передаются по очереди одним потоком; при заполненной очереди новый кадр не принимается
+        tx_queue = TxQueue(send_frame_with_csma_cd, TX_QUEUE_SIZE, "drop_new", metrics, on_error=on_send_error)
+        update_state()
+    except OSError as e:
         messagebox.showerror("Ошибка порта", str(e))
 
 def close_ports():
     """Закрытие портов при завершении программы."""
+    if 'tx_queue' in globals():
+        # Порт закрывается только после передачи поставленных кадров. Поток
+        # передачи планирует вывод через root.after, поэтому, пока он
+        # работает, события Tk продолжают обрабатываться
+        tx_queue.close()
+        while tx_queue.thread.is_alive():
+            root.update()
+            tx_queue.thread.join(0.05)
+    if 'receiver' in globals():
+        receiver.stop()
     if 'ser1' in globals() and ser1.is_open:
         ser1.close()
     if 'ser2' in globals() and ser2.is_open:
@@ -233,7 +257,7 @@ def update_ports_direction():
         # Интерфейс программы
 root = Tk()
 root.title("COM-порты: Передача и приём данных")
-root.geometry("800x600")
+root.geometry("800x720")
 root.configure(bg="#FFB6C1")
 root.resizable(False, False)
 
@@ -263,6 +287,31 @@ baudrate_var.set("9600")
 baudrate_menu = OptionMenu(frame_top, baudrate_var, "9600", "19200", "38400", "57600", "115200")
 baudrate_menu.grid(row=3, column=1, padx=5, pady=5)
 
+Label(frame_top, text="Транспорт:", bg="#FFB6C1", fg="black", font=("Arial", 12)).grid(row=4, column=0, sticky="w", pady=5)
+transport_var = StringVar(root)
+transport_var.set("COM-порты")
+transport_menu = OptionMenu(frame_top, transport_var, *TRANSPORT_LABELS)
+transport_menu.grid(row=4, column=1, padx=5, pady=5)
+
+Label(frame_top, text="Backoff и число попыток:", bg="#FFB6C1", fg="black", font=("Arial", 12)).grid(row=5, column=0, sticky="w", pady=5)
+backoff_var = StringVar(root)
+backoff_var.set("lab4")
+backoff_var.trace("w", lambda *args: update_backoff())
+backoff_menu = OptionMenu(frame_top, backoff_var, *STRATEGIES)
+backoff_menu.grid(row=5, column=1, padx=5, pady=5)
+attempts_var = StringVar(root)
+attempts_var.set(str(MAX_ATTEMPTS))
+attempts_menu = OptionMenu(frame_top, attempts_var, str(MAX_ATTEMPTS), "16")
+attempts_menu.grid(row=5, column=2, padx=5, pady=5)
+
+Label(frame_top, text="Слот backoff (с):", bg="#FFB6C1", fg="black", font=("Arial", 12)).grid(row=6, column=0, sticky="w", pady=5)
+slot_var = StringVar(root)
+slot_var.set(str(SLOT_TIME))
+slot_var.trace("w", lambda *args: update_backoff())
+slot_menu = OptionMenu(frame_top, slot_var, "0.001", str(SLOT_TIME), "0.05", "0.1")
+slot_menu.grid(row=6, column=1, padx=5, pady=5)
+update_backoff()
+
 frame_middle = Frame(root, bg="#FFB6C1")
 frame_middle.pack(pady=10, padx=20, fill="x")
 
@@ -299,8 +348,12 @@ frame_bottom_buttons.pack(pady=20, padx=20, fill="x")
 start_button = Button(frame_bottom_buttons, text="Запустить", command=start_program, bg="white", fg="black", padx=20, pady=5, font=("Arial", 12))
 start_button.pack(side="left", padx=5)
 
+simulate_button = Button(frame_bottom_buttons, text="Модель", command=simulate_frames, bg="white", fg="black", padx=20, pady=5, font=("Arial", 12))
+simulate_button.pack(side="left", padx=5)
+
 state_label = Label(frame_bottom_buttons, text="Скорость: неизвестно, Передано байт: 0", bg="#FFB6C1", fg="black", font=("Arial", 12))
 state_label.pack(side="right")
 
 root.protocol("WM_DELETE_WINDOW", lambda: [close_ports(), root.destroy()])
+root.after(METRICS_INTERVAL_MS, refresh_metrics)
 root.mainloop()
@@ -1,29 +1,23 @@
+import os
+import sys
 import tkinter as tk
 import threading
 import time
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from netlab.crc import crc8
+
 # Параметры кольцевой топологии
 NUM_STATIONS = 3
 TOKEN_TIMEOUT = 5  # Тайм-аут токена в секундах
 DATA_LENGTH = 5    # Длина данных в блоке
 FLAG = b'$'
-CRC_POLYNOMIAL = 0x1D
 
 # Глобальные переменные
 token_holder = 0
 monitor_station = 0
 station_list = []
 
-# Функция для расчета CRC-8
-def crc8(data):
-    crc = 0
-    for byte in data:
-        crc ^= byte
-        for _ in range(8):
-            crc = (crc << 1) ^ CRC_POLYNOMIAL if crc & 0x80 else crc << 1
-            crc &= 0xFF
-    return crc.to_bytes(1, 'big')
-
 # Класс для эмуляции станции
 class Station:
     def __init__(self, station_id, root, debug_output):
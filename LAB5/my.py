@@ -1,11 +1,13 @@
+import os
+import sys
 import threading
 import tkinter as tk
 import time
 import queue
 import random
 
-# Константа многочлена для CRC-8
-CRC_POLYNOMIAL = 0x1D
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from netlab.crc import crc8
 
 class Station:
     def __init__(self, name, ring, priority=1):
@@ -145,16 +147,7 @@ class Station:
 
     def compute_fcs(self, data):
         """Вычисление CRC-8 для данных."""
-        crc = 0
-        for byte in data.encode():  # Преобразуем данные в байты для вычисления
-            crc ^= byte
-            for _ in range(8):
-                if crc & 0x80:
-                    crc = (crc << 1) ^ CRC_POLYNOMIAL
-                else:
-                    crc <<= 1
-                crc &= 0xFF
-        return crc.to_bytes(1, 'big')  # Возвращаем FCS в виде одного байта
+        return crc8(data.encode())  # FCS в виде одного байта
 
     def compute_ed(self):
         return "7E"  # Fixed end delimiter
@@ -0,0 +1,87 @@
+"""Статистика CRC-8 LAB3 на миллионах кадров через пакетную модель канала.
+
+Кадры LAB3 (данные DATA_LENGTH байт + CRC-8) пачками проходят через
+BitErrorChannel или GilbertElliottChannel. FCS всех кадров считается и
+проверяется пакетно (crc8_batch), кадры с ошибкой FCS исправляются
+correct_single_error, как в LAB3.
+Итог - доли кадров: без ошибок, исправлено, обнаружено (не исправлено),
+исправлено неверно и необнаруженные ошибки.
+
+Запуск: python benchmarks/channel.py [--frames 1000000] [--ber 1e-4 1e-3 1e-2]
+        python benchmarks/channel.py --model ge [--burst 10]
+"""
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from netlab.channel import BitErrorChannel, GilbertElliottChannel
+from netlab.crc import correct_single_error, crc8_batch, crc8_verify_batch
+from netlab.frame import DATA_LENGTH
+
+FRAMES = 1_000_000
+BATCH = 100_000
+BERS = (1e-4, 1e-3, 1e-2)
+OUTCOMES = ("clean", "corrected", "detected", "miscorrected", "undetected")
+HEADERS = ("без ошибок", "исправлено", "обнаружено", "исправл. неверно", "не обнаружено")
+
+
+def classify(received, original):
+    """Что сделает приёмник LAB3 с кадром, не прошедшим проверку FCS."""
+    body, received_fcs = received[:DATA_LENGTH], received[DATA_LENGTH:]
+    corrected, fixed = correct_single_error(body, received_fcs)
+    if not fixed:
+        return "detected"
+    return "corrected" if bytes(corrected) == original else "miscorrected"
+
+
+def run(channel, frames, batch, rng):
+    stats = Counter()
+    for start in range(0, frames, batch):
+        count = min(batch, frames - start)
+        data = rng.integers(0, 256, (count, DATA_LENGTH), dtype=np.uint8)
+        sent = np.concatenate((data, crc8_batch(data)[:, None]), axis=1)
+        received = channel.transmit(sent)
+        damaged = (received != sent).any(axis=1)
+        valid = crc8_verify_batch(received)
+        stats["clean"] += count - int(damaged.sum())
+        stats["undetected"] += int((damaged & valid).sum())
+        for index in np.flatnonzero(~valid):
+            stats[classify(received[index].tobytes(), data[index].tobytes())] += 1
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CRC-8 на пакетной модели канала")
+    parser.add_argument("--frames", type=int, default=FRAMES)
+    parser.add_argument("--batch", type=int, default=BATCH)
+    parser.add_argument("--ber", type=float, nargs="+", default=BERS, help="средний BER")
+    parser.add_argument("--model", choices=("iid", "ge"), default="iid")
+    parser.add_argument("--burst", type=float, default=10, help="средняя длина пачки (ge), бит")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"Кадр: {DATA_LENGTH} Б данных + CRC-8, кадров: {args.frames}, модель: {args.model}")
+    print(f"{'BER':>8} " + " ".join(f"{name:>16}" for name in HEADERS) + f" {'время, с':>9}")
+    for ber in args.ber:
+        if args.model == "iid":
+            channel = BitErrorChannel(ber, args.seed)
+        else:
+            # В плохом состоянии каждый второй бит ошибочен; частоту пачек
+            # подбираем так, чтобы средний BER был равен заданному
+            p_bg = 1 / args.burst
+            bad_share = 2 * ber
+            channel = GilbertElliottChannel(bad_share * p_bg / (1 - bad_share), p_bg, 0.5, 0.0, args.seed)
+        start = time.perf_counter()
+        stats = run(channel, args.frames, args.batch, np.random.default_rng(args.seed))
+        elapsed = time.perf_counter() - start
+        print(f"{ber:>8.0e} " + " ".join(f"{stats[name] / args.frames:>16.4%}" for name in OUTCOMES)
+              + f" {elapsed:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
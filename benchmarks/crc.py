@@ -0,0 +1,93 @@
+"""Сравнение побитового CRC-8 с табличным и slice-by-8, поштучной и пакетной проверки.
+
+Запуск: python benchmarks/crc.py [--sizes 6 64 1024 65536] [--frames 100000]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from netlab.crc import CRC_POLYNOMIAL, CRC8_TABLE, _crc8_slice8, crc8, crc8_verify_batch
+from netlab.frame import DATA_LENGTH
+from timing import best_of
+
+SIZES = (6, 64, 1024, 65536)
+FRAMES = 100_000
+
+
+def legacy_crc8(data):
+    """Прежняя реализация из LAB3/LAB4/LAB5: 8 итераций на байт."""
+    crc = 0
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            if crc & 0x80:
+                crc = (crc << 1) ^ CRC_POLYNOMIAL
+            else:
+                crc <<= 1
+            crc &= 0xFF
+    return crc.to_bytes(1, 'big')
+
+
+def table_crc8(data):
+    """Только таблица на 256 значений, без slice-by-8."""
+    crc = 0
+    table = CRC8_TABLE
+    for byte in data:
+        crc = table[crc ^ byte]
+    return crc.to_bytes(1, 'big')
+
+
+def slice8_crc8(data):
+    """Только slice-by-8, независимо от длины."""
+    return _crc8_slice8(0, data).to_bytes(1, 'big')
+
+
+def verify_each(buffer, frame_length):
+    """Проверка кадров по одному, как в приёмниках LAB3/LAB5."""
+    data_length = frame_length - 1
+    return [crc8(buffer[start:start + data_length]) == buffer[start + data_length:start + frame_length]
+            for start in range(0, len(buffer), frame_length)]
+
+
+def make_frames(count, data_length=DATA_LENGTH):
+    """Буфер из count кадров: данные + CRC-8."""
+    frames = bytearray()
+    for _ in range(count):
+        data = os.urandom(data_length)
+        frames += data + crc8(data)
+    return bytes(frames)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк CRC-8")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--frames", type=int, default=FRAMES, help="кадров для пакетной проверки")
+    parser.add_argument("--min-time", type=float, default=0.1, help="время одного замера, с")
+    args = parser.parse_args()
+
+    variants = (("побитовый", legacy_crc8), ("таблица", table_crc8),
+                ("slice-by-8", slice8_crc8), ("crc8()", crc8))
+    print(f"{'размер':>7} " + " ".join(f"{name:>12}" for name, _ in variants) + "   (МБ/с)")
+    for size in args.sizes:
+        data = os.urandom(size)
+        expected = legacy_crc8(data)
+        rates = []
+        for name, func in variants:
+            if func(data) != expected:
+                raise AssertionError(f"{name}: FCS не совпадает с побитовым CRC-8")
+            rates.append(size / best_of(func, data, min_time=args.min_time) / 1e6)
+        print(f"{size:>7} " + " ".join(f"{rate:>12.3f}" for rate in rates))
+
+    frame_length = DATA_LENGTH + 1
+    frames = make_frames(args.frames)
+    if not all(verify_each(frames, frame_length)) or not crc8_verify_batch(frames, frame_length).all():
+        raise AssertionError("Проверка корректных кадров не прошла")
+    each = best_of(verify_each, frames, frame_length, min_time=args.min_time)
+    batch = best_of(crc8_verify_batch, frames, frame_length, min_time=args.min_time)
+    print(f"\nПроверка {args.frames} кадров по {frame_length} Б: по одному {each * 1000:.1f} мс, "
+          f"crc8_verify_batch {batch * 1000:.1f} мс ({each / batch:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
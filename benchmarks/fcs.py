@@ -0,0 +1,81 @@
+"""FCS разной ширины: цена на кадр против доли необнаруженных ошибок.
+
+Для каждого типа FCS и длины кадра замеряется время вычисления FCS, а
+затем на случайных кадрах вносятся ошибки нескольких видов и считается,
+сколько искажённых кадров прошли проверку.
+
+Запуск: python benchmarks/fcs.py [--sizes 16 64 1024] [--trials 20000]
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from netlab.fcs import FCS_NAMES, check_fcs, compute_fcs, fcs_length
+from timing import measure
+
+SIZES = (16, 64, 1024)
+TRIALS = 20000
+
+
+def random_bits(size, count, rng):
+    """count различных случайных бит в кадре."""
+    return rng.sample(range(size * 8), count)
+
+
+def burst(size, rng, length=(9, 16)):
+    """Пакет ошибок: первый и последний бит пакета искажены, внутри - случайно."""
+    span = rng.randint(*length)
+    start = rng.randrange(size * 8 - span + 1)
+    inner = [start + k for k in range(1, span - 1) if rng.random() < 0.5]
+    return [start, start + span - 1] + inner
+
+
+ERROR_MODELS = {
+    "2 бита": lambda size, rng: random_bits(size, 2, rng),
+    "3 бита": lambda size, rng: random_bits(size, 3, rng),
+    "8 бит": lambda size, rng: random_bits(size, 8, rng),
+    "пакет 9-16": burst,
+}
+
+
+def flip(frame, bits):
+    data = bytearray(frame)
+    for bit in bits:
+        data[bit // 8] ^= 0x80 >> (bit % 8)
+    return bytes(data)
+
+
+def undetected_rate(fcs_type, size, model, trials, rng):
+    """Доля искажённых кадров (данные + FCS), у которых FCS сошлась."""
+    length = fcs_length(fcs_type)
+    missed = 0
+    for _ in range(trials):
+        data = rng.randbytes(size)
+        frame = flip(data + compute_fcs(data, fcs_type), model(size + length, rng))
+        if check_fcs(frame[:size], frame[size:], fcs_type):
+            missed += 1
+    return missed / trials
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк FCS: время и необнаруженные ошибки")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--trials", type=int, default=TRIALS)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'FCS':<7} {'кадр, Б':>8} {'мкс/кадр':>9} " + " ".join(f"{name:>11}" for name in ERROR_MODELS))
+    for name, fcs_type in FCS_NAMES.items():
+        for size in args.sizes:
+            data = os.urandom(size)
+            cost = measure(compute_fcs, data, fcs_type, min_time=0.2)
+            rng = random.Random(args.seed)
+            rates = [undetected_rate(fcs_type, size, model, args.trials, rng) for model in ERROR_MODELS.values()]
+            print(f"{name:<7} {size:>8} {cost * 1e6:>9.2f} " + " ".join(f"{rate:>11.3%}" for rate in rates))
+    print(f"Искажений на случай: {args.trials}; 0.000% - ни одной необнаруженной ошибки")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""SECDED (72,64) против исправления по синдрому CRC-8: скорость и остаточные ошибки.
+
+Скорость: кодирование и декодирование SECDED на данных разного размера и
+исправление одного кадра LAB3 обоими способами. Остаточные ошибки: в
+поле данных кадра k раз вносится искажение через corrupt_data (как в
+LAB3, FCS не искажается), после чего считается, сколько кадров
+исправлено, сколько отбраковано и сколько принято с неверными данными.
+
+Запуск: python benchmarks/fec.py [--sizes 64 4096 65536] [--trials 20000]
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from netlab.channel import corrupt_data
+from netlab.crc import correct_single_error, crc8
+from netlab.fec import fec_decode, fec_encode
+from netlab.frame import DATA_LENGTH
+from timing import measure
+
+SIZES = (64, 4096, 65536)
+TRIALS = 20000
+ERROR_COUNTS = (1, 2, 3)
+
+
+def corrupt_times(data, count, rng):
+    for _ in range(count):
+        data = corrupt_data(data, 1.0, rng)
+    return data
+
+
+def receive_secded(data, count, rng):
+    """Итог приёма кадра SECDED + CRC-8: "ok", "reject" или "wrong"."""
+    encoded = corrupt_times(fec_encode(data), count, rng)
+    decoded, corrected, detected = fec_decode(encoded, len(data))
+    if detected or crc8(decoded) != crc8(data):
+        # FCS кадра проверяет и результат исправления
+        return "reject"
+    return "ok" if decoded == data else "wrong"
+
+
+def receive_crc(data, count, rng):
+    """Итог приёма кадра LAB3: данные + CRC-8, исправление по синдрому."""
+    fcs = crc8(data)
+    body = corrupt_times(data, count, rng)
+    if crc8(body) != fcs:
+        body, fixed = correct_single_error(body, fcs)
+        if not fixed:
+            return "reject"
+    return "ok" if bytes(body) == data else "wrong"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк SECDED")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--trials", type=int, default=TRIALS)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'размер':>8} {'кодирование, МБ/с':>18} {'декодирование, МБ/с':>20}")
+    for size in args.sizes:
+        data = os.urandom(size)
+        encoded = fec_encode(data)
+        encode_time = measure(fec_encode, data)
+        decode_time = measure(fec_decode, encoded, size)
+        print(f"{size:>8} {size / encode_time / 1e6:>18.2f} {size / decode_time / 1e6:>20.2f}")
+
+    data = os.urandom(DATA_LENGTH)
+    fcs = crc8(data)
+    flipped = bytes([data[0] ^ 0x01]) + data[1:]
+    encoded = bytearray(fec_encode(data))
+    encoded[0] ^= 0x01
+    crc_time = measure(correct_single_error, flipped, fcs)
+    fec_time = measure(fec_decode, bytes(encoded), DATA_LENGTH)
+    print(f"\nИсправление кадра LAB3 ({DATA_LENGTH} Б): синдром CRC-8 {crc_time * 1e6:.2f} мкс, "
+          f"SECDED {fec_time * 1e6:.2f} мкс")
+
+    print(f"\n{'способ':<8} {'ошибок':>7} {'исправлено':>11} {'отбраковано':>12} {'неверно':>9}")
+    for name, receive in (("CRC-8", receive_crc), ("SECDED", receive_secded)):
+        for count in ERROR_COUNTS:
+            rng = random.Random(args.seed)
+            outcomes = {"ok": 0, "reject": 0, "wrong": 0}
+            for _ in range(args.trials):
+                outcomes[receive(rng.randbytes(DATA_LENGTH), count, rng)] += 1
+            print(f"{name:<8} {count:>7} {outcomes['ok'] / args.trials:>11.2%} "
+                  f"{outcomes['reject'] / args.trials:>12.2%} {outcomes['wrong'] / args.trials:>9.2%}")
+
+
+if __name__ == "__main__":
+    main()
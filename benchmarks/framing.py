@@ -0,0 +1,123 @@
+"""Бенчмарк горячих путей кадра: create_frame, стаффинг, CRC-8 и исправление ошибки.
+
+Запуск: python benchmarks/framing.py [--output results.json] [--compare old.json]
+Результаты (кадров/с и МБ/с для каждого случая) сохраняются в JSON, чтобы
+сравнивать изменения между собой и замечать регрессии.
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from netlab.crc import crc8, correct_single_error
+from netlab.frame import create_frame
+from netlab.stuffing import byte_stuffing, byte_destuffing
+from timing import best_of, load_results, save_results
+
+PAYLOAD_SIZES = (6, 64, 256, 1024, 4096)
+DENSITIES = (0.0, 0.1, 0.5)      # Доля байт '$' и ESC в данных
+MAX_CORRECTION_SIZE = 4096       # Ограничение для замеров исправления ошибки
+REGRESSION_THRESHOLD = 0.10      # Замедление больше 10% считается регрессией
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def make_payload(size, density, rng):
+    """Строка из size ASCII-символов с заданной долей '$' и ESC."""
+    letters = string.ascii_letters
+    return "".join(rng.choice("$\x1b") if rng.random() < density else rng.choice(letters)
+                   for _ in range(size))
+
+
+def make_cases(sizes, densities, max_correction_size, seed):
+    """Список случаев (имя, размер, плотность, функция, аргументы)."""
+    rng = random.Random(seed)
+    cases = []
+    for size in sizes:
+        for density in densities:
+            text = make_payload(size, density, rng)
+            data = text.encode('utf-8')
+            frame = create_frame(text, "COM1", "COM2", data_length=size)
+            raw = byte_destuffing(frame)
+            cases += [
+                ("create_frame", size, density, create_frame, (text, "COM1", "COM2", crc8, size)),
+                ("byte_stuffing", size, density, byte_stuffing, (raw,)),
+                ("byte_destuffing", size, density, byte_destuffing, (frame,)),
+            ]
+        data = make_payload(size, 0.0, rng).encode('utf-8')
+        cases.append(("crc8", size, 0.0, crc8, (data,)))
+        if size <= max_correction_size:
+            # Ошибка в старшем бите последнего байта (худший случай прежнего перебора)
+            corrupted = bytearray(data)
+            corrupted[-1] ^= 0x80
+            cases.append(("correct_single_error", size, 0.0, correct_single_error,
+                          (bytes(corrupted), crc8(data))))
+    return cases
+
+
+def run(cases, min_time):
+    results = []
+    for name, size, density, func, args in cases:
+        seconds = best_of(func, *args, min_time=min_time)
+        results.append({
+            "case": name,
+            "payload": size,
+            "density": density,
+            "seconds_per_frame": seconds,
+            "frames_per_s": 1 / seconds,
+            "mb_per_s": size / seconds / 1e6,
+        })
+        print(f"{name:<22} {size:>6} {density:>5.2f} {1 / seconds:>14.0f} {size / seconds / 1e6:>10.3f}")
+    return results
+
+
+def compare(results, previous, threshold=REGRESSION_THRESHOLD):
+    """Сравнение с сохранёнными результатами; возвращает число регрессий."""
+    key = lambda r: (r["case"], r["payload"], r["density"])
+    old = {key(r): r for r in previous}
+    regressions = 0
+    print(f"\n{'случай':<22} {'размер':>6} {'плотн.':>6} {'изменение':>10}")
+    for r in results:
+        before = old.get(key(r))
+        if before is None:
+            continue
+        change = r["frames_per_s"] / before["frames_per_s"] - 1
+        mark = ""
+        if change < -threshold:
+            mark = "  <- регрессия"
+            regressions += 1
+        print(f"{r['case']:<22} {r['payload']:>6} {r['density']:>6.2f} {change:>+9.1%}{mark}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк кадров, FCS и исправления ошибок")
+    parser.add_argument("--sizes", type=int, nargs="+", default=PAYLOAD_SIZES)
+    parser.add_argument("--densities", type=float, nargs="+", default=DENSITIES)
+    parser.add_argument("--max-correction-size", type=int, default=MAX_CORRECTION_SIZE)
+    parser.add_argument("--min-time", type=float, default=0.1, help="время одного замера, с")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="JSON-файл результатов (по умолчанию benchmarks/results/)")
+    parser.add_argument("--compare", help="JSON-файл предыдущего запуска для сравнения")
+    args = parser.parse_args()
+
+    print(f"{'случай':<22} {'размер':>6} {'плотн.':>5} {'кадров/с':>14} {'МБ/с':>10}")
+    results = run(make_cases(args.sizes, args.densities, args.max_correction_size, args.seed), args.min_time)
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, time.strftime("framing-%Y%m%d-%H%M%S.json"))
+    save_results(output, "framing", results)
+    print(f"\nРезультаты сохранены в {output}")
+
+    if args.compare:
+        regressions = compare(results, load_results(args.compare))
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Приём кадров LAB2 через Deframer и через RingBuffer: память и скорость.
+
+Кадры идут через псевдотерминал и принимаются в одном потоке двумя
+способами:
+  deframer - как раньше: read(in_waiting), Deframer.feed, поля кадра срезами;
+  ring     - readinto в RingBuffer, кадры и поля - memoryview и unpack_from.
+tracemalloc показывает, сколько байт выделяется на кадр (сумма пиков
+на каждой порции сверх текущего объёма) и растёт ли занятая память при
+длительном приёме.
+
+Запуск: python benchmarks/ringbuffer.py [--frames 100000] [--variable]
+"""
+import argparse
+import array
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from netlab.deframer import Deframer
+from netlab.fcs import FCS_CRC32, crc32
+from netlab.frame import DATA_LENGTH, HEADER_LENGTH, build_frame, stuff_frame, unpack_frame
+from netlab.ringbuffer import RingBuffer
+from netlab.segment import check_segment, create_segments, parse_segment, segment_frame_length
+from netlab.transport import open_pty_pair
+
+FRAMES = 100_000
+BATCH = 32  # Кадров за одну запись в порт
+
+
+def make_stream(variable):
+    """Пачка кадров LAB2 (фиксированной длины или сегментов) и длина кадра."""
+    if variable:
+        data = bytes(range(256)) * 4
+        frames = b"".join(create_segments(data[:200], 2, 1, 1, FCS_CRC32) * BATCH)
+        return frames, segment_frame_length()
+    data = b"hi$\x1b".ljust(DATA_LENGTH, b"\x00")
+    frame = stuff_frame(build_frame(data, b"\x02", b"\x01", crc32(data)))
+    return frame * BATCH, HEADER_LENGTH + DATA_LENGTH + 4
+
+
+def parse_copy(frame, variable):
+    """Разбор кадра срезами bytes, как в LAB2 до кольцевого буфера."""
+    if variable:
+        return check_segment(frame) and parse_segment(frame)[5]
+    dest = int.from_bytes(frame[2:3], 'big')
+    src = int.from_bytes(frame[3:4], 'big')
+    data = frame[4:4 + DATA_LENGTH]
+    return dest + src and crc32(data) == frame[4 + DATA_LENGTH:]
+
+
+def parse_view(frame, variable):
+    if variable:
+        return check_segment(frame) and parse_segment(frame)[5]
+    dest, src, data, fcs = unpack_frame(frame)
+    return dest + src and crc32(data) == fcs
+
+
+def receive(method, frames, variable, trace):
+    """Принимает frames кадров; возвращает (с на кадр, байт на кадр, рост памяти)."""
+    stream, frame_length = make_stream(variable)
+    tx, rx = open_pty_pair(115200, timeout=1)
+    if method == "ring":
+        ring = RingBuffer(frame_length)
+
+        def step():
+            ring.readinto(rx)
+            return sum(1 for frame in ring.frames() if parse_view(frame, variable))
+    else:
+        deframer = Deframer(frame_length)
+
+        def step():
+            return sum(1 for frame in deframer.feed(rx.read(rx.in_waiting or 1)) if parse_copy(frame, variable))
+
+    frames_per_batch = len(Deframer(frame_length).feed(stream))
+    received = allocated = 0
+    # Массив замеров выделен заранее и не создаёт объектов int, чтобы сам
+    # не влиять на рост памяти
+    samples = array.array('q', bytes(8 * (frames // frames_per_batch + 1)))
+    batches = 0
+    start = time.perf_counter()
+    try:
+        while received < frames:
+            tx.write(stream)
+            target = received + frames_per_batch
+            while received < target:
+                if trace:
+                    before = tracemalloc.get_traced_memory()[0]
+                    tracemalloc.reset_peak()
+                    received += step()
+                    allocated += tracemalloc.get_traced_memory()[1] - before
+                else:
+                    received += step()
+            if trace:
+                samples[batches] = tracemalloc.get_traced_memory()[0]
+            batches += 1
+    finally:
+        tx.close()
+        rx.close()
+    elapsed = time.perf_counter() - start
+    growth = samples[batches - 1] - samples[batches // 10] if trace else 0
+    return elapsed / received, allocated / received, growth
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк приёмного кольцевого буфера")
+    parser.add_argument("--frames", type=int, default=FRAMES)
+    parser.add_argument("--variable", action="store_true", help="сегменты переменной длины вместо кадров LAB2")
+    args = parser.parse_args()
+
+    print(f"Кадров: {args.frames}, {'сегменты' if args.variable else 'кадры фиксированной длины'}")
+    print(f"{'способ':<10} {'мкс/кадр':>9} {'байт/кадр (tracemalloc)':>24} {'рост памяти, Б':>15}")
+    for method in ("deframer", "ring"):
+        per_frame, _, _ = receive(method, args.frames, args.variable, trace=False)
+        tracemalloc.start()
+        _, allocated, growth = receive(method, args.frames, args.variable, trace=True)
+        tracemalloc.stop()
+        print(f"{method:<10} {per_frame * 1e6:>9.2f} {allocated:>24.1f} {growth:>15}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Полезная скорость: кадры фиксированной длины против кадров переменной длины.
+
+Для каждого размера сообщения считается доля полезных байт на линии
+(с учётом стаффинга) и полезная скорость при заданной скорости порта, а
+также время подготовки и разбора кадров на стороне программы.
+
+Запуск: python benchmarks/segment.py [--sizes 6 64 1024 4096] [--baudrate 115200]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from netlab.deframer import Deframer
+from netlab.frame import DATA_LENGTH, HEADER_LENGTH, create_frame
+from netlab.segment import Reassembler, create_segments, parse_segment, segment_frame_length
+from netlab.transmit import line_rate
+from timing import measure
+
+SIZES = (6, 64, 1024, 4096)
+BAUDRATE = 115200
+FCS_LENGTH = 1
+
+
+def fixed_frames(message):
+    """Сообщение, разрезанное на кадры фиксированной длины LAB2/LAB3."""
+    return b"".join(create_frame(message[i:i + DATA_LENGTH], "COM1", "COM2")
+                    for i in range(0, len(message), DATA_LENGTH))
+
+
+def variable_frames(message):
+    return b"".join(create_segments(message.encode('utf-8'), 2, 1, 0))
+
+
+def receive_fixed(wire):
+    deframer = Deframer(HEADER_LENGTH + DATA_LENGTH + FCS_LENGTH)
+    return b"".join(frame[HEADER_LENGTH:HEADER_LENGTH + DATA_LENGTH] for frame in deframer.feed(wire))
+
+
+def receive_variable(wire):
+    deframer = Deframer(segment_frame_length())
+    reassembler = Reassembler()
+    for frame in deframer.feed(wire):
+        dest, src, msg_id, seq, last, payload, fcs = parse_segment(frame)
+        message = reassembler.add(src, msg_id, seq, last, payload)
+        if message is not None:
+            return message
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк кадров переменной длины")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--baudrate", type=int, default=BAUDRATE)
+    args = parser.parse_args()
+
+    rate = line_rate(args.baudrate)
+    print(f"Скорость линии: {rate:.0f} Б/с")
+    print(f"{'размер':>7} {'кадры':<11} {'на линии, Б':>12} {'доля':>6} {'полезная, Б/с':>14} "
+          f"{'подготовка, мс':>15} {'разбор, мс':>11}")
+    for size in args.sizes:
+        message = "x" * size
+        assert receive_variable(variable_frames(message)) == message.encode('utf-8')
+        cases = (
+            ("фиксир.", fixed_frames, receive_fixed),
+            ("перемен.", variable_frames, receive_variable),
+        )
+        for name, build, receive in cases:
+            wire = build(message)
+            efficiency = size / len(wire)
+            build_time = measure(build, message)
+            receive_time = measure(receive, wire)
+            print(f"{size:>7} {name:<11} {len(wire):>12} {efficiency:>6.1%} {rate * efficiency:>14.0f} "
+                  f"{build_time * 1000:>15.3f} {receive_time * 1000:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Сравнение прежнего и общего байт-стаффинга на данных разного размера.
+
+Запуск: python benchmarks/stuffing.py [--sizes 64 4096 1048576]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from netlab.stuffing import ESCAPE_BYTE, FLAG_BYTE, byte_stuffing, byte_destuffing
+from timing import measure
+
+SIZES = (64, 4096, 1 << 20)
+
+
+def legacy_byte_stuffing(frame):
+    """Прежняя реализация из LAB2/LAB3/LAB4."""
+    return frame.replace(ESCAPE_BYTE, ESCAPE_BYTE + ESCAPE_BYTE).replace(FLAG_BYTE, ESCAPE_BYTE + FLAG_BYTE)
+
+
+def legacy_byte_destuffing(stuffed_frame):
+    """Прежняя реализация из LAB3/LAB4: сборка результата через bytes +=."""
+    result = b''
+    i = 0
+    while i < len(stuffed_frame):
+        if stuffed_frame[i:i+1] == ESCAPE_BYTE and i + 1 < len(stuffed_frame):
+            i += 1
+        result += stuffed_frame[i:i+1]
+        i += 1
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк байт-стаффинга")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    args = parser.parse_args()
+
+    print(f"{'размер':>9} {'операция':<10} {'прежняя, мс':>13} {'общая, мс':>11} {'ускорение':>10}")
+    for size in args.sizes:
+        payload = os.urandom(size)
+        stuffed = byte_stuffing(payload)
+        assert byte_destuffing(stuffed) == payload
+        assert stuffed == legacy_byte_stuffing(payload)
+        cases = (
+            ("стаффинг", legacy_byte_stuffing, byte_stuffing, payload),
+            ("де-стафф.", legacy_byte_destuffing, byte_destuffing, stuffed),
+        )
+        for name, old, new, arg in cases:
+            old_time = measure(old, arg)
+            new_time = measure(new, arg)
+            print(f"{size:>9} {name:<10} {old_time * 1000:>13.3f} {new_time * 1000:>11.3f} {old_time / new_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Общие функции замеров для скриптов бенчмарков."""
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+MIN_TIME = 0.5  # Минимальное время замера одного случая, с
+
+
+def measure(func, *args, min_time=MIN_TIME):
+    """Среднее время одного вызова func(*args), с.
+
+    Функция вызывается хотя бы один раз и повторяется, пока суммарное
+    время не превысит min_time.
+    """
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        func(*args)
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / runs
+
+
+def best_of(func, *args, repeats=3, min_time=MIN_TIME):
+    """Лучшее из repeats измерений measure() - меньше зависит от фоновой нагрузки."""
+    return min(measure(func, *args, min_time=min_time) for _ in range(repeats))
+
+
+def environment():
+    """Описание окружения для сохранения вместе с результатами."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=root,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "commit": commit,
+    }
+
+
+def save_results(path, name, results):
+    """Сохранение результатов в JSON вместе с описанием окружения."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"benchmark": name, "environment": environment(), "results": results},
+                  f, ensure_ascii=False, indent=2)
+
+
+def load_results(path):
+    """Загрузка результатов, сохранённых save_results()."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
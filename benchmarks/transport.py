@@ -0,0 +1,71 @@
+"""Пропускная способность и задержка транспортов без аппаратуры.
+
+Запуск: python benchmarks/transport.py [--transports pty pipe] [--size 4194304]
+Для COM-портов: --transports serial --send-port COM1 --receive-port COM2
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from netlab.receive import Receiver, measure_latency
+from netlab.transmit import Transmitter
+from netlab.transport import open_link
+
+TRANSPORTS = ("pty", "pipe")
+SIZE = 4 << 20
+CHUNK_SIZE = 65536
+
+
+def measure_throughput(tx, rx, size, chunk_size=CHUNK_SIZE):
+    """Скорость передачи size случайных байт от tx к rx, байт/с."""
+    payload = os.urandom(size)
+    received = bytearray()
+    done = threading.Event()
+
+    def on_data(data):
+        received.extend(data)
+        if len(received) >= size:
+            done.set()
+
+    receiver = Receiver(rx, on_data)
+    transmitter = Transmitter(tx, chunk_size=chunk_size)
+    start = time.perf_counter()
+    transmitter.submit(payload)
+    done.wait(60)
+    elapsed = time.perf_counter() - start
+    transmitter.close()
+    receiver.stop(wait=True)
+    if bytes(received) != payload:
+        raise RuntimeError(f"Данные искажены: принято {len(received)} из {size} байт")
+    return size / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк транспортов")
+    parser.add_argument("--transports", nargs="+", default=TRANSPORTS, choices=("serial", "pty", "pipe"))
+    parser.add_argument("--send-port", default="COM1")
+    parser.add_argument("--receive-port", default="COM2")
+    parser.add_argument("--baudrate", type=int, default=115200)
+    parser.add_argument("--size", type=int, default=SIZE)
+    parser.add_argument("--samples", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'транспорт':<10} {'МБ/с':>10} {'задержка, мс (медиана/макс)':>30}")
+    for transport in args.transports:
+        tx, rx = open_link(transport, args.send_port, args.receive_port, args.baudrate)
+        try:
+            latencies = [x * 1000 for x in measure_latency(tx, rx, args.samples)]
+            rate = measure_throughput(tx, rx, args.size)
+        finally:
+            tx.close()
+            rx.close()
+        print(f"{transport:<10} {rate / 1e6:>10.2f} "
+              f"{statistics.median(latencies):>20.3f} / {max(latencies):.3f}")
+
+
+if __name__ == "__main__":
+    main()
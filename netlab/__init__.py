@@ -0,0 +1 @@
+"""Общий код канального уровня для лабораторных работ."""
@@ -0,0 +1,235 @@
+"""Асинхронный транспорт на asyncio: один цикл событий на все порты.
+
+В лабораторных каждый порт читает свой поток, а LAB4 вдобавок запускает
+поток на каждый кадр. Здесь порты с файловым дескриптором (COM-порты
+pyserial, псевдотерминалы) переводятся в неблокирующий режим и ждут
+готовности через loop.add_reader/add_writer, поэтому сотни каналов и
+станций обслуживает один поток.
+
+Запуск демонстрации: python -m netlab.aio [--links 200] [--frames 20] [--transport pty]
+                     [--backoff binary] [--attempts 16]
+"""
+import argparse
+import asyncio
+import collections
+import errno
+import os
+import random
+import threading
+import time
+
+from .backoff import SLOT_TIME, STRATEGIES, make_backoff
+from .csma import MAX_ATTEMPTS, calculate_backoff, csma_cd
+from .deframer import Deframer
+from .frame import DATA_LENGTH, HEADER_LENGTH, create_frame
+from .transport import PORT_TIMEOUT, TRANSPORT_LABELS, open_link, open_pty_pair
+
+READ_SIZE = 4096  # Сколько байт забирать из порта за одно чтение
+
+
+class AsyncFdPort:
+    """Порт с fileno() (serial.Serial, FdPort) для asyncio.
+
+    Дескриптор переводится в неблокирующий режим, так что синхронные
+    read()/write() исходного порта после этого использовать нельзя.
+    """
+
+    def __init__(self, port):
+        self.port = port
+        self.fd = port.fileno()
+        self.baudrate = port.baudrate
+        os.set_blocking(self.fd, False)
+
+    async def _wait(self, add, remove):
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        add(self.fd, lambda: ready.done() or ready.set_result(None))
+        try:
+            await ready
+        finally:
+            remove(self.fd)
+
+    async def read(self, size=READ_SIZE):
+        """Порция принятых байт (не больше size); b'' - порт закрыт."""
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                return os.read(self.fd, size)
+            except BlockingIOError:
+                await self._wait(loop.add_reader, loop.remove_reader)
+            except OSError as e:
+                if e.errno == errno.EIO:  # Второй конец псевдотерминала закрыт
+                    return b''
+                raise
+
+    async def write(self, data):
+        loop = asyncio.get_running_loop()
+        view = memoryview(data)
+        while view:
+            try:
+                view = view[os.write(self.fd, view):]
+            except BlockingIOError:
+                await self._wait(loop.add_writer, loop.remove_writer)
+        return len(data)
+
+    def close(self):
+        self.port.close()
+
+
+class AsyncPipePort:
+    """Конец канала в памяти для asyncio: без дескрипторов и потоков."""
+
+    def __init__(self, incoming, outgoing, baudrate):
+        self.incoming = incoming
+        self.outgoing = outgoing
+        self.baudrate = baudrate
+        self.pending = b''
+
+    async def read(self, size=READ_SIZE):
+        if not self.pending:
+            self.pending = await self.incoming.get()
+        data, self.pending = self.pending[:size], self.pending[size:]
+        return data
+
+    async def write(self, data):
+        if data:
+            self.outgoing.put_nowait(bytes(data))
+        return len(data)
+
+    def close(self):
+        self.outgoing.put_nowait(b'')  # Конец потока для второй стороны
+
+
+def open_async_pipe_pair(baudrate):
+    """Пара связанных портов в памяти: запись в один читается из другого."""
+    forward, backward = asyncio.Queue(), asyncio.Queue()
+    return AsyncPipePort(backward, forward, baudrate), AsyncPipePort(forward, backward, baudrate)
+
+
+def open_async_link(transport, send_port, receive_port, baudrate, timeout=PORT_TIMEOUT):
+    """Асинхронный аналог open_link: (передающий, принимающий) порт."""
+    if TRANSPORT_LABELS.get(transport, transport) == "pipe":
+        return open_async_pipe_pair(baudrate)
+    tx, rx = open_link(transport, send_port, receive_port, baudrate, timeout)
+    return AsyncFdPort(tx), AsyncFdPort(rx)
+
+
+async def send_data(port, data):
+    """Асинхронный send_data: запись целого буфера."""
+    return await port.write(data)
+
+
+async def read_data(port, on_data, size=READ_SIZE):
+    """Асинхронный read_data: on_data(порция) до закрытия порта."""
+    while True:
+        chunk = await port.read(size)
+        if not chunk:
+            return
+        on_data(chunk)
+
+
+async def read_frames(port, deframer, on_frame):
+    """Приём потока кадров: on_frame(кадр после де-стаффинга) для каждого."""
+    def feed(chunk):
+        for frame in deframer.feed(chunk):
+            on_frame(frame)
+
+    await read_data(port, feed)
+
+
+async def run_async(generator, port, time_scale=1.0):
+    """Исполняет процесс netlab.des в цикле событий: паузы - asyncio.sleep, передачи - port.write.
+
+    Асинхронный двойник netlab.des.run_realtime; time_scale сжимает все
+    паузы. Возвращает результат генератора.
+    """
+    try:
+        item = next(generator)
+        while True:
+            if isinstance(item, (bytes, bytearray, memoryview)):
+                await port.write(item)
+            else:
+                await asyncio.sleep(item * time_scale)
+            item = next(generator)
+    except StopIteration as stop:
+        return stop.value
+
+
+async def send_frame_with_csma_cd(port, frame, rng=random, time_scale=1.0, on_event=None, backoff=calculate_backoff,
+                                  max_attempts=MAX_ATTEMPTS):
+    """Отправка кадра по CSMA/CD, как в LAB4, но без потоков и time.sleep.
+
+    Шаги выдаёт netlab.csma.csma_cd, поэтому логика совпадает с LAB4 и
+    моделью. on_event(событие, номер попытки, задержка) получает "busy",
+    "jam", "collision", "sent" и "dropped"; backoff и max_attempts - как
+    в csma_cd (стратегии из netlab.backoff). time_scale сжимает все
+    ожидания (для моделирования множества станций). Возвращает True,
+    если кадр передан.
+    """
+    process = csma_cd(frame, rng, on_event, backoff=backoff, max_attempts=max_attempts)
+    return await run_async(process, port, time_scale)
+
+
+async def run_demo(links, frames, transport, time_scale, seed, backoff=calculate_backoff, max_attempts=MAX_ATTEMPTS):
+    """links каналов по frames кадров CSMA/CD в одном цикле событий."""
+    rng = random.Random(seed)
+    pairs = []
+    for _ in range(links):
+        if transport == "pipe":
+            pairs.append(open_async_pipe_pair(115200))
+        else:
+            tx, rx = open_pty_pair(115200)
+            pairs.append((AsyncFdPort(tx), AsyncFdPort(rx)))
+    events = collections.Counter()
+    received = collections.Counter()
+
+    async def station(tx):
+        for number in range(frames):
+            frame = create_frame(f"{number % 1000000:06d}", "COM1", "COM2")
+            await send_frame_with_csma_cd(tx, frame, rng, time_scale,
+                                          lambda event, attempt, delay: events.update([event]),
+                                          backoff, max_attempts)
+
+    def count(index):
+        return lambda frame: received.update([index])
+
+    start = time.perf_counter()
+    readers = [asyncio.ensure_future(read_frames(rx, Deframer(HEADER_LENGTH + DATA_LENGTH + 1), count(index)))
+               for index, (tx, rx) in enumerate(pairs)]
+    await asyncio.gather(*(station(tx) for tx, rx in pairs))
+    # Даём приёмникам дочитать последние кадры
+    while sum(received.values()) < events["sent"] and time.perf_counter() - start < 60:
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    threads = threading.active_count()
+    for reader in readers:
+        reader.cancel()
+    for tx, rx in pairs:
+        tx.close()
+        rx.close()
+    return elapsed, threads, events, sum(received.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Много каналов CSMA/CD в одном цикле asyncio")
+    parser.add_argument("--links", type=int, default=200)
+    parser.add_argument("--frames", type=int, default=20, help="кадров на канал")
+    parser.add_argument("--transport", choices=("pty", "pipe"), default="pty")
+    parser.add_argument("--time-scale", type=float, default=0.01, help="множитель всех ожиданий CSMA/CD")
+    parser.add_argument("--backoff", choices=STRATEGIES, default="lab4",
+                        help="стратегия backoff; lab4 - как calculate_backoff")
+    parser.add_argument("--slot", type=float, default=SLOT_TIME, help="слот стратегий backoff, с")
+    parser.add_argument("--attempts", type=int, default=MAX_ATTEMPTS)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    backoff = make_backoff(args.backoff, args.slot)
+    elapsed, threads, events, received = asyncio.run(
+        run_demo(args.links, args.frames, args.transport, args.time_scale, args.seed, backoff, args.attempts))
+    print(f"Каналов: {args.links}, потоков: {threads}, время: {elapsed:.2f} с")
+    print(f"Передано кадров: {events['sent']}, принято: {received}, отброшено: {events['dropped']}, "
+          f"коллизий: {events['collision']}, канал занят: {events['busy']}")
+
+
+if __name__ == "__main__":
+    main()
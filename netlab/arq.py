@@ -0,0 +1,322 @@
+"""Надёжная доставка с подтверждениями: Go-Back-N и Selective Repeat.
+
+Кадры ARQ - кадры переменной длины из netlab.segment: поле номера сегмента
+служит порядковым номером, признак ACK_FLAG отмечает подтверждение.
+Отправитель и получатель - автоматы без своих часов и потоков: текущее
+время передаётся в методы, а кадры для отправки возвращаются вызывающему.
+Поэтому один и тот же код работает и в моделировании (simulate), и поверх
+настоящих портов в LAB3.
+"""
+import heapq
+import random
+
+from .channel import corrupt_data
+from .fcs import FCS_CRC8
+from .frame import FLAG, stuff_frame
+from .segment import HEADER_LENGTH, LAST_SEGMENT, SEGMENT_HEADER, build_segment, check_segment
+from .transmit import line_rate
+
+GO_BACK_N = "gbn"
+SELECTIVE_REPEAT = "sr"
+MODES = {"Go-Back-N": GO_BACK_N, "Selective Repeat": SELECTIVE_REPEAT}
+
+SEQ_MODULUS = 1 << 16  # Номер сегмента в заголовке занимает 2 байта
+ACK_FLAG = 0x02        # Признак кадра-подтверждения
+WINDOW = 8
+
+INITIAL_RTO = 1.0      # Тайм-аут до первого замера RTT, с
+MIN_RTO = 0.01
+MAX_RTO = 60.0
+GRANULARITY = 0.01     # Шаг таймера (цикл Tk опрашивает его раз в 10 мс), с
+
+
+def unwrap(seq, reference):
+    """Номер по модулю SEQ_MODULUS -> ближайший к reference абсолютный номер."""
+    half = SEQ_MODULUS // 2
+    return reference + (seq - reference + half) % SEQ_MODULUS - half
+
+
+class RetransmissionTimer:
+    """Адаптивный тайм-аут повтора по Якобсону-Карелсу (RFC 6298).
+
+    sample() учитывает замер RTT и пересчитывает тайм-аут, backoff()
+    удваивает его после срабатывания, reset() снимает удвоение - тайм-аут
+    снова считается по SRTT и RTTVAR. По алгоритму Карна замеры по
+    повторно переданным кадрам не делаются (это забота отправителя).
+    """
+
+    ALPHA = 1 / 8
+    BETA = 1 / 4
+    K = 4
+
+    def __init__(self, initial=INITIAL_RTO, minimum=MIN_RTO, maximum=MAX_RTO, granularity=GRANULARITY):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.granularity = granularity
+        self.initial = initial
+        self.srtt = None
+        self.rttvar = None
+        self.rto = initial
+
+    def sample(self, rtt):
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = (1 - self.BETA) * self.rttvar + self.BETA * abs(self.srtt - rtt)
+            self.srtt = (1 - self.ALPHA) * self.srtt + self.ALPHA * rtt
+        self.reset()
+
+    def reset(self):
+        if self.srtt is None:
+            self.rto = self.initial
+            return
+        rto = self.srtt + max(self.granularity, self.K * self.rttvar)
+        self.rto = min(max(rto, self.minimum), self.maximum)
+
+    def backoff(self):
+        self.rto = min(self.rto * 2, self.maximum)
+
+
+class ArqSender:
+    """Отправляющая сторона со скользящим окном.
+
+    send() занимает место в окне и возвращает номер для заголовка,
+    on_ack() обрабатывает подтверждение, poll() возвращает
+    [(номер, данные)] для повторной передачи по истечении тайм-аута.
+    started() переносит начало отсчёта на момент, когда кадр, ждавший в
+    очереди передатчика, действительно ушёл в линию. Подтверждение новых
+    данных снимает удвоение тайм-аута, иначе после повтора всего окна
+    Go-Back-N тайм-аут оставался бы у потолка.
+    Go-Back-N подтверждает кумулятивно (ACK - номер следующего ожидаемого
+    кадра) и повторяет всё окно; Selective Repeat подтверждает и повторяет
+    каждый кадр отдельно.
+    """
+
+    def __init__(self, mode=GO_BACK_N, window=WINDOW, timer=None):
+        limit = SEQ_MODULUS // 2 if mode == SELECTIVE_REPEAT else SEQ_MODULUS - 1
+        if mode not in (GO_BACK_N, SELECTIVE_REPEAT):
+            raise ValueError(f"Неизвестный режим ARQ: {mode}")
+        if not 1 <= window <= limit:
+            raise ValueError(f"Размер окна должен быть от 1 до {limit}")
+        self.mode = mode
+        self.window = window
+        self.timer = timer or RetransmissionTimer()
+        self.base = 0       # Самый старый неподтверждённый номер
+        self.next_seq = 0
+        self.unacked = {}   # номер -> [данные, время отправки, дедлайн, был ли повтор]
+        self.sent = 0
+        self.retransmissions = 0
+
+    def can_send(self):
+        return self.next_seq - self.base < self.window
+
+    def idle(self):
+        """Все отправленные кадры подтверждены."""
+        return not self.unacked
+
+    def send(self, data, now):
+        seq = self.next_seq
+        self.unacked[seq] = [data, now, now + self.timer.rto, False]
+        self.next_seq += 1
+        self.sent += 1
+        return seq % SEQ_MODULUS
+
+    def on_ack(self, ack, now):
+        ack = unwrap(ack, self.base)
+        if self.mode == GO_BACK_N:
+            if not self.base < ack <= self.next_seq:
+                return
+            newest = self.unacked[ack - 1]
+            self._acknowledged(newest, now)
+            for seq in range(self.base, ack):
+                del self.unacked[seq]
+            self.base = ack
+            if self.base in self.unacked:
+                # Таймер перезапускается для нового начала окна
+                self.unacked[self.base][2] = now + self.timer.rto
+        else:
+            entry = self.unacked.pop(ack, None)
+            if entry is None:
+                return
+            self._acknowledged(entry, now)
+            self.base = min(self.unacked) if self.unacked else self.next_seq
+
+    def _acknowledged(self, entry, now):
+        if entry[3]:
+            # По повторённому кадру RTT не замерить (алгоритм Карна)
+            self.timer.reset()
+        else:
+            self.timer.sample(now - entry[1])
+
+    def started(self, seq, now):
+        """Кадр seq начал передаваться в момент now: отсчёт RTT и тайм-аута - с него."""
+        entry = self.unacked.get(unwrap(seq, self.base))
+        if entry is not None:
+            entry[1] = now
+            entry[2] = now + self.timer.rto
+
+    def next_timeout(self):
+        """Ближайший момент, когда poll() что-то вернёт, или None."""
+        if not self.unacked:
+            return None
+        if self.mode == GO_BACK_N:
+            return self.unacked[self.base][2]
+        return min(entry[2] for entry in self.unacked.values())
+
+    def poll(self, now):
+        if self.mode == GO_BACK_N:
+            if not self.unacked or now < self.unacked[self.base][2]:
+                return []
+            expired = list(self.unacked)
+        else:
+            expired = [seq for seq, entry in self.unacked.items() if now >= entry[2]]
+            if not expired:
+                return []
+        self.timer.backoff()
+        resend = []
+        for seq in expired:
+            entry = self.unacked[seq]
+            entry[1] = now
+            entry[2] = now + self.timer.rto
+            entry[3] = True
+            resend.append((seq % SEQ_MODULUS, entry[0]))
+        self.sent += len(resend)
+        self.retransmissions += len(resend)
+        return resend
+
+
+class ArqReceiver:
+    """Принимающая сторона: выдаёт данные строго по порядку.
+
+    on_frame() возвращает (список данных для выдачи, номер для ACK или
+    None). Go-Back-N принимает только ожидаемый кадр; Selective Repeat
+    буферизует кадры в пределах окна.
+    """
+
+    def __init__(self, mode=GO_BACK_N, window=WINDOW):
+        self.mode = mode
+        self.window = window if mode == SELECTIVE_REPEAT else 1
+        self.expected = 0
+        self.buffer = {}
+        self.duplicates = 0
+
+    def on_frame(self, seq, data):
+        seq = unwrap(seq, self.expected)
+        delivered = []
+        if seq < self.expected:
+            self.duplicates += 1
+        elif seq < self.expected + self.window:
+            self.buffer[seq] = data
+            while self.expected in self.buffer:
+                delivered.append(self.buffer.pop(self.expected))
+                self.expected += 1
+        elif self.mode == SELECTIVE_REPEAT:
+            return delivered, None
+        if self.mode == GO_BACK_N:
+            return delivered, self.expected % SEQ_MODULUS
+        return delivered, seq % SEQ_MODULUS
+
+
+def data_frame(seq, payload, last=True, destination=0, source=0, fcs_type=FCS_CRC8):
+    """Кадр данных ARQ без экранирования."""
+    return build_segment(destination, source, 0, seq, LAST_SEGMENT if last else 0, payload, fcs_type)
+
+
+def ack_frame(ack, destination=0, source=0, fcs_type=FCS_CRC8):
+    """Кадр-подтверждение ARQ без экранирования."""
+    return build_segment(destination, source, 0, ack, ACK_FLAG, b'', fcs_type)
+
+
+def parse_arq_frame(frame):
+    """Проверка FCS и разбор кадра ARQ.
+
+    Возвращает (назначение, источник, подтверждение ли, номер, последний ли
+    сегмент, данные) или None, если FCS не совпал - такой кадр отбрасывается
+    и будет передан повторно.
+    """
+    if not check_segment(frame):
+        return None
+    destination, source, msg_id, seq, flags, length = SEGMENT_HEADER.unpack_from(frame, len(FLAG))
+    payload = frame[HEADER_LENGTH:HEADER_LENGTH + length]
+    return destination, source, bool(flags & ACK_FLAG), seq, bool(flags & LAST_SEGMENT), payload
+
+
+def simulate(mode, window, count=1000, payload_size=16, probability=0.1, baudrate=115200,
+             delay=0.005, rng=None, fcs_type=FCS_CRC8):
+    """Моделирование передачи count кадров по дуплексной линии с ошибками.
+
+    Каждый кадр (и данные, и ACK) проходит через corrupt_data с
+    вероятностью искажения probability; искажённые кадры отбрасываются по
+    FCS типа fcs_type. Время передачи кадра - длина после стаффинга на
+    скорости линии, плюс задержка распространения delay. Возвращает
+    словарь со временем, полезной скоростью и долей повторов.
+    """
+    rng = rng or random.Random(0)
+    rate = line_rate(baudrate)
+    payloads = [bytes(rng.getrandbits(8) for _ in range(payload_size)) for _ in range(count)]
+    sender = ArqSender(mode, window, RetransmissionTimer(initial=max(0.1, 4 * delay)))
+    receiver = ArqReceiver(mode, window)
+    events = []   # (время прихода, порядковый номер, кадр)
+    link_free = {"data": 0.0, "ack": 0.0}
+    order = 0
+    now = 0.0
+    queued = 0
+    delivered = []
+
+    def transmit(direction, frame):
+        """Ставит кадр в линию; возвращает момент начала его передачи."""
+        nonlocal order
+        start = max(now, link_free[direction])
+        link_free[direction] = start + len(stuff_frame(frame)) / rate
+        # Искажается всё после флага: заголовок, данные и FCS
+        frame = frame[:2] + corrupt_data(frame[2:], probability, rng)
+        heapq.heappush(events, (link_free[direction] + delay, order, frame))
+        order += 1
+        return start
+
+    while len(delivered) < count:
+        for seq, payload in sender.poll(now):
+            # Повторы ждут своей очереди в линии, таймер - с начала передачи
+            sender.started(seq, transmit("data", data_frame(seq, payload, fcs_type=fcs_type)))
+        # Новый кадр уходит, только когда линия свободна, - иначе таймер
+        # считал бы и время ожидания в очереди передатчика
+        if queued < count and sender.can_send() and link_free["data"] <= now:
+            seq = sender.send(payloads[queued], now)
+            transmit("data", data_frame(seq, payloads[queued], fcs_type=fcs_type))
+            queued += 1
+        wakeups = [sender.next_timeout()]
+        if queued < count and sender.can_send():
+            wakeups.append(link_free["data"])
+        wakeup = min((t for t in wakeups if t is not None), default=None)
+        if wakeup is not None and (not events or wakeup < events[0][0]):
+            now = max(now, wakeup)
+            continue
+        now, _, frame = heapq.heappop(events)
+        parsed = parse_arq_frame(frame)
+        if parsed is None:
+            continue
+        destination, source, is_ack, seq, last, payload = parsed
+        if is_ack:
+            sender.on_ack(seq, now)
+        else:
+            ready, ack = receiver.on_frame(seq, payload)
+            delivered.extend(ready)
+            if ack is not None:
+                transmit("ack", ack_frame(ack, fcs_type=fcs_type))
+
+    if delivered != payloads:
+        raise RuntimeError("Данные доставлены не по порядку или искажены")
+    goodput = count * payload_size / now
+    return {
+        "mode": mode,
+        "window": window,
+        "frames": count,
+        "sent": sender.sent,
+        "retransmissions": sender.retransmissions,
+        "retransmission_ratio": sender.retransmissions / sender.sent,
+        "time": now,
+        "goodput": goodput,
+        "efficiency": goodput / rate,
+        "rto": sender.timer.rto,
+    }
@@ -0,0 +1,129 @@
+"""Стратегии задержки (backoff) после коллизии и показатели эффективности.
+
+Стратегия вызывается так же, как calculate_backoff: (номер попытки, rng)
+-> задержка в секундах, поэтому подходит везде, где ждут эту функцию
+(netlab.csma.csma_cd, netlab.bus.Bus). Задержка - случайное целое число
+слотов из окна [0, window) умножить на slot_time; только стратегия "lab4"
+повторяет calculate_backoff и берёт непрерывную задержку из [0, window - 1)
+слотов. После каждой попытки передачи вызывается observe(была ли
+коллизия); этим пользуется только адаптивная стратегия.
+"""
+import abc
+import math
+import random
+
+from .csma import BACKOFF_LIMIT
+
+SLOT_TIME = 0.01       # Слот, с: как в calculate_backoff (задержка в сотых долях секунды)
+FIXED_WINDOW = 16      # Окно фиксированной стратегии, слотов
+SMOOTHING = 0.1        # Вес новой попытки в оценке частоты коллизий
+
+
+class Backoff(abc.ABC):
+    """Стратегия задержки: окно в слотах в зависимости от номера попытки."""
+
+    def __init__(self, slot_time=SLOT_TIME, limit=BACKOFF_LIMIT):
+        self.slot_time = slot_time
+        self.limit = limit
+
+    @abc.abstractmethod
+    def window(self, attempt):
+        """Размер окна в слотах для попытки attempt."""
+
+    def observe(self, collided):
+        """Итог попытки передачи: True - коллизия, False - кадр передан."""
+
+    def __call__(self, attempt, rng=random):
+        return rng.randrange(self.window(attempt)) * self.slot_time
+
+
+class Lab4(Backoff):
+    """Исходная задержка LAB4 (calculate_backoff): равномерно из [0, 2^min(n, limit) - 1) слотов."""
+
+    def window(self, attempt):
+        return 2 ** min(attempt, self.limit)
+
+    def __call__(self, attempt, rng=random):
+        return rng.uniform(0, self.window(attempt) - 1) * self.slot_time
+
+
+class BinaryExponential(Backoff):
+    """Усечённая двоичная экспоненциальная: окно 2^min(n, limit), как в Ethernet."""
+
+    def window(self, attempt):
+        return 2 ** min(attempt, self.limit)
+
+
+class Linear(Backoff):
+    """Линейная: окно растёт на слот с каждой попыткой (до 2^limit)."""
+
+    def window(self, attempt):
+        return min(attempt, 2 ** self.limit) + 1
+
+
+class Fixed(Backoff):
+    """Фиксированная: окно не зависит от номера попытки."""
+
+    def __init__(self, slot_time=SLOT_TIME, limit=BACKOFF_LIMIT, size=FIXED_WINDOW):
+        super().__init__(slot_time, limit)
+        self.size = size
+
+    def window(self, attempt):
+        return self.size
+
+
+class Adaptive(Backoff):
+    """Адаптивная: окно по наблюдаемой частоте коллизий, а не по номеру попытки.
+
+    Частота - экспоненциальное скользящее среднее исходов попыток; окно
+    2^(частота * limit), то есть от 1-2 слотов на свободном канале до
+    2^limit при сплошных коллизиях. Один объект на несколько станций
+    оценивает частоту коллизий в канале в целом.
+    """
+
+    def __init__(self, slot_time=SLOT_TIME, limit=BACKOFF_LIMIT, smoothing=SMOOTHING):
+        super().__init__(slot_time, limit)
+        self.smoothing = smoothing
+        self.rate = 0.0
+
+    def observe(self, collided):
+        self.rate += self.smoothing * (collided - self.rate)
+
+    def window(self, attempt):
+        return round(2 ** (self.rate * self.limit)) + 1
+
+
+STRATEGIES = {
+    "lab4": Lab4,
+    "binary": BinaryExponential,
+    "linear": Linear,
+    "fixed": Fixed,
+    "adaptive": Adaptive,
+}
+
+
+def make_backoff(name, slot_time=SLOT_TIME, limit=BACKOFF_LIMIT):
+    """Стратегия по имени из STRATEGIES."""
+    try:
+        strategy = STRATEGIES[name]
+    except KeyError:
+        raise ValueError(f"Неизвестная стратегия backoff: {name}") from None
+    return strategy(slot_time, limit)
+
+
+def efficiency(sent, dropped, delays, duration):
+    """Показатели прогона.
+
+    delays - задержки доступа переданных кадров (от постановки до конца
+    передачи), с; duration - длительность прогона, с. Возвращает
+    пропускную способность (кадр/с), среднюю и p99 задержку и долю
+    отброшенных кадров.
+    """
+    delays = sorted(delays)
+    finished = sent + dropped
+    return {
+        "throughput": sent / duration if duration else 0.0,
+        "mean_delay": math.fsum(delays) / len(delays) if delays else 0.0,
+        "p99_delay": delays[min(len(delays) - 1, int(len(delays) * 0.99))] if delays else 0.0,
+        "drop_rate": dropped / finished if finished else 0.0,
+    }
@@ -0,0 +1,259 @@
+"""Общая шина CSMA/CD: N станций, задержка распространения, настоящие коллизии.
+
+В LAB4 занятость канала и коллизия - два независимых броска монеты,
+поэтому нельзя увидеть, как падает пропускная способность с ростом
+числа станций. Здесь станции равномерно расставлены вдоль шины, сигнал
+от станции i доходит до станции j через |x_i - x_j| * propagation
+секунд. Станция слушает канал (1-настойчивый CSMA): если в её точке
+слышна чужая передача, она ждёт её конца; иначе передаёт. Коллизия
+возникает, только если передачи действительно перекрылись: станция
+начала передачу, ещё не услышав чужую. Каждая сторона обнаруживает
+коллизию, когда до неё доходит чужой сигнал, передаёт jam-сигнал,
+прекращает передачу и ждёт backoff(номер попытки) - calculate_backoff
+или стратегию из netlab.backoff.
+
+Все станции живут в одной очереди событий netlab.des.Simulator, потоков
+нет. Кадры поступают общим пуассоновским потоком на случайные станции,
+поэтому в очереди событий одно событие поступления, а не N. Передачи,
+которые ещё слышны хотя бы где-то на шине, хранятся в коротком списке
+active; ждущая станция подписывается только на ту передачу, конец
+которой услышит последним, и будится одним событием.
+
+Запуск: python -m netlab.bus [--stations 1 10 100 1000] [--load 1.0]
+        python -m netlab.bus --stations 100 --backoff binary linear fixed adaptive
+"""
+import argparse
+import collections
+import random
+import time
+
+from .backoff import SLOT_TIME, STRATEGIES, efficiency, make_backoff
+from .csma import JAM_SIGNAL, calculate_backoff
+from .des import Simulator
+from .frame import create_frame
+from .transmit import line_rate
+
+ATTEMPT_LIMIT = 16    # Попыток до отбрасывания кадра, как в Ethernet
+PROPAGATION = 0.01    # Задержка из конца в конец шины в долях времени кадра
+DURATION = 2000       # Длительность прогона во временах кадра
+
+
+class Transmission:
+    """Передача станции: начало, конец (сокращается при коллизии), ждущие станции."""
+
+    __slots__ = ("station", "start", "end", "collided", "waiters")
+
+    def __init__(self, station, start, end):
+        self.station = station
+        self.start = start
+        self.end = end
+        self.collided = False
+        self.waiters = []
+
+
+class Station:
+    """Станция шины: очередь кадров (моменты поступления) и состояние повторов."""
+
+    __slots__ = ("number", "position", "queue", "attempts", "transmission", "waiting", "epoch",
+                 "sent", "dropped", "collisions")
+
+    def __init__(self, number, position):
+        self.number = number
+        self.position = position
+        self.queue = collections.deque()
+        self.attempts = 0
+        self.transmission = None  # Текущая передача
+        self.waiting = None       # Передача, конца которой станция ждёт
+        self.epoch = 0            # Устаревшие события станции отбрасываются по номеру
+        self.sent = self.dropped = self.collisions = 0
+
+
+class Bus:
+    """Шина с stations станциями.
+
+    frame_time и jam_time - длительность кадра и jam-сигнала, с;
+    propagation - задержка распространения из конца в конец шины, с;
+    load - предлагаемая нагрузка (кадров за время кадра по всем станциям).
+    """
+
+    def __init__(self, stations, frame_time, jam_time, propagation, load,
+                 attempt_limit=ATTEMPT_LIMIT, backoff=calculate_backoff, seed=0):
+        if 2 * propagation > frame_time:
+            # Иначе передающая станция может закончить кадр до того, как
+            # услышит коллизию, и не узнает о ней
+            raise ValueError("Кадр короче двойной задержки распространения")
+        self.rng = random.Random(seed)
+        self.sim = Simulator()
+        self.frame_time = frame_time
+        self.jam_time = jam_time
+        self.propagation = propagation
+        self.arrival_rate = load / frame_time
+        self.attempt_limit = attempt_limit
+        self.backoff = backoff
+        self.observe = getattr(backoff, "observe", None)
+        step = 1 / (stations - 1) if stations > 1 else 0.0
+        self.stations = [Station(number, number * step) for number in range(stations)]
+        self.active = []
+        self.busy_time = 0.0    # Время успешных передач
+        self.delays = []        # Задержка доступа переданных кадров: от поступления до конца передачи
+        self.arrived = 0
+        self.collisions = 0
+
+    def delay(self, a, b):
+        return abs(a.position - b.position) * self.propagation
+
+    def run(self, duration):
+        """Моделирует duration секунд работы шины."""
+        self.sim.schedule(self.rng.expovariate(self.arrival_rate), self._arrival)
+        self.sim.run(until=duration)
+        return self.report()
+
+    def _arrival(self):
+        station = self.rng.choice(self.stations)
+        station.queue.append(self.sim.now)
+        self.arrived += 1
+        if len(station.queue) == 1 and station.transmission is None and station.waiting is None:
+            self._sense(station, station.epoch)
+        self.sim.schedule(self.rng.expovariate(self.arrival_rate), self._arrival)
+
+    def _sense(self, station, epoch):
+        """Прослушивание канала: передача или ожидание конца слышимой передачи."""
+        if epoch != station.epoch:
+            return
+        now = self.sim.now
+        station.waiting = None
+        # Передачи, которые уже нигде не слышны, больше не нужны
+        horizon = now - self.propagation
+        self.active = active = [tx for tx in self.active if tx.end > horizon]
+        latest = None
+        latest_end = now
+        for tx in active:
+            d = self.delay(station, tx.station)
+            if tx.start + d <= now < tx.end + d and tx.end + d > latest_end:
+                latest, latest_end = tx, tx.end + d
+        if latest is not None:
+            station.waiting = latest
+            latest.waiters.append(station)
+            station.epoch += 1
+            self.sim.schedule(latest_end - now, self._sense, station, station.epoch)
+            return
+        self._transmit(station, active)
+
+    def _transmit(self, station, active):
+        now = self.sim.now
+        tx = Transmission(station, now, now + self.frame_time)
+        for other in active:
+            d = self.delay(station, other.station)
+            if now < other.start + d:
+                # Станция не услышала other: коллизию обе стороны обнаружат,
+                # когда до них дойдёт чужой сигнал
+                self.sim.schedule(other.start + d - now, self._detect, tx)
+                if now + d < other.end:
+                    self.sim.schedule(d, self._detect, other)
+        active.append(tx)
+        station.transmission = tx
+        self.sim.schedule(self.frame_time, self._finish, tx, tx.end)
+
+    def _detect(self, tx):
+        """Станция слышит чужой сигнал во время своей передачи: jam и обрыв."""
+        now = self.sim.now
+        if tx.collided or now >= tx.end:
+            return
+        tx.collided = True
+        tx.station.collisions += 1
+        self.collisions += 1
+        tx.end = min(tx.end, now + self.jam_time)
+        self.sim.schedule(tx.end - now, self._finish, tx, tx.end)
+        # Станции, ждавшие этой передачи, услышат её конец раньше
+        for station in tx.waiters:
+            if station.waiting is tx:
+                station.epoch += 1
+                self.sim.schedule(tx.end + self.delay(station, tx.station) - now,
+                                  self._sense, station, station.epoch)
+        tx.waiters = []
+
+    def _finish(self, tx, end):
+        if end != tx.end:
+            return  # Конец передачи перенесён коллизией
+        station = tx.station
+        station.transmission = None
+        if self.observe:
+            self.observe(tx.collided)
+        if tx.collided:
+            station.attempts += 1
+            if station.attempts < self.attempt_limit:
+                station.epoch += 1
+                self.sim.schedule(self.backoff(station.attempts, self.rng), self._sense, station, station.epoch)
+                return
+            station.dropped += 1
+        else:
+            station.sent += 1
+            self.busy_time += self.frame_time
+            self.delays.append(self.sim.now - station.queue[0])
+        station.queue.popleft()
+        station.attempts = 0
+        if station.queue:
+            station.epoch += 1
+            self._sense(station, station.epoch)
+
+    def report(self):
+        """Итоги прогона: утилизация канала, переданные и отброшенные кадры, задержка."""
+        now = self.sim.now
+        sent = sum(station.sent for station in self.stations)
+        dropped = sum(station.dropped for station in self.stations)
+        return {
+            **efficiency(sent, dropped, self.delays, now),
+            "stations": len(self.stations),
+            "time": now,
+            "offered": self.arrived * self.frame_time / now if now else 0.0,
+            "utilization": self.busy_time / now if now else 0.0,
+            "arrived": self.arrived,
+            "sent": sent,
+            "dropped": dropped,
+            "collisions": self.collisions,
+            "queued": sum(len(station.queue) for station in self.stations),
+            "events": self.sim.processed,
+        }
+
+
+def simulate_bus(stations, load, baudrate=9600, propagation=PROPAGATION, duration=DURATION,
+                 attempt_limit=ATTEMPT_LIMIT, seed=0, frame=None, backoff=calculate_backoff):
+    """Прогон шины с кадрами LAB4; propagation и duration - во временах кадра."""
+    frame = frame or create_frame("hello", "COM1", "COM2")
+    frame_time = len(frame) / line_rate(baudrate)
+    jam_time = len(JAM_SIGNAL) / line_rate(baudrate)
+    bus = Bus(stations, frame_time, jam_time, propagation * frame_time, load, attempt_limit, backoff, seed)
+    return bus.run(duration * frame_time)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CSMA/CD на общей шине с N станциями")
+    parser.add_argument("--stations", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--load", type=float, default=1.0, help="предлагаемая нагрузка, кадров за время кадра")
+    parser.add_argument("--baudrate", type=int, default=9600)
+    parser.add_argument("--propagation", type=float, default=PROPAGATION, help="задержка шины во временах кадра")
+    parser.add_argument("--duration", type=float, default=DURATION, help="длительность во временах кадра")
+    parser.add_argument("--attempts", type=int, default=ATTEMPT_LIMIT)
+    parser.add_argument("--backoff", nargs="+", choices=STRATEGIES, default=["lab4"],
+                        help="стратегии для сравнения; lab4 - как calculate_backoff")
+    parser.add_argument("--slot", type=float, default=SLOT_TIME, help="слот стратегий backoff, с")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'backoff':>9} {'станций':>8} {'нагрузка':>9} {'утилизация':>11} {'кадр/с':>8} {'отброшено':>10} "
+          f"{'коллизий':>9} {'задержка ср/p99, с':>19} {'событий':>8} {'расчёт, с':>10}")
+    for name in args.backoff:
+        for stations in args.stations:
+            backoff = make_backoff(name, args.slot)
+            start = time.perf_counter()
+            result = simulate_bus(stations, args.load, args.baudrate, args.propagation, args.duration,
+                                  args.attempts, args.seed, backoff=backoff)
+            elapsed = time.perf_counter() - start
+            delay = f"{result['mean_delay']:.3f}/{result['p99_delay']:.3f}"
+            print(f"{name:>9} {stations:>8} {result['offered']:>9.2f} {result['utilization']:>11.3f} "
+                  f"{result['throughput']:>8.2f} {result['drop_rate']:>10.1%} {result['collisions']:>9} "
+                  f"{delay:>19} {result['events']:>8} {elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Эмуляция ошибок в канале связи.
+
+corrupt_data искажает один кадр в интерактивных лабораторных; пакетные
+модели на numpy (BitErrorChannel, GilbertElliottChannel) искажают сразу
+массив кадров для статистики на миллионах кадров.
+"""
+import random
+
+CORRUPTION_PROBABILITY = 0.7
+
+
+def corrupt_data(data, probability=CORRUPTION_PROBABILITY, rng=random):
+    """Случайное искажение одного бита в данных (пустые данные не меняются)."""
+    if data and rng.random() < probability:
+        byte_index = rng.randint(0, len(data) - 1)
+        bit_index = rng.randint(0, 7)
+        corrupted_byte = data[byte_index] ^ (1 << bit_index)
+        data = data[:byte_index] + bytes([corrupted_byte]) + data[byte_index + 1:]
+    return data
+
+
+def _numpy():
+    """numpy нужен только пакетным моделям канала и импортируется при первом вызове."""
+    import numpy
+
+    return numpy
+
+
+class BitErrorChannel:
+    """Канал с независимыми ошибками бит (BSC) для пакетов кадров.
+
+    transmit() принимает массив кадров uint8 формы (число кадров, длина)
+    и возвращает его копию, где каждый бит инвертирован с вероятностью
+    ber. Биты кадров идут подряд, как на линии, поэтому ошибки
+    генерируются позициями в общем потоке, а не по случайному числу на
+    бит - при малом BER это в сотни раз дешевле.
+    """
+
+    def __init__(self, ber, seed=None):
+        np = _numpy()
+        self.ber = ber
+        self.rng = np.random.default_rng(seed)
+
+    def error_positions(self, bits):
+        """Номера искажённых бит в потоке из bits бит."""
+        np = _numpy()
+        # Число ошибок - биномиальное, позиции - без повторов: это ровно
+        # независимые ошибки в каждом бите с вероятностью ber
+        count = self.rng.binomial(bits, self.ber)
+        return np.sort(self.rng.choice(bits, count, replace=False))
+
+    def error_mask(self, count, length):
+        """Маска ошибок uint8 формы (count, length): единичные биты искажаются."""
+        np = _numpy()
+        mask = np.zeros(count * length, dtype=np.uint8)
+        positions = self.error_positions(count * length * 8)
+        np.bitwise_or.at(mask, positions >> 3, (0x80 >> (positions & 7)).astype(np.uint8))
+        return mask.reshape(count, length)
+
+    def transmit(self, frames):
+        return frames ^ self.error_mask(*frames.shape)
+
+
+class GilbertElliottChannel(BitErrorChannel):
+    """Канал Гилберта-Эллиотта: ошибки пачками.
+
+    Цепь Маркова с состояниями "хорошо" и "плохо": на каждом бите канал
+    переходит из хорошего в плохое с вероятностью p_gb и обратно с
+    вероятностью p_bg, в каждом состоянии ошибки независимы с
+    вероятностью ber_good и ber_bad. Состояние сохраняется между
+    вызовами, так что пачка может переходить из пакета в пакет.
+    """
+
+    def __init__(self, p_gb, p_bg, ber_bad=0.5, ber_good=0.0, seed=None):
+        super().__init__(ber_good, seed)
+        self.p_gb = p_gb
+        self.p_bg = p_bg
+        self.ber_bad = ber_bad
+        self.ber_good = ber_good
+        self.bad = False
+
+    def mean_ber(self):
+        """Средний BER в установившемся режиме."""
+        bad_share = self.p_gb / (self.p_gb + self.p_bg)
+        return bad_share * self.ber_bad + (1 - bad_share) * self.ber_good
+
+    def error_positions(self, bits):
+        np = _numpy()
+        # Длины пребывания в состояниях геометрические - разыгрываем их
+        # сразу пачкой, пока не покроем весь поток
+        runs = []
+        covered = 0
+        bad = self.bad
+        while covered < bits:
+            expected = int((bits - covered) / (1 / self.p_gb + 1 / self.p_bg) * 1.2) + 16
+            good_runs = self.rng.geometric(self.p_gb, expected)
+            bad_runs = self.rng.geometric(self.p_bg, expected)
+            pair = np.stack((bad_runs, good_runs) if bad else (good_runs, bad_runs), axis=1).ravel()
+            runs.append(pair)
+            covered += int(pair.sum())
+        runs = np.concatenate(runs)
+        ends = np.cumsum(runs)
+        used = int(np.searchsorted(ends, bits, side='left')) + 1
+        runs, ends = runs[:used], ends[:used]
+        # Состояние в конце потока переходит в следующий вызов; остаток
+        # последнего отрезка не сохраняется - у геометрического
+        # распределения нет памяти
+        self.bad = bad if used % 2 else not bad
+        starts = ends - runs
+        positions = []
+        for first, state_ber in ((0, self.ber_bad if bad else self.ber_good),
+                                 (1, self.ber_good if bad else self.ber_bad)):
+            if not state_ber:
+                continue
+            run_starts = starts[first::2]
+            run_lengths = np.minimum(runs[first::2], bits - run_starts)
+            total = int(run_lengths.sum())
+            hits = self.rng.random(total) < state_ber
+            offsets = np.flatnonzero(hits)
+            # Смещение в склеенных отрезках -> позиция в потоке
+            boundaries = np.cumsum(run_lengths) - run_lengths
+            index = np.searchsorted(boundaries, offsets, side='right') - 1
+            positions.append(run_starts[index] + offsets - boundaries[index])
+        if not positions:
+            return np.zeros(0, dtype=np.int64)
+        return np.sort(np.concatenate(positions))
@@ -0,0 +1,171 @@
+"""Контрольная сумма CRC-8 и исправление одиночных ошибок.
+
+crc8_batch и crc8_verify_batch считают CRC сразу для массива кадров и
+требуют numpy; он импортируется только при их вызове.
+"""
+import functools
+
+CRC_POLYNOMIAL = 0x1D
+SLICE_THRESHOLD = 4096  # С этой длины быстрее обработка по 8 байт за шаг
+
+
+def make_crc8_table(polynomial=CRC_POLYNOMIAL):
+    """Таблица CRC-8 на 256 значений: CRC одного байта при нулевом начальном значении."""
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            if crc & 0x80:
+                crc = (crc << 1) ^ polynomial
+            else:
+                crc <<= 1
+            crc &= 0xFF
+        table.append(crc)
+    return table
+
+
+def make_slice_tables(table, count=8):
+    """Таблицы slice-by-N: tables[k][b] - CRC байта b, за которым идут k нулевых байт."""
+    tables = [table]
+    for _ in range(count - 1):
+        tables.append([table[crc] for crc in tables[-1]])
+    return tables
+
+
+CRC8_TABLE = make_crc8_table()
+SLICE8_TABLES = make_slice_tables(CRC8_TABLE)
+
+
+def crc8_update(crc, data):
+    """Продолжение вычисления CRC-8 (целое 0-255) на очередной порции данных.
+
+    Позволяет считать FCS потоково: crc8_update(crc8_update(0, a), b)
+    равно crc8_update(0, a + b).
+    """
+    if len(data) >= SLICE_THRESHOLD:
+        return _crc8_slice8(crc, data)
+    table = CRC8_TABLE
+    for byte in data:
+        crc = table[crc ^ byte]
+    return crc
+
+
+def _crc8_slice8(crc, data):
+    """Slice-by-8: восемь байт за шаг по восьми таблицам."""
+    t7, t6, t5, t4, t3, t2, t1, t0 = reversed(SLICE8_TABLES)
+    tail = len(data) % 8
+    end = len(data) - tail
+    columns = [data[k:end:8] for k in range(8)]
+    for b0, b1, b2, b3, b4, b5, b6, b7 in zip(*columns):
+        crc = (t7[crc ^ b0] ^ t6[b1] ^ t5[b2] ^ t4[b3] ^
+               t3[b4] ^ t2[b5] ^ t1[b6] ^ t0[b7])
+    table = CRC8_TABLE
+    for byte in data[end:]:
+        crc = table[crc ^ byte]
+    return crc
+
+
+def crc8(data):
+    """Вычисление CRC-8 для данных."""
+    return crc8_update(0, data).to_bytes(1, 'big')
+
+
+def _frame_columns(frames, frame_length, offsets, lengths):
+    """Кадры -> (массив uint8 (кадры, байты), длины или None)."""
+    import numpy as np
+
+    if isinstance(frames, np.ndarray) and frames.ndim == 2:
+        return frames.astype(np.uint8, copy=False), None
+    buffer = np.frombuffer(frames, dtype=np.uint8) if not isinstance(frames, np.ndarray) else frames
+    if offsets is None:
+        if frame_length is None or len(buffer) % frame_length:
+            raise ValueError("Длина буфера должна быть кратна длине кадра")
+        return buffer.reshape(-1, frame_length), None
+    offsets = np.asarray(offsets, dtype=np.int64)
+    lengths = np.broadcast_to(np.asarray(frame_length if lengths is None else lengths, dtype=np.int64),
+                              offsets.shape)
+    if len(offsets) and int((offsets + lengths).max()) > len(buffer):
+        raise ValueError("Кадр выходит за границу буфера")
+    width = int(lengths.max()) if len(lengths) else 0
+    # Кадры разной длины выравниваются по самому длинному; лишние байты
+    # берутся из буфера, но в CRC не попадают (см. маску в crc8_batch)
+    index = np.minimum(offsets[:, None] + np.arange(width), len(buffer) - 1)
+    return buffer[index], lengths
+
+
+def crc8_batch(frames, frame_length=None, offsets=None, lengths=None):
+    """CRC-8 сразу для многих кадров: массив uint8 значений FCS.
+
+    frames - буфер (bytes, bytearray, memoryview, одномерный массив) с
+    кадрами длины frame_length подряд, либо двумерный массив uint8
+    (кадр на строку). С offsets кадры берутся из буфера с этих смещений,
+    длина - frame_length или массив lengths. Таблица применяется к
+    столбцу байтов всех кадров за одну операцию numpy, поэтому цикл на
+    Python идёт по длине кадра, а не по числу кадров.
+    """
+    import numpy as np
+
+    columns, lengths = _frame_columns(frames, frame_length, offsets, lengths)
+    table = np.array(CRC8_TABLE, dtype=np.uint8)
+    crc = np.zeros(len(columns), dtype=np.uint8)
+    for position in range(columns.shape[1]):
+        updated = table[crc ^ columns[:, position]]
+        crc = updated if lengths is None else np.where(position < lengths, updated, crc)
+    return crc
+
+
+def crc8_verify_batch(frames, frame_length=None, offsets=None, lengths=None):
+    """Маска корректных кадров: каждый кадр - данные и 1 байт CRC-8 в конце.
+
+    CRC-8 без начального значения и финального XOR от данных вместе с их
+    FCS равен нулю, поэтому проверка - тот же crc8_batch по всему кадру.
+    """
+    return crc8_batch(frames, frame_length, offsets, lengths) == 0
+
+
+@functools.lru_cache(maxsize=None)
+def syndrome_table(data_length):
+    """Таблица синдромов для данных длины data_length.
+
+    CRC линеен, поэтому синдром (принятый FCS XOR вычисленный) зависит
+    только от позиции ошибки: это CRC вектора ошибки. Таблица сопоставляет
+    синдрому кортеж позиций (байт, бит), которые его дают; байт с индексом
+    data_length - сам FCS. Строится один раз для каждой длины за O(8N).
+    """
+    table = {}
+    for bit in range(8):
+        table.setdefault(1 << bit, []).append((data_length, bit))  # Ошибка в самом FCS
+    syndromes = [CRC8_TABLE[1 << bit] for bit in range(8)]
+    for i in reversed(range(data_length)):
+        for bit, syndrome in enumerate(syndromes):
+            table.setdefault(syndrome, []).append((i, bit))
+        syndromes = [CRC8_TABLE[syndrome] for syndrome in syndromes]  # Сдвиг на нулевой байт
+    return {syndrome: tuple(sorted(positions)) for syndrome, positions in table.items()}
+
+
+def error_candidates(data, received_fcs):
+    """Позиции (байт, бит) одиночной ошибки, объясняющие расхождение FCS.
+
+    Пустой кортеж - FCS совпадает или ошибка не одиночная; больше одной
+    позиции - синдром неоднозначен и исправлять нельзя.
+    """
+    syndrome = received_fcs[0] ^ crc8_update(0, data)
+    if not syndrome:
+        return ()
+    return syndrome_table(len(data)).get(syndrome, ())
+
+
+def correct_single_error(data, received_fcs, polynomial=CRC_POLYNOMIAL):
+    """Исправление одиночной ошибки в данных по таблице синдромов.
+
+    Возвращает (данные, True), если позиция ошибки определена однозначно,
+    иначе (данные, False). Ошибка в самом FCS не меняет данные.
+    """
+    candidates = error_candidates(data, received_fcs)
+    if len(candidates) != 1:
+        return data, False  # Ошибка не исправлена
+    byte_index, bit = candidates[0]
+    modified_data = bytearray(data)
+    if byte_index < len(data):
+        modified_data[byte_index] ^= (1 << bit)
+    return modified_data, True  # Ошибка исправлена
@@ -0,0 +1,73 @@
+"""Эмуляция канала с множественным доступом CSMA/CD."""
+import random
+
+CHANNEL_BUSY_PROBABILITY = 0.5
+COLLISION_PROBABILITY = 0.6
+BACKOFF_LIMIT = 10  # Показатель степени перестаёт расти после 10-й попытки
+MAX_ATTEMPTS = 2    # После стольких коллизий кадр отбрасывается (LAB4)
+BUSY_WAIT = 0.5     # Ожидание при занятом канале, с
+JAM_DELAY = 0.1     # Пауза перед jam-сигналом, с
+
+JAM_SIGNAL = b'JAM'  # Определение jam-сигнала
+
+
+def is_channel_busy(rng=random, probability=CHANNEL_BUSY_PROBABILITY):
+    """Эмуляция занятости канала."""
+    return rng.random() < probability
+
+
+def is_collision_occurred(rng=random, probability=COLLISION_PROBABILITY):
+    """Эмуляция коллизии."""
+    return rng.random() < probability
+
+
+def calculate_backoff(attempt, rng=random, limit=BACKOFF_LIMIT):
+    """Рассчет задержки (backoff) с учетом номера попытки."""
+    k = min(attempt, limit)  # k = min(n, 10), где n — номер попытки
+    return rng.uniform(0, (2 ** k) - 1) / 100  # Задержка в секундах
+
+
+def csma_cd(frame, rng=random, on_event=None, backoff=calculate_backoff, max_attempts=MAX_ATTEMPTS,
+            busy_probability=CHANNEL_BUSY_PROBABILITY, collision_probability=COLLISION_PROBABILITY):
+    """Отправка кадра по CSMA/CD (логика LAB4) как процесс без ожиданий.
+
+    Генератор выдаёт шаги: число - пауза в секундах, bytes - запись в
+    линию (кадр или jam-сигнал). Исполняет шаги netlab.des: в реальном
+    времени (run_realtime) или в модельном (Simulator.process), поэтому
+    при одном и том же rng решения в обоих режимах совпадают.
+    on_event(событие, номер попытки, задержка) получает "busy", "jam",
+    "collision", "sent" и "dropped". backoff(номер попытки, rng) - задержка
+    после коллизии (функция или стратегия из netlab.backoff; её observe(),
+    если есть, узнаёт исход каждой попытки). busy_probability и
+    collision_probability заменяют вероятности LAB4 (для подбора в
+    netlab.sweep). Возвращает True, если кадр передан.
+    """
+    observe = getattr(backoff, "observe", None)
+    attempts = 0
+    while attempts < max_attempts:
+        if is_channel_busy(rng, busy_probability):
+            if on_event:
+                on_event("busy", attempts, BUSY_WAIT)
+            yield BUSY_WAIT
+        elif is_collision_occurred(rng, collision_probability):
+            if on_event:
+                on_event("jam", attempts, JAM_DELAY)
+            yield JAM_DELAY
+            yield JAM_SIGNAL
+            attempts += 1
+            if observe:
+                observe(True)
+            delay = backoff(attempts, rng)
+            if on_event:
+                on_event("collision", attempts, delay)
+            yield delay
+        else:
+            yield frame
+            if observe:
+                observe(False)
+            if on_event:
+                on_event("sent", attempts, 0.0)
+            return True
+    if on_event:
+        on_event("dropped", attempts, 0.0)
+    return False
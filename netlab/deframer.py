@@ -0,0 +1,109 @@
+"""Потоковое выделение кадров из принятых байт."""
+from .frame import FLAG
+from .stuffing import ESCAPE_BYTE, destuff_chunk
+
+
+class Deframer:
+    """Выделитель кадров из непрерывного потока байт.
+
+    feed() принимает порции произвольного размера: кадр может прийти по
+    частям или вместе с соседними кадрами. Флаг ищется в потоке до
+    де-стаффинга: отправитель (netlab.frame.stuff_frame) экранирует каждый
+    '$' внутри кадра, поэтому начать кадр может только неэкранированный
+    флаг, и приёмник, включившийся посреди кадра, не примет за флаг '$f'
+    из данных. Байты после флага снимаются с экранирования (состояние ESC
+    переносится между порциями), каждый байт проходит один раз. Байты
+    перед флагом и после конца кадра отбрасываются - так приёмник заново
+    синхронизируется после мусора или обрыва кадра.
+
+    frame_length - длина кадра после де-стаффинга либо функция
+    (буфер, начало кадра) -> длина для кадров переменной длины; функция
+    возвращает None, если заголовок ещё не принят, и 0 для неверного
+    заголовка.
+
+    on_gap(bytes) получает отброшенные байты между кадрами (после
+    де-стаффинга) - например, jam-сигнал LAB4, который идёт без флага.
+    """
+
+    def __init__(self, frame_length, flag=FLAG, on_gap=None):
+        self.frame_length = frame_length
+        self.flag = flag
+        self.on_gap = on_gap
+        self.escaped = False
+        self.pending = b''  # Начало флага, разорванного между порциями
+        self.buffer = None  # Текущий кадр после де-стаффинга, начиная с флага; None - вне кадра
+        self.discarded = 0  # Отброшено байт при поиске флага
+
+    def feed(self, chunk):
+        """Добавляет порцию принятых байт и возвращает список готовых кадров."""
+        raw = bytes(chunk)
+        if self.pending:
+            raw = self.pending + raw
+            self.pending = b''
+        frames = []
+        pos = 0
+        while True:
+            start = self._find_flag(raw, pos)
+            if start < 0:
+                # Хвост может оказаться началом флага, разорванного между порциями
+                keep = len(raw)
+                for size in range(len(self.flag) - 1, 0, -1):
+                    if raw.endswith(self.flag[:size]) and not self._is_escaped(raw, pos, keep - size):
+                        keep -= size
+                        break
+                self._consume(raw[pos:keep], frames)
+                self.pending = raw[keep:]
+                return frames
+            self._consume(raw[pos:start], frames)
+            if self.buffer is not None:
+                # Кадр оборван следующим флагом
+                self._discard(self.buffer)
+            self.buffer = self.flag
+            pos = start + len(self.flag)
+
+    def _is_escaped(self, raw, pos, index):
+        """Экранирован ли байт raw[index]: нечётное число ESC перед ним."""
+        run = 0
+        while index - run > pos and raw[index - run - 1] == ESCAPE_BYTE[0]:
+            run += 1
+        if index - run == pos and self.escaped:
+            run += 1
+        return run % 2 == 1
+
+    def _find_flag(self, raw, pos):
+        """Первый неэкранированный флаг в raw, начиная с pos; -1, если нет."""
+        start = raw.find(self.flag, pos)
+        while start >= 0 and self._is_escaped(raw, pos, start):
+            start = raw.find(self.flag, start + 1)
+        return start
+
+    def _consume(self, part, frames):
+        """Байты до следующего флага: продолжение кадра или промежуток."""
+        if not part:
+            return
+        data, self.escaped = destuff_chunk(part, self.escaped)
+        if self.buffer is None:
+            self._discard(data)
+            return
+        self.buffer = buffer = self.buffer + data
+        length = self.frame_length
+        if callable(length):
+            length = length(buffer, 0)
+            if length is None:
+                return
+            if not length:
+                # Неверный заголовок: всё до следующего флага - мусор
+                self.buffer = None
+                self._discard(buffer)
+                return
+        if len(buffer) < length:
+            return
+        frames.append(buffer[:length])
+        self.buffer = None
+        self._discard(buffer[length:])
+
+    def _discard(self, data):
+        if data:
+            self.discarded += len(data)
+            if self.on_gap:
+                self.on_gap(bytes(data))
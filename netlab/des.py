@@ -0,0 +1,172 @@
+"""Дискретно-событийное моделирование: модельные часы вместо time.sleep.
+
+Simulator хранит события в очереди с приоритетом (heapq) по модельному
+времени и перескакивает от одного события к следующему, не ожидая.
+Процессы - генераторы, которые выдают шаги: число - пауза в секундах,
+bytes - передача в линию, занимающая len * BITS_PER_CHAR / baudrate
+секунд. Тот же генератор исполняет run_realtime с настоящими паузами и
+записью в порт, поэтому логика (например, netlab.csma.csma_cd) одна для
+обоих режимов, а при одинаковом rng совпадают и её решения.
+
+Запуск: python -m netlab.des [--frames 5000] [--baudrate 9600] [--verify 5]
+"""
+import argparse
+import heapq
+import random
+import time
+from collections import Counter
+
+from .backoff import efficiency
+from .csma import CHANNEL_BUSY_PROBABILITY, COLLISION_PROBABILITY, MAX_ATTEMPTS, calculate_backoff, csma_cd
+from .frame import create_frame
+from .transmit import line_rate
+
+
+def transmission_time(data, baudrate):
+    """Время передачи data по линии со скоростью baudrate, с."""
+    return len(data) / line_rate(baudrate)
+
+
+class Simulator:
+    """Модельные часы и очередь событий."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.events = []
+        self.order = 0  # Порядок постановки: события одного момента идут по очереди
+        self.processed = 0
+
+    def schedule(self, delay, callback, *args):
+        heapq.heappush(self.events, (self.now + delay, self.order, callback, args))
+        self.order += 1
+
+    def run(self, until=None):
+        """Обрабатывает события по порядку времени; until - граница модельного времени."""
+        events = self.events
+        while events:
+            if until is not None and events[0][0] > until:
+                self.now = until
+                break
+            self.now, _, callback, args = heapq.heappop(events)
+            self.processed += 1
+            callback(*args)
+        return self.now
+
+    def process(self, generator, baudrate, on_transmit=None, on_done=None):
+        """Запускает процесс-генератор в модельном времени.
+
+        on_transmit(время, данные) вызывается в начале каждой передачи,
+        on_done(результат) - когда генератор завершится.
+        """
+        def step():
+            try:
+                item = next(generator)
+            except StopIteration as stop:
+                if on_done:
+                    on_done(stop.value)
+                return
+            if isinstance(item, (bytes, bytearray, memoryview)):
+                if on_transmit:
+                    on_transmit(self.now, item)
+                self.schedule(transmission_time(item, baudrate), step)
+            else:
+                self.schedule(item, step)
+
+        self.schedule(0.0, step)
+
+
+def run_realtime(generator, write, sleep=time.sleep):
+    """Исполняет процесс в реальном времени: паузы - sleep, передачи - write.
+
+    Возвращает результат генератора.
+    """
+    try:
+        item = next(generator)
+        while True:
+            if isinstance(item, (bytes, bytearray, memoryview)):
+                write(item)
+            else:
+                sleep(item)
+            item = next(generator)
+    except StopIteration as stop:
+        return stop.value
+
+
+def simulate_csma_cd(frames, baudrate, seed=0, frame=None, backoff=calculate_backoff, max_attempts=MAX_ATTEMPTS,
+                     busy_probability=CHANNEL_BUSY_PROBABILITY, collision_probability=COLLISION_PROBABILITY):
+    """frames кадров LAB4 подряд по CSMA/CD в модельном времени.
+
+    Возвращает (журнал событий, модельное время, обработано событий,
+    задержки доступа переданных кадров). Журнал - список (номер кадра,
+    событие, номер попытки, задержка).
+    """
+    frame = frame or create_frame("hello", "COM1", "COM2")
+    rng = random.Random(seed)
+    sim = Simulator()
+    log = []
+    delays = []
+
+    def start(number):
+        if number == frames:
+            return
+        process = csma_cd(frame, rng, lambda event, attempt, delay: log.append((number, event, attempt, delay)),
+                          backoff, max_attempts, busy_probability, collision_probability)
+        started = sim.now
+        sim.process(process, baudrate, on_done=lambda sent: done(number, started, sent))
+
+    def done(number, started, sent):
+        if sent:
+            delays.append(sim.now - started)
+        start(number + 1)
+
+    start(0)
+    sim.run()
+    return log, sim.now, sim.processed, delays
+
+
+def realtime_csma_cd(frames, seed=0, frame=None, write=None, time_scale=1.0):
+    """То же, что simulate_csma_cd, но с настоящими паузами (time_scale сжимает их).
+
+    Возвращает (журнал событий, затраченное время, с).
+    """
+    frame = frame or create_frame("hello", "COM1", "COM2")
+    rng = random.Random(seed)
+    log = []
+    start = time.perf_counter()
+    for number in range(frames):
+        process = csma_cd(frame, rng, lambda event, attempt, delay: log.append((number, event, attempt, delay)))
+        run_realtime(process, write or (lambda data: None), lambda delay: time.sleep(delay * time_scale))
+    return log, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CSMA/CD LAB4 в модельном времени")
+    parser.add_argument("--frames", type=int, default=5000)
+    parser.add_argument("--baudrate", type=int, default=9600)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verify", type=int, default=5, help="кадров для сверки с реальным временем (0 - без сверки)")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="множитель пауз при сверке")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    log, model_time, processed, delays = simulate_csma_cd(args.frames, args.baudrate, args.seed)
+    elapsed = time.perf_counter() - start
+    events = Counter(event for _, event, _, _ in log)
+    result = efficiency(events["sent"], events["dropped"], delays, model_time)
+    print(f"Кадров: {args.frames}, передано: {events['sent']}, отброшено: {events['dropped']}, "
+          f"коллизий: {events['collision']}, канал занят: {events['busy']}")
+    print(f"Пропускная способность: {result['throughput']:.2f} кадр/с, задержка доступа "
+          f"ср/p99: {result['mean_delay']:.3f}/{result['p99_delay']:.3f} с, отброшено: {result['drop_rate']:.1%}")
+    print(f"Модельное время: {model_time:.1f} с, расчёт: {elapsed:.3f} с "
+          f"({model_time / elapsed:.0f}x быстрее реального), событий: {processed}")
+
+    if args.verify:
+        expected, expected_time, _, _ = simulate_csma_cd(args.verify, args.baudrate, args.seed)
+        actual, actual_time = realtime_csma_cd(args.verify, args.seed, time_scale=args.time_scale)
+        same = "совпадают" if actual == expected else "РАЗЛИЧАЮТСЯ"
+        print(f"Сверка на {args.verify} кадрах: журналы событий {same}; модельное время {expected_time:.2f} с, "
+              f"реальное {actual_time:.2f} с (паузы x{args.time_scale})")
+
+
+if __name__ == "__main__":
+    main()
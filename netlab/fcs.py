@@ -0,0 +1,47 @@
+"""Выбор FCS: CRC-8 по таблице, CRC-16-CCITT и CRC-32.
+
+CRC-16 и CRC-32 считаются функциями стандартной библиотеки на C
+(binascii.crc_hqx и zlib.crc32), поэтому широкая FCS почти не дороже
+CRC-8. Тип FCS передаётся в заголовке кадра (см. netlab.segment), так что
+приёмник узнаёт длину и алгоритм из самого кадра.
+"""
+import binascii
+import zlib
+
+from .crc import crc8
+
+FCS_CRC8 = 0
+FCS_CRC16 = 1
+FCS_CRC32 = 2
+FCS_NAMES = {"CRC-8": FCS_CRC8, "CRC-16": FCS_CRC16, "CRC-32": FCS_CRC32}
+
+
+def crc16(data):
+    """CRC-16-CCITT (полином 0x1021, начальное значение 0xFFFF), 2 байта."""
+    return binascii.crc_hqx(data, 0xFFFF).to_bytes(2, 'big')
+
+
+def crc32(data):
+    """CRC-32 (IEEE 802.3, как в Ethernet), 4 байта."""
+    return zlib.crc32(data).to_bytes(4, 'big')
+
+
+FCS_FUNCTIONS = {FCS_CRC8: crc8, FCS_CRC16: crc16, FCS_CRC32: crc32}
+FCS_LENGTHS = {FCS_CRC8: 1, FCS_CRC16: 2, FCS_CRC32: 4}
+
+
+def fcs_length(fcs_type):
+    """Длина FCS в байтах; ValueError для неизвестного типа."""
+    try:
+        return FCS_LENGTHS[fcs_type]
+    except KeyError:
+        raise ValueError(f"Неизвестный тип FCS: {fcs_type}") from None
+
+
+def compute_fcs(data, fcs_type=FCS_CRC8):
+    return FCS_FUNCTIONS[fcs_type](data)
+
+
+def check_fcs(data, fcs, fcs_type=FCS_CRC8):
+    """Совпадает ли принятая FCS с вычисленной по данным."""
+    return FCS_FUNCTIONS[fcs_type](data) == fcs
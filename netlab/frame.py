@@ -0,0 +1,70 @@
+"""Формат кадра лабораторных работ 2-4: флаг, адреса, данные и FCS."""
+import struct
+
+from .crc import crc8
+from .fec import fec_encode
+from .stuffing import byte_stuffing
+
+n = 5
+FLAG = f"${chr(ord('a') + n)}".encode('utf-8')
+DATA_LENGTH = n + 1
+HEADER_LENGTH = len(FLAG) + 2  # Флаг + адрес назначения + адрес источника
+FRAME_HEADER = struct.Struct(f'>{len(FLAG)}xBB')  # Флаг пропускается, адреса
+
+
+def port_address(port):
+    """1-байтовый адрес станции по последней цифре имени порта ("COM2" -> 2)."""
+    return int(port[-1]).to_bytes(1, 'big')
+
+
+def build_frame(data_bytes, destination_address, source_address, fcs):
+    """Сборка кадра без экранирования: флаг + адреса + данные + FCS."""
+    return FLAG + destination_address + source_address + data_bytes + fcs
+
+
+def stuff_frame(frame):
+    """Экранирование кадра кроме флага.
+
+    Флаг идёт по линии как есть, а каждый '$' внутри кадра экранирован,
+    поэтому неэкранированный флаг в потоке означает только начало кадра.
+    """
+    return FLAG + byte_stuffing(frame[len(FLAG):])
+
+
+def create_frame(data, source_port, dest_port, fcs_func=crc8, data_length=DATA_LENGTH, fec=False):
+    """Создание кадра с флагом, адресами, данными и FCS.
+
+    Данные дополняются нулями до data_length, FCS считается по полю данных.
+    С fec=True поле данных кодируется SECDED (netlab.fec) и занимает
+    fec_length(data_length) байт; FCS по-прежнему считается по исходным
+    данным и проверяет результат исправления.
+    При некорректном имени порта возбуждается ValueError.
+    """
+    destination_address = port_address(dest_port)
+    source_address = port_address(source_port)
+    data_bytes = data.encode('utf-8').ljust(data_length, b'\x00')
+    fcs = fcs_func(data_bytes)
+    if fec:
+        data_bytes = fec_encode(data_bytes)
+    frame = build_frame(data_bytes, destination_address, source_address, fcs)
+    return stuff_frame(frame)
+
+
+def parse_frame(frame, data_length=DATA_LENGTH):
+    """Разбор кадра после де-стаффинга на (флаг, назначение, источник, данные, FCS)."""
+    data_start = HEADER_LENGTH
+    data_end = data_start + data_length
+    return (frame[:len(FLAG)], frame[2], frame[3],
+            frame[data_start:data_end], frame[data_end:])
+
+
+def unpack_frame(frame, data_length=DATA_LENGTH):
+    """Разбор кадра без копирования на (назначение, источник, данные, FCS).
+
+    Адреса читаются struct.unpack_from, данные и FCS - срезы memoryview
+    исходного буфера (например, кадра из netlab.ringbuffer.RingBuffer).
+    """
+    destination, source = FRAME_HEADER.unpack_from(frame)
+    view = memoryview(frame)
+    data_end = HEADER_LENGTH + data_length
+    return destination, source, view[HEADER_LENGTH:data_end], view[data_end:]
@@ -0,0 +1,272 @@
+"""Метрики канала: счётчики, показатели и гистограммы задержек.
+
+Метрики хранятся в реестре Registry и обновляются прямо на путях
+передачи и приёма: Counter.inc и Histogram.record - несколько операций
+над целыми числами без блокировок, поэтому каждую метрику должен
+обновлять один поток. Реестр раз в секунду запоминает значения
+счётчиков (tick), по ним считаются скорости за последние RATE_WINDOW
+секунд, а снимок выгружается в файл в JSON или в текстовом формате
+Prometheus (export). Если задана переменная окружения NETLAB_METRICS,
+flush() пишет снимок в указанный в ней файл.
+
+Гистограмма устроена как HDR Histogram: значения переводятся в целые
+единицы (по умолчанию микросекунды), каждая октава делится на
+SUB_BUCKETS корзин, поэтому относительная погрешность процентилей не
+больше 1/SUB_BUCKETS при любом разбросе значений, а память растёт лишь
+логарифмически от максимального значения.
+"""
+import collections
+import json
+import math
+import os
+import time
+
+METRICS_ENV = "NETLAB_METRICS"  # Файл для flush(); .json - JSON, иначе формат Prometheus
+RATE_WINDOW = 5.0               # Окно расчёта скоростей, с
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+
+def bucket_index(value):
+    """Номер корзины для целого неотрицательного значения."""
+    if value < 2 * SUB_BUCKETS:
+        return max(value, 0)
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    return (shift + 1) * SUB_BUCKETS + (value >> shift) - SUB_BUCKETS
+
+
+def bucket_bounds(index):
+    """Границы корзины [нижняя, верхняя) в целых единицах."""
+    if index < 2 * SUB_BUCKETS:
+        return index, index + 1
+    shift = index // SUB_BUCKETS - 1
+    low = (index % SUB_BUCKETS + SUB_BUCKETS) << shift
+    return low, low + (1 << shift)
+
+
+class Counter:
+    """Монотонно растущий счётчик."""
+
+    kind = "counter"
+
+    def __init__(self, name, help=""):
+        self.name = name
+        self.help = help
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def snapshot(self):
+        return {"type": self.kind, "value": self.value}
+
+
+class Gauge(Counter):
+    """Текущее значение, которое может и убывать."""
+
+    kind = "gauge"
+
+    def set(self, value):
+        self.value = value
+
+    def dec(self, amount=1):
+        self.value -= amount
+
+
+class Histogram:
+    """Гистограмма с логарифмически-линейными корзинами (HDR).
+
+    unit - цена целой единицы: значения record() в секундах при unit=1e-6
+    хранятся с точностью до микросекунды.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name, help="", unit=1e-6):
+        self.name = name
+        self.help = help
+        self.unit = unit
+        self.counts = []
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, value):
+        index = bucket_index(int(value / self.unit))
+        counts = self.counts
+        if index >= len(counts):
+            counts.extend([0] * (index + 1 - len(counts)))
+        counts[index] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q):
+        """Значение, не больше которого q процентов записей (0, если записей нет)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * q / 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                low, high = bucket_bounds(index)
+                value = (low + high - 1) / 2 * self.unit
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def buckets(self):
+        """Непустые корзины: [(верхняя граница, накопленное число записей)]."""
+        result = []
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count:
+                seen += count
+                result.append((bucket_bounds(index)[1] * self.unit, seen))
+        return result
+
+    def snapshot(self):
+        return {"type": self.kind, "count": self.count, "sum": self.total,
+                "min": self.min if self.count else 0.0, "max": self.max, "mean": self.mean(),
+                "p50": self.percentile(50), "p90": self.percentile(90),
+                "p99": self.percentile(99), "p999": self.percentile(99.9)}
+
+
+class LatencyProbe:
+    """Задержка от отправки до приёма, записываемая в гистограмму.
+
+    Без ключа отправки и приёмы сопоставляются по порядку (очередь
+    ограничена limit записями). С ключом (например, номером сообщения)
+    хранится только последняя отправка с этим ключом, поэтому потерянные
+    сообщения не сбивают сопоставление остальных.
+    """
+
+    def __init__(self, histogram, limit=1024):
+        self.histogram = histogram
+        self.queue = collections.deque(maxlen=limit)
+        self.keyed = {}
+
+    def sent(self, key=None, now=None):
+        now = time.perf_counter() if now is None else now
+        if key is None:
+            self.queue.append(now)
+        else:
+            self.keyed[key] = now
+
+    def received(self, key=None, now=None):
+        """Записывает задержку; False, если отправка не найдена."""
+        now = time.perf_counter() if now is None else now
+        try:
+            start = self.queue.popleft() if key is None else self.keyed.pop(key)
+        except (IndexError, KeyError):
+            return False
+        self.histogram.record(now - start)
+        return True
+
+    def discard(self, key=None):
+        """Забывает отправку, ответа на которую уже не будет."""
+        if key is None:
+            if self.queue:
+                self.queue.popleft()
+        else:
+            self.keyed.pop(key, None)
+
+
+class Registry:
+    """Набор именованных метрик со скоростями и выгрузкой в файл."""
+
+    def __init__(self, prefix="netlab", path=None, window=RATE_WINDOW):
+        self.prefix = prefix
+        self.path = os.environ.get(METRICS_ENV) if path is None else path
+        self.window = window
+        self.metrics = {}
+        self.history = collections.deque()  # (время, {имя счётчика: значение})
+
+    def _get(self, cls, name, help, **kwargs):
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics[name] = cls(name, help, **kwargs)
+        elif type(metric) is not cls:
+            raise ValueError(f"Метрика {name} уже зарегистрирована как {metric.kind}")
+        return metric
+
+    def counter(self, name, help=""):
+        return self._get(Counter, name, help)
+
+    def gauge(self, name, help=""):
+        return self._get(Gauge, name, help)
+
+    def histogram(self, name, help="", unit=1e-6):
+        return self._get(Histogram, name, help, unit=unit)
+
+    def tick(self, now=None):
+        """Запоминает значения счётчиков для расчёта скоростей."""
+        now = time.monotonic() if now is None else now
+        values = {name: metric.value for name, metric in self.metrics.items() if metric.kind == "counter"}
+        self.history.append((now, values))
+        while len(self.history) > 2 and now - self.history[1][0] >= self.window:
+            self.history.popleft()
+
+    def rate(self, name):
+        """Прирост счётчика в секунду между первым и последним tick() в окне."""
+        if len(self.history) < 2:
+            return 0.0
+        (first_time, first), (last_time, last) = self.history[0], self.history[-1]
+        if last_time <= first_time:
+            return 0.0
+        return (last.get(name, 0) - first.get(name, 0)) / (last_time - first_time)
+
+    def snapshot(self):
+        metrics = {}
+        for name, metric in self.metrics.items():
+            metrics[name] = metric.snapshot()
+            if metric.kind == "counter":
+                metrics[name]["rate"] = self.rate(name)
+        return {"timestamp": time.time(), "metrics": metrics}
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=2)
+
+    def to_prometheus(self):
+        """Снимок в текстовом формате Prometheus (для textfile-коллектора)."""
+        lines = []
+        for name, metric in self.metrics.items():
+            full = f"{self.prefix}_{name}"
+            if metric.kind == "counter":
+                full += "_total"
+            if metric.help:
+                lines.append(f"# HELP {full} {metric.help}")
+            lines.append(f"# TYPE {full} {metric.kind}")
+            if metric.kind == "histogram":
+                for bound, count in metric.buckets():
+                    lines.append(f'{full}_bucket{{le="{bound:.9g}"}} {count}')
+                lines.append(f'{full}_bucket{{le="+Inf"}} {metric.count}')
+                lines.append(f"{full}_sum {metric.total:.9g}")
+                lines.append(f"{full}_count {metric.count}")
+            else:
+                lines.append(f"{full} {metric.value}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        """Запись снимка в файл: .json - JSON, иначе формат Prometheus.
+
+        Файл подменяется целиком (os.replace), чтобы читатель не увидел
+        недописанный снимок.
+        """
+        text = self.to_json() if path.endswith(".json") else self.to_prometheus()
+        temporary = f"{path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(temporary, path)
+
+    def flush(self):
+        """export() в файл из NETLAB_METRICS (или path), если он задан."""
+        if self.path:
+            self.export(self.path)
@@ -0,0 +1,229 @@
+"""Много каналов в одном процессе: приём всех портов одним циклом selectors.
+
+LAB1 открывает одну пару портов и считает переданные байты одним
+глобальным счётчиком. Здесь каналов сколько угодно: принимающие порты с
+файловым дескриптором (COM-порты pyserial, псевдотерминалы) ждутся одним
+selectors.DefaultSelector в одном потоке, порты без дескриптора (канал в
+памяти) опрашиваются в том же цикле по in_waiting. У каждого канала свои
+счётчики переданных и принятых байт.
+
+Запуск: python -m netlab.multilink --pairs COM1:COM2 COM3:COM4 [--seconds 5]
+        python -m netlab.multilink --links 16 [--transport pty]
+"""
+import argparse
+import selectors
+import threading
+import time
+
+from .receive import READ_TIMEOUT
+from .transport import TRANSPORT_LABELS, open_link
+
+POLL_INTERVAL = 0.01    # Период опроса портов без дескриптора, с
+REPORT_INTERVAL = 1.0   # Период вывода скоростей в демонстрации, с
+CHUNK_SIZE = 1024       # Размер порции данных в демонстрации, байт
+
+
+def parse_pairs(text):
+    """'COM1:COM2, COM6:COM5' -> [("COM1", "COM2"), ("COM6", "COM5")]."""
+    pairs = []
+    for item in text.replace(",", " ").split():
+        send_port, separator, receive_port = item.partition(":")
+        if not separator or not send_port or not receive_port:
+            raise ValueError(f"Ожидалась пара ПЕРЕДАЧА:ПРИЁМ, получено: {item}")
+        pairs.append((send_port, receive_port))
+    return pairs
+
+
+class Link:
+    """Канал: передающий и принимающий порт и счётчики байт."""
+
+    def __init__(self, tx, rx, name):
+        self.tx = tx
+        self.rx = rx
+        self.name = name
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.reads = 0
+        self.error = None
+        self.start = time.perf_counter()
+
+    def send(self, data):
+        self.tx.write(data)
+        self.bytes_sent += len(data)
+
+    def elapsed(self):
+        return max(time.perf_counter() - self.start, 1e-9)
+
+    def rate(self):
+        """Средняя скорость приёма с момента открытия, байт/с."""
+        return self.bytes_received / self.elapsed()
+
+    def close(self):
+        for port in (self.tx, self.rx):
+            if port.is_open:
+                port.close()
+
+
+def open_links(transport, pairs, baudrate):
+    """Открывает каналы по списку пар (порт передачи, порт приёма).
+
+    Для псевдотерминала и канала в памяти имена портов не важны - каждая
+    пара открывает новый канал. При ошибке уже открытые каналы закрываются.
+    """
+    links = []
+    try:
+        for send_port, receive_port in pairs:
+            tx, rx = open_link(transport, send_port, receive_port, baudrate)
+            links.append(Link(tx, rx, f"{send_port}->{receive_port}"))
+    except OSError:
+        for link in links:
+            link.close()
+        raise
+    return links
+
+
+class MultiLink:
+    """Поток приёма, обслуживающий все каналы.
+
+    Принятые байты передаются в on_data(link, data), ошибка порта - в
+    on_error(link, e); канал с ошибкой исключается из цикла, остальные
+    продолжают работать. Исключение из on_data тоже передаётся в
+    on_error, но канал остаётся в цикле.
+    """
+
+    def __init__(self, links, on_data=None, on_error=None, timeout=READ_TIMEOUT):
+        self.links = list(links)
+        self.on_data = on_data
+        self.on_error = on_error
+        self.timeout = timeout
+        self.running = True
+        self.start = time.perf_counter()
+        self.selector = selectors.DefaultSelector()
+        self.polled = []
+        for link in self.links:
+            try:
+                fd = link.rx.fileno()
+            except (AttributeError, OSError, ValueError):
+                self.polled.append(link)
+            else:
+                self.selector.register(fd, selectors.EVENT_READ, link)
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self, wait=False):
+        self.running = False
+        if wait and self.thread is not threading.current_thread():
+            self.thread.join()
+
+    def _drop(self, link, e):
+        link.error = e
+        if link in self.polled:
+            self.polled.remove(link)
+        else:
+            self.selector.unregister(link.rx.fileno())
+        if self.running and self.on_error:
+            self.on_error(link, e)
+
+    def _run(self):
+        while self.running:
+            if self.selector.get_map():
+                events = self.selector.select(POLL_INTERVAL if self.polled else self.timeout)
+            else:
+                # Ни одного дескриптора (COM-порты на Windows): select() на пустом
+                # SelectSelector завершается ошибкой, поэтому просто ждём
+                time.sleep(POLL_INTERVAL)
+                events = []
+            ready = [key.data for key, mask in events]
+            ready += [link for link in self.polled if link.rx.in_waiting]
+            for link in ready:
+                try:
+                    data = link.rx.read(link.rx.in_waiting or 1)
+                except OSError as e:  # serial.SerialException - подкласс OSError
+                    self._drop(link, e)
+                    continue
+                if data and self.running:
+                    link.reads += 1
+                    link.bytes_received += len(data)
+                    if self.on_data:
+                        try:
+                            self.on_data(link, data)
+                        except Exception as e:  # Ошибка разбора в одном канале не должна останавливать приём
+                            if self.on_error:
+                                self.on_error(link, e)
+        self.selector.close()
+
+    def totals(self):
+        """(передано, принято, суммарная скорость приёма в байт/с) по всем каналам."""
+        sent = sum(link.bytes_sent for link in self.links)
+        received = sum(link.bytes_received for link in self.links)
+        return sent, received, received / max(time.perf_counter() - self.start, 1e-9)
+
+    def report(self):
+        """Строки со скоростью каждого канала и итогом."""
+        lines = [f"{link.name}: передано {link.bytes_sent} Б, принято {link.bytes_received} Б, "
+                 f"{link.rate():.0f} Б/с" + (" (ошибка)" if link.error else "")
+                 for link in self.links]
+        sent, received, rate = self.totals()
+        lines.append(f"Всего ({len(self.links)}): передано {sent} Б, принято {received} Б, {rate:.0f} Б/с")
+        return lines
+
+
+def run_demo(links, seconds, chunk_size=CHUNK_SIZE, report_interval=REPORT_INTERVAL):
+    """Непрерывная передача по всем каналам; раз в report_interval печатает
+    скорость приёма каждого канала за интервал и суммарную."""
+    multilink = MultiLink(links)
+    chunk = bytes(range(256)) * (chunk_size // 256 + 1)
+    chunk = chunk[:chunk_size]
+    deadline = time.perf_counter() + seconds
+    next_report = time.perf_counter() + report_interval
+    previous = [0] * len(links)
+    try:
+        while time.perf_counter() < deadline:
+            for link in links:
+                # Не даём передаче уходить далеко вперёд приёма
+                if link.error is None and link.bytes_sent - link.bytes_received < 4 * chunk_size:
+                    link.send(chunk)
+            now = time.perf_counter()
+            if now >= next_report:
+                current = [link.bytes_received for link in links]
+                rates = [(c - p) / report_interval for c, p in zip(current, previous)]
+                previous = current
+                next_report = now + report_interval
+                print(f"Σ {sum(rates) / 1e6:8.3f} МБ/с | "
+                      + " ".join(f"{rate / 1e3:.0f}" for rate in rates) + " кБ/с")
+            time.sleep(0)
+        time.sleep(0.1)  # Даём приёму забрать последние порции
+        threads = threading.active_count()
+    finally:
+        multilink.stop(wait=True)
+    print("\n".join(multilink.report()))
+    print(f"Потоков (с основным): {threads}")
+    return multilink
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Много каналов с приёмом через один цикл selectors")
+    parser.add_argument("--pairs", nargs="+", help="пары ПЕРЕДАЧА:ПРИЁМ (для COM-портов)")
+    parser.add_argument("--links", type=int, default=8, help="число каналов (pty, pipe)")
+    parser.add_argument("--transport", choices=sorted(set(TRANSPORT_LABELS.values())),
+                        help="по умолчанию serial с --pairs, иначе pty")
+    parser.add_argument("--baudrate", type=int, default=115200)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--chunk", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    if args.pairs:
+        pairs = parse_pairs(" ".join(args.pairs))
+    else:
+        pairs = [(f"L{index}", f"R{index}") for index in range(args.links)]
+    transport = args.transport or ("serial" if args.pairs else "pty")
+    links = open_links(transport, pairs, args.baudrate)
+    try:
+        run_demo(links, args.seconds, args.chunk)
+    finally:
+        for link in links:
+            link.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Приём данных из COM-порта без опроса in_waiting со сном."""
+import argparse
+import selectors
+import statistics
+import threading
+import time
+
+READ_TIMEOUT = 1.0  # Максимальное время ожидания данных в одном цикле, с
+
+
+class Receiver:
+    """Поток приёма, который просыпается сразу при поступлении данных.
+
+    Если у порта есть файловый дескриптор (pyserial на POSIX, псевдотерминал),
+    поток ждёт его через selectors, иначе блокируется в read(1) с таймаутом
+    порта. Принятые байты передаются в on_data(data), ошибка порта - в
+    on_error(e), после чего поток завершается. Исключение из on_data тоже
+    передаётся в on_error, но поток продолжает приём.
+
+    С ring (netlab.ringbuffer.RingBuffer) байты читаются через readinto
+    прямо в буфер кольца, on_data получает memoryview порции, а готовые
+    кадры берутся из ring.frames().
+    """
+
+    def __init__(self, port, on_data, on_error=None, timeout=READ_TIMEOUT, ring=None):
+        self.port = port
+        self.ring = ring
+        self.on_data = on_data
+        self.on_error = on_error
+        self.timeout = timeout
+        self.running = True
+        self.reads = 0
+        self.bytes_received = 0
+        self.selector = self._make_selector()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self, wait=False):
+        """Останавливает поток приёма (не позднее чем через timeout).
+
+        С wait=True дожидается завершения потока, чтобы он не забрал из
+        порта данные, предназначенные следующему читателю.
+        """
+        self.running = False
+        if wait and self.thread is not threading.current_thread():
+            self.thread.join()
+
+    def _make_selector(self):
+        try:
+            fd = self.port.fileno()
+        except (AttributeError, OSError, ValueError):
+            return None
+        selector = selectors.DefaultSelector()
+        selector.register(fd, selectors.EVENT_READ)
+        return selector
+
+    def _read(self):
+        if self.selector is not None:
+            if not self.selector.select(self.timeout):
+                return b''
+            if self.ring is not None:
+                return self.ring.readinto(self.port)
+            return self.port.read(self.port.in_waiting or 1)
+        if self.ring is not None:
+            return self.ring.readinto(self.port)  # Блокируется до прихода байта или таймаута порта
+        data = self.port.read(1)  # Блокируется до прихода байта или таймаута порта
+        if data and self.port.in_waiting:
+            data += self.port.read(self.port.in_waiting)
+        return data
+
+    def _run(self):
+        while self.running:
+            try:
+                data = self._read()
+            except OSError as e:  # serial.SerialException - подкласс OSError
+                if self.running and self.on_error:
+                    self.on_error(e)
+                break
+            if data and self.running:
+                self.reads += 1
+                self.bytes_received += len(data)
+                try:
+                    self.on_data(data)
+                except Exception as e:  # Ошибка разбора одной порции не должна останавливать приём
+                    if self.on_error:
+                        self.on_error(e)
+        if self.selector is not None:
+            self.selector.close()
+
+
+def measure_latency(tx_port, rx_port, samples=100, timeout=READ_TIMEOUT):
+    """Замер задержки приёма на петле: от write() до вызова on_data, в секундах."""
+    arrived = threading.Event()
+    stamps = []
+
+    def on_data(data):
+        stamps.append(time.perf_counter())
+        arrived.set()
+
+    receiver = Receiver(rx_port, on_data, timeout=timeout)
+    latencies = []
+    try:
+        for _ in range(samples):
+            arrived.clear()
+            stamps.clear()
+            start = time.perf_counter()
+            tx_port.write(b'\x00')
+            if arrived.wait(timeout):
+                latencies.append(stamps[0] - start)
+            time.sleep(0.005)  # Пауза, чтобы замеры не сливались в один read()
+    finally:
+        receiver.stop(wait=True)
+    return latencies
+
+
+def main():
+    import serial
+
+    parser = argparse.ArgumentParser(description="Замер задержки приёма на петле между двумя портами")
+    parser.add_argument("send_port")
+    parser.add_argument("receive_port")
+    parser.add_argument("--baudrate", type=int, default=115200)
+    parser.add_argument("--samples", type=int, default=100)
+    args = parser.parse_args()
+
+    tx = serial.serial_for_url(args.send_port, baudrate=args.baudrate, timeout=READ_TIMEOUT)
+    rx = tx if args.receive_port == args.send_port else \
+        serial.serial_for_url(args.receive_port, baudrate=args.baudrate, timeout=READ_TIMEOUT)
+    latencies = measure_latency(tx, rx, args.samples)
+    if not latencies:
+        print("Данные не приняты")
+        return
+    ms = [x * 1000 for x in latencies]
+    print(f"Принято {len(ms)} из {args.samples}: среднее {statistics.mean(ms):.3f} мс, "
+          f"медиана {statistics.median(ms):.3f} мс, максимум {max(ms):.3f} мс")
+
+
+if __name__ == "__main__":
+    main()
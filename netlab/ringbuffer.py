@@ -0,0 +1,137 @@
+"""Приёмный буфер без лишних копий: readinto, де-стаффинг на месте и memoryview.
+
+Deframer на каждом шаге создаёт новые объекты bytes: порция из read(),
+результат де-стаффинга, каждый кадр и каждое поле кадра. Здесь память
+выделяется один раз: порт читает прямо в заранее созданный bytearray
+(readinto), экранирование снимается копированием кусков между ESC-байтами
+в кольцо, а кадры отдаются срезами memoryview этого кольца. Поля кадра
+разбираются через struct.unpack_from и срезы memoryview (netlab.frame.unpack_frame).
+
+Чтобы кадр никогда не разрывался на границе кольца, непрочитанный хвост
+переносится в начало буфера, когда в конце не хватает места.
+Размер кольца не меняется, поэтому потребление памяти при длительном
+приёме остаётся постоянным.
+"""
+from .frame import FLAG
+from .stuffing import ESCAPE_BYTE
+
+RING_SIZE = 65536  # Ёмкость кольца, байт
+READ_SIZE = 4096   # Сколько байт читать из порта за раз
+
+
+class RingBuffer:
+    """Выделитель кадров поверх заранее выделенного буфера.
+
+    frame_length - как у Deframer: длина кадра или функция
+    (буфер, начало кадра) -> длина, None (заголовок ещё не принят) или 0
+    (неверный заголовок). Кадры из frames() - memoryview, действительные
+    до следующего вызова readinto() или feed().
+    """
+
+    def __init__(self, frame_length, capacity=RING_SIZE, read_size=READ_SIZE, flag=FLAG):
+        self.frame_length = frame_length
+        self.flag = flag
+        self.buffer = bytearray(capacity)
+        self.view = memoryview(self.buffer)
+        self.raw = bytearray(read_size)  # Порция до де-стаффинга
+        self.raw_view = memoryview(self.raw)
+        self.start = 0      # Начало непрочитанных данных
+        self.end = 0        # Конец непрочитанных данных
+        self.escaped = False
+        self.discarded = 0  # Отброшено байт при поиске флага и переполнении
+
+    def readinto(self, port):
+        """Читает из порта доступные байты (не меньше одного, с таймаутом порта).
+
+        Возвращает memoryview принятой порции до де-стаффинга (пустой, если
+        данных не было).
+        """
+        size = min(port.in_waiting or 1, len(self.raw))
+        count = port.readinto(self.raw_view[:size]) or 0
+        self._destuff(count)
+        return self.raw_view[:count]
+
+    def feed(self, chunk):
+        """Добавляет порцию из памяти (для данных, полученных не из порта)."""
+        chunk = memoryview(chunk)
+        for offset in range(0, len(chunk), len(self.raw)):
+            part = chunk[offset:offset + len(self.raw)]
+            self.raw_view[:len(part)] = part
+            self._destuff(len(part))
+
+    def _reserve(self, count):
+        """Освобождает в конце кольца место под count байт."""
+        if len(self.buffer) - self.end >= count:
+            return
+        size = self.end - self.start
+        if size + count > len(self.buffer):
+            # Кадр длиннее кольца не собрать: сбрасываем накопленное
+            self.discarded += size
+            self.start = self.end = 0
+            return
+        # Переносим хвост в начало кусками, которые не перекрываются
+        step = self.start
+        for offset in range(0, size, step):
+            length = min(step, size - offset)
+            source = self.start + offset
+            self.buffer[offset:offset + length] = self.view[source:source + length]
+        self.start, self.end = 0, size
+
+    def _destuff(self, count):
+        """Снимает экранирование с count байт self.raw и дописывает их в кольцо.
+
+        Куски между ESC-байтами копируются срезами; экранированный байт
+        начинает следующий кусок, поэтому на каждый ESC одно копирование.
+        """
+        if not count:
+            return
+        self._reserve(count)
+        raw, raw_view, buffer, end = self.raw, self.raw_view, self.buffer, self.end
+        begin = 0
+        # ESC в конце прошлой порции экранирует первый байт этой
+        search = 1 if self.escaped else 0
+        self.escaped = False
+        while True:
+            escape = raw.find(ESCAPE_BYTE, search, count)
+            stop = count if escape < 0 else escape
+            buffer[end:end + stop - begin] = raw_view[begin:stop]
+            end += stop - begin
+            if escape < 0:
+                break
+            if escape + 1 == count:
+                self.escaped = True
+                break
+            begin, search = escape + 1, escape + 2
+        self.end = end
+
+    def frames(self):
+        """Готовые кадры (memoryview) в порядке приёма."""
+        buffer = self.buffer
+        flag = self.flag
+        while True:
+            start = buffer.find(flag, self.start, self.end)
+            if start < 0:
+                # Хвост может оказаться началом флага, разорванного между порциями
+                keep = max(self.start, self.end - len(flag) + 1)
+                self.discarded += keep - self.start
+                self.start = keep
+                break
+            self.discarded += start - self.start
+            length = self.frame_length
+            if callable(length):
+                length = length(self.view[:self.end], start)
+                if length is None:
+                    self.start = start
+                    break
+                if not length:
+                    # Неверный заголовок: флаг ложный, ищем следующий
+                    self.discarded += 1
+                    self.start = start + 1
+                    continue
+            if self.end - start < length:
+                self.start = start
+                break
+            self.start = start + length
+            yield self.view[start:start + length]
+        if self.start == self.end:
+            self.start = self.end = 0
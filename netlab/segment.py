@@ -0,0 +1,126 @@
+"""Кадры переменной длины: сегментация длинных сообщений и их сборка.
+
+Формат кадра после де-стаффинга:
+  флаг (2) | назначение (1) | источник (1) | номер сообщения (1) |
+  номер сегмента (2) | признаки (1) | длина данных (2) | данные | FCS
+FCS считается по всему, что идёт после флага, поэтому защищает и заголовок.
+Биты 2-3 признаков задают тип FCS (netlab.fcs), а с ним и её длину.
+"""
+import struct
+
+from .fcs import FCS_CRC8, FCS_LENGTHS, compute_fcs
+from .frame import FLAG, stuff_frame
+
+SEGMENT_HEADER = struct.Struct('>BBBHBH')  # dest, src, msg_id, seq, flags, length
+HEADER_LENGTH = len(FLAG) + SEGMENT_HEADER.size
+SEGMENT_SIZE = 1024       # Максимальная длина данных в одном кадре
+LAST_SEGMENT = 0x01       # Признак последнего сегмента сообщения
+FCS_TYPE_SHIFT = 2
+FCS_TYPE_MASK = 0x0C
+
+
+def create_segments(data, destination, source, msg_id, fcs_type=FCS_CRC8, segment_size=SEGMENT_SIZE):
+    """Разбиение сообщения на кадры с экранированием, готовые к передаче подряд.
+
+    destination и source - адреса станций (0-255), msg_id - номер сообщения
+    (0-255), fcs_type - тип FCS из netlab.fcs. Пустое сообщение занимает
+    один кадр с нулевой длиной данных.
+    """
+    view = memoryview(data)
+    offsets = range(0, max(len(view), 1), segment_size)
+    frames = []
+    for seq, offset in enumerate(offsets):
+        payload = view[offset:offset + segment_size]
+        flags = LAST_SEGMENT if offset + segment_size >= len(view) else 0
+        frames.append(stuff_frame(build_segment(destination, source, msg_id, seq, flags, payload, fcs_type)))
+    return frames
+
+
+def build_segment(destination, source, msg_id, seq, flags, payload, fcs_type=FCS_CRC8):
+    """Один кадр переменной длины без экранирования."""
+    flags |= fcs_type << FCS_TYPE_SHIFT
+    body = SEGMENT_HEADER.pack(destination, source, msg_id, seq, flags, len(payload)) + payload
+    return FLAG + body + compute_fcs(body, fcs_type)
+
+
+def segment_fcs_type(frame):
+    """Тип FCS из признаков заголовка."""
+    return (frame[HEADER_LENGTH - 3] & FCS_TYPE_MASK) >> FCS_TYPE_SHIFT
+
+
+def segment_frame_length(segment_size=SEGMENT_SIZE):
+    """Функция длины кадра для Deframer: читает поля длины и типа FCS.
+
+    Возвращает None, пока заголовок не принят целиком, и 0 для заведомо
+    неверного заголовка - тогда Deframer ищет следующий флаг.
+    """
+    def frame_length(buffer, start):
+        if len(buffer) - start < HEADER_LENGTH:
+            return None
+        length = int.from_bytes(buffer[HEADER_LENGTH - 2 + start:HEADER_LENGTH + start], 'big')
+        fcs_length = FCS_LENGTHS.get(segment_fcs_type(buffer[start:start + HEADER_LENGTH]))
+        if length > segment_size or fcs_length is None:
+            return 0
+        return HEADER_LENGTH + length + fcs_length
+
+    return frame_length
+
+
+def segment_body(frame):
+    """Часть кадра, защищённая FCS (всё между флагом и FCS)."""
+    return frame[len(FLAG):len(frame) - FCS_LENGTHS[segment_fcs_type(frame)]]
+
+
+def parse_segment(frame):
+    """Разбор кадра на (назначение, источник, номер сообщения, номер сегмента,
+    последний ли сегмент, данные, FCS)."""
+    destination, source, msg_id, seq, flags, length = SEGMENT_HEADER.unpack_from(frame, len(FLAG))
+    payload = frame[HEADER_LENGTH:HEADER_LENGTH + length]
+    fcs = frame[HEADER_LENGTH + length:]
+    return destination, source, msg_id, seq, bool(flags & LAST_SEGMENT), payload, fcs
+
+
+def check_segment(frame):
+    """Совпадает ли FCS кадра с вычисленной по заголовку и данным."""
+    fcs_type = segment_fcs_type(frame)
+    if fcs_type not in FCS_LENGTHS:
+        return False
+    body = segment_body(frame)
+    return compute_fcs(body, fcs_type) == frame[len(FLAG) + len(body):]
+
+
+class Reassembler:
+    """Сборка сообщений из сегментов, пришедших по порядку.
+
+    Сегменты одного сообщения определяются парой (источник, номер
+    сообщения). Пропуск сегмента или discard() отбрасывают недособранное
+    сообщение; число таких сообщений хранится в dropped. Данные сегмента
+    копируются, поэтому payload может быть memoryview приёмного буфера.
+    """
+
+    def __init__(self):
+        self.partial = {}  # (источник, номер сообщения) -> [ожидаемый сегмент, данные]
+        self.dropped = 0
+
+    def add(self, source, msg_id, seq, last, payload):
+        """Добавляет сегмент; возвращает сообщение целиком, когда оно собрано."""
+        key = (source, msg_id)
+        if seq == 0:
+            if key in self.partial:
+                self.dropped += 1
+            self.partial[key] = [0, bytearray()]
+        state = self.partial.get(key)
+        if state is None or state[0] != seq:
+            self.discard(source, msg_id)
+            return None
+        state[0] += 1
+        state[1] += payload
+        if last:
+            del self.partial[key]
+            return bytes(state[1])
+        return None
+
+    def discard(self, source, msg_id):
+        """Отбрасывает недособранное сообщение (например, после ошибки FCS)."""
+        if self.partial.pop((source, msg_id), None) is not None:
+            self.dropped += 1
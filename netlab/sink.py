@@ -0,0 +1,42 @@
+"""Потокобезопасный пакетный вывод в текстовые виджеты Tk."""
+import queue
+
+FPS = 30                    # Частота обновления виджета, кадров в секунду
+MAX_LINES_PER_FLUSH = 200   # Сколько записей выводится за одно обновление
+
+
+class OutputSink:
+    """Очередь вывода для виджета Text.
+
+    Потоки приёма вызывают put() - это безопасно из любого потока. Сам
+    виджет обновляется только из главного цикла Tk: таймер after() с
+    частотой fps забирает из очереди не больше max_lines_per_flush записей
+    и вставляет их одним вызовом insert().
+    """
+
+    def __init__(self, widget, fps=FPS, max_lines_per_flush=MAX_LINES_PER_FLUSH):
+        self.widget = widget
+        self.interval = max(1, round(1000 / fps))
+        self.max_lines_per_flush = max_lines_per_flush
+        self.queue = queue.SimpleQueue()
+        self.widget.after(self.interval, self._flush)
+
+    def put(self, text):
+        """Добавляет запись в очередь вывода."""
+        self.queue.put(text)
+
+    def pending(self):
+        """Число записей, ожидающих вывода."""
+        return self.queue.qsize()
+
+    def _flush(self):
+        parts = []
+        for _ in range(self.max_lines_per_flush):
+            try:
+                parts.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        if parts:
+            self.widget.insert("end", "".join(parts))
+            self.widget.see("end")
+        self.widget.after(self.interval, self._flush)
@@ -0,0 +1,56 @@
+"""Байт-стаффинг кадров: экранирование флага и ESC-байта."""
+
+ESCAPE_BYTE = b'\x1b'
+FLAG_BYTE = b'$'
+
+
+def byte_stuffing(frame):
+    """Экранирование флага и управляющих символов.
+
+    Два вызова bytes.replace выполняются на C за линейное время и на
+    практике быстрее однопроходного варианта на регулярных выражениях.
+    """
+    if not isinstance(frame, bytes):
+        frame = bytes(frame)
+    return frame.replace(ESCAPE_BYTE, ESCAPE_BYTE + ESCAPE_BYTE).replace(FLAG_BYTE, ESCAPE_BYTE + FLAG_BYTE)
+
+
+def destuff_chunk(chunk, escaped=False):
+    """Снятие экранирования с очередной порции потока.
+
+    escaped - остался ли необработанный ESC в конце предыдущей порции.
+    Возвращает (данные, escaped) для следующей порции. Данные режутся по
+    ESC-байту и склеиваются обратно, поэтому цикл на Python выполняется
+    один раз на ESC, а не на каждый байт.
+    """
+    if not isinstance(chunk, bytes):
+        chunk = bytes(chunk)
+    parts = chunk.split(ESCAPE_BYTE)
+    if escaped:
+        parts.insert(0, b'')
+    if len(parts) == 1:
+        return parts[0], False
+    out = [parts[0]]
+    pending = True  # Разделитель перед текущей частью - экранирующий ESC
+    for part in parts[1:-1]:
+        if pending and not part:
+            # Два ESC подряд: первый экранирует второй
+            out.append(ESCAPE_BYTE)
+            pending = False
+        else:
+            out.append(part)
+            pending = True
+    last = parts[-1]
+    if pending and not last:
+        return b''.join(out), True
+    out.append(last)
+    return b''.join(out), False
+
+
+def byte_destuffing(stuffed_frame):
+    """Удаление экранирующих байтов.
+
+    Одиночный ESC в самом конце кадра сохраняется как есть.
+    """
+    data, escaped = destuff_chunk(stuffed_frame)
+    return data + ESCAPE_BYTE if escaped else data
@@ -0,0 +1,236 @@
+"""Перебор параметров CSMA/CD на всех ядрах с кэшем на диске и выводом в CSV.
+
+Вместо правки констант LAB4 и наблюдения за окном параметры задаются
+сеткой: каждая точка сетки с каждым зерном - независимый прогон модели
+в модельном времени (netlab.des или netlab.bus) в отдельном процессе
+ProcessPoolExecutor. Готовая точка сразу записывается в кэш - файл,
+имя которого - хэш параметров и зерна, поэтому прерванный перебор при
+повторном запуске считает только недостающие точки. Итог - CSV: строка
+на точку сетки (показатели усреднены по зёрнам) или на каждый прогон
+(--per-seed), например пропускная способность против нагрузки.
+
+Модели:
+  lab4 - кадры LAB4 подряд, занятость канала и коллизия - броски монеты
+         (busy_probability, collision_probability);
+  bus  - общая шина со stations станциями и предлагаемой нагрузкой load.
+
+Запуск: python -m netlab.sweep busy_probability=0.1:0.9:0.1 backoff_limit=4,10 --seeds 4
+        python -m netlab.sweep model=bus stations=10,100 load=0.2:3:0.2 backoff=binary,adaptive
+        python -m netlab.sweep backoff=binary slot_time=0.001,0.01,0.05
+"""
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from . import bus
+from .backoff import SLOT_TIME, STRATEGIES, efficiency, make_backoff
+from .csma import BACKOFF_LIMIT, CHANNEL_BUSY_PROBABILITY, COLLISION_PROBABILITY, MAX_ATTEMPTS
+from .des import simulate_csma_cd, transmission_time
+from .frame import create_frame
+
+CACHE_DIR = ".sweep_cache"
+CACHE_VERSION = 2  # Увеличить, если изменилась модель: старые точки станут недействительны
+OUTPUT = "sweep.csv"
+
+# Параметры моделей и их значения по умолчанию
+MODELS = {
+    "lab4": {
+        "busy_probability": CHANNEL_BUSY_PROBABILITY,
+        "collision_probability": COLLISION_PROBABILITY,
+        "backoff": "lab4",
+        "backoff_limit": BACKOFF_LIMIT,
+        "slot_time": SLOT_TIME,
+        "attempts": MAX_ATTEMPTS,
+        "frames": 1000,
+        "baudrate": 9600,
+    },
+    "bus": {
+        "stations": 10,
+        "load": 1.0,
+        "backoff": "lab4",
+        "backoff_limit": BACKOFF_LIMIT,
+        "slot_time": SLOT_TIME,
+        "attempts": bus.ATTEMPT_LIMIT,
+        "propagation": bus.PROPAGATION,
+        "duration": bus.DURATION,
+        "baudrate": 9600,
+    },
+}
+RESULT_FIELDS = ("throughput", "utilization", "mean_delay", "p99_delay", "drop_rate", "collisions")
+DEFAULT_GRID = ["busy_probability=0.1:0.9:0.1"]
+
+
+def parse_values(text, default):
+    """'1,2,5' или 'начало:конец:шаг' (конец включительно) -> список значений типа default."""
+    kind = type(default)
+    if kind is str:
+        return text.split(",")
+    if text.count(":") == 2:
+        start, stop, step = (float(part) for part in text.split(":"))
+        count = int(round((stop - start) / step)) + 1
+        return [kind(round(start + i * step, 10)) for i in range(count)]
+    return [kind(value) for value in text.split(",")]
+
+
+def parse_grid(items):
+    """['model=bus', 'load=0.5,1'] -> {'model': ['bus'], 'load': [0.5, 1.0]}."""
+    known = {name: default for defaults in MODELS.values() for name, default in defaults.items()}
+    known["model"] = "lab4"
+    grid = {}
+    for item in items:
+        name, separator, text = item.partition("=")
+        if not separator or name not in known:
+            raise ValueError(f"Ожидалось ПАРАМЕТР=ЗНАЧЕНИЯ, параметры: {', '.join(known)}; получено: {item}")
+        grid[name] = parse_values(text, known[name])
+    for model in grid.get("model", []):
+        if model not in MODELS:
+            raise ValueError(f"Неизвестная модель: {model}")
+    for name in grid.get("backoff", []):
+        if name not in STRATEGIES:
+            raise ValueError(f"Неизвестная стратегия backoff: {name}")
+    return grid
+
+
+def expand_grid(grid):
+    """Точки сетки в порядке перебора (последний параметр меняется быстрее всех).
+
+    Параметры, которых у модели нет, в точку не попадают, поэтому
+    одинаковые точки разных сочетаний не считаются дважды.
+    """
+    names = list(grid)
+    points = []
+    seen = set()
+    for values in itertools.product(*(grid[name] for name in names)):
+        chosen = dict(zip(names, values))
+        model = chosen.get("model", "lab4")
+        point = {"model": model, **MODELS[model]}
+        point.update((name, value) for name, value in chosen.items() if name in point)
+        key = json.dumps(point, sort_keys=True)
+        if key not in seen:
+            seen.add(key)
+            points.append(point)
+    return points
+
+
+def make_point_backoff(point):
+    return make_backoff(point["backoff"], point["slot_time"], point["backoff_limit"])
+
+
+def run_point(point, seed):
+    """Один прогон модели; выполняется в процессе пула."""
+    backoff = make_point_backoff(point)
+    if point["model"] == "bus":
+        result = bus.simulate_bus(point["stations"], point["load"], point["baudrate"], point["propagation"],
+                                  point["duration"], point["attempts"], seed, backoff=backoff)
+    else:
+        frame = create_frame("hello", "COM1", "COM2")
+        log, model_time, _, delays = simulate_csma_cd(point["frames"], point["baudrate"], seed, frame, backoff,
+                                                      point["attempts"], point["busy_probability"],
+                                                      point["collision_probability"])
+        events = Counter(event for _, event, _, _ in log)
+        result = efficiency(events["sent"], events["dropped"], delays, model_time)
+        result["utilization"] = events["sent"] * transmission_time(frame, point["baudrate"]) / model_time
+        result["collisions"] = events["collision"]
+    return {field: result[field] for field in RESULT_FIELDS}
+
+
+def cache_key(point, seed):
+    text = json.dumps({"version": CACHE_VERSION, "point": point, "seed": seed}, sort_keys=True)
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def load_cached(cache_dir, key):
+    try:
+        with open(os.path.join(cache_dir, f"{key}.json"), encoding="utf-8") as f:
+            return json.load(f)["result"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def save_cached(cache_dir, key, point, seed, result):
+    """Запись точки в кэш; файл подменяется целиком, как в Registry.export."""
+    path = os.path.join(cache_dir, f"{key}.json")
+    temporary = f"{path}.tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump({"point": point, "seed": seed, "result": result}, f)
+    os.replace(temporary, path)
+
+
+def run_sweep(grid, seeds=1, cache_dir=CACHE_DIR, workers=None, report=print):
+    """Все точки сетки с зёрнами 0..seeds-1; возвращает строки (параметры, seed, показатели)."""
+    jobs = [(point, seed) for point in expand_grid(grid) for seed in range(seeds)]
+    results = {}
+    pending = []
+    for point, seed in jobs:
+        key = cache_key(point, seed)
+        result = load_cached(cache_dir, key)
+        if result is None:
+            pending.append((key, point, seed))
+        else:
+            results[key] = result
+    report(f"Прогонов: {len(jobs)}, из кэша: {len(results)}, осталось: {len(pending)}")
+    if pending:
+        os.makedirs(cache_dir, exist_ok=True)
+        start = time.perf_counter()
+        with ProcessPoolExecutor(workers) as pool:
+            futures = {pool.submit(run_point, point, seed): (key, point, seed) for key, point, seed in pending}
+            try:
+                for done, future in enumerate(as_completed(futures), 1):
+                    key, point, seed = futures[future]
+                    results[key] = future.result()
+                    save_cached(cache_dir, key, point, seed, results[key])
+                    report(f"[{done}/{len(pending)}] {time.perf_counter() - start:.1f} с")
+            except KeyboardInterrupt:
+                # Готовые точки уже в кэше; ещё не начатые не ждём
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+    return [{**point, "seed": seed, **results[cache_key(point, seed)]} for point, seed in jobs]
+
+
+def average_seeds(rows):
+    """Строка на точку сетки: показатели усреднены по зёрнам."""
+    groups = {}
+    for row in rows:
+        point = {name: value for name, value in row.items() if name != "seed" and name not in RESULT_FIELDS}
+        groups.setdefault(json.dumps(point, sort_keys=True), (point, []))[1].append(row)
+    averaged = []
+    for point, group in groups.values():
+        averaged.append({**point, "seeds": len(group),
+                         **{field: sum(row[field] for row in group) / len(group) for field in RESULT_FIELDS}})
+    return averaged
+
+
+def write_csv(rows, path):
+    fields = []
+    for row in rows:
+        fields.extend(name for name in row if name not in fields)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fields, restval="")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Перебор параметров CSMA/CD с кэшем и выводом в CSV")
+    parser.add_argument("grid", nargs="*", default=DEFAULT_GRID,
+                        help="ПАРАМЕТР=v1,v2 или ПАРАМЕТР=начало:конец:шаг; model=lab4,bus")
+    parser.add_argument("--seeds", type=int, default=1, help="зёрен на точку")
+    parser.add_argument("--workers", type=int, default=None, help="процессов (по умолчанию - все ядра)")
+    parser.add_argument("--cache", default=CACHE_DIR)
+    parser.add_argument("--output", default=OUTPUT)
+    parser.add_argument("--per-seed", action="store_true", help="строка на каждый прогон, без усреднения")
+    args = parser.parse_args()
+
+    rows = run_sweep(parse_grid(args.grid), args.seeds, args.cache, args.workers)
+    write_csv(rows if args.per_seed else average_seeds(rows), args.output)
+    print(f"Записано: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Фоновая передача данных в COM-порт целыми буферами."""
+import queue
+import threading
+import time
+
+BITS_PER_CHAR = 10  # 8N1: старт-бит + 8 бит данных + стоп-бит
+CHUNK_SIZE = 256    # Размер блока для одного вызова write()
+
+
+def line_rate(baudrate, bits_per_char=BITS_PER_CHAR):
+    """Теоретическая скорость линии в байтах в секунду."""
+    return baudrate / bits_per_char
+
+
+class TokenBucket:
+    """Маркерная корзина: ограничивает запись заданной скоростью (байт/с)."""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.timestamp = time.perf_counter()
+
+    def consume(self, amount):
+        """Забирает amount маркеров, при нехватке ждёт их накопления."""
+        now = time.perf_counter()
+        self.tokens = min(self.capacity, self.tokens + (now - self.timestamp) * self.rate)
+        self.timestamp = now
+        self.tokens -= amount
+        if self.tokens < 0:
+            time.sleep(-self.tokens / self.rate)
+
+
+class Transmitter:
+    """Передатчик, который пишет сообщения в порт в отдельном потоке.
+
+    Без темпирования сообщение уходит блоками по chunk_size байт, с
+    темпированием - по одному байту со скоростью линии (маркерная корзина
+    по port.baudrate). После каждого сообщения вызывается
+    on_sent(число байт, время передачи), при ошибке порта - on_error(e).
+    """
+
+    def __init__(self, port, chunk_size=CHUNK_SIZE, on_sent=None, on_error=None):
+        self.port = port
+        self.chunk_size = chunk_size
+        self.on_sent = on_sent
+        self.on_error = on_error
+        self.bytes_sent = 0
+        self.busy_time = 0.0
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def submit(self, data, paced=False):
+        """Ставит данные в очередь на передачу и сразу возвращает управление."""
+        self.queue.put((bytes(data), paced))
+
+    def close(self, wait=False):
+        """Останавливает поток после передачи уже поставленных данных."""
+        self.queue.put(None)
+        if wait:
+            self.thread.join()
+
+    def max_rate(self):
+        """Теоретический максимум для текущей скорости порта, байт/с."""
+        return line_rate(self.port.baudrate)
+
+    def achieved_rate(self):
+        """Фактическая средняя скорость передачи, байт/с."""
+        return self.bytes_sent / self.busy_time if self.busy_time else 0.0
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            data, paced = item
+            start = time.perf_counter()
+            try:
+                if paced:
+                    self._write_paced(data)
+                else:
+                    self._write_chunks(data)
+                self.port.flush()
+            except OSError as e:  # serial.SerialException - подкласс OSError
+                if self.on_error:
+                    self.on_error(e)
+                continue
+            elapsed = time.perf_counter() - start
+            self.bytes_sent += len(data)
+            self.busy_time += elapsed
+            if self.on_sent:
+                self.on_sent(len(data), elapsed)
+
+    def _write_chunks(self, data):
+        view = memoryview(data)
+        for i in range(0, len(view), self.chunk_size):
+            self.port.write(view[i:i + self.chunk_size])
+
+    def _write_paced(self, data):
+        view = memoryview(data)
+        bucket = TokenBucket(self.max_rate())
+        for i in range(len(view)):
+            bucket.consume(1)
+            self.port.write(view[i:i + 1])
@@ -0,0 +1,223 @@
+"""Транспорт между передающим и принимающим портом.
+
+Поддерживаются три варианта:
+  serial - настоящие или виртуальные COM-порты через pyserial;
+  pty    - пара концов псевдотерминала (POSIX), аппаратура не нужна;
+  pipe   - канал в памяти процесса, данные передаются без копирования.
+Все порты повторяют нужную лабораторным часть интерфейса serial.Serial:
+write, read, readinto, in_waiting, flush, close, is_open, baudrate, timeout.
+pyserial импортируется только при открытии COM-порта.
+"""
+import collections
+import os
+import select
+import struct
+import threading
+import time
+
+PORT_TIMEOUT = 1  # Таймаут чтения порта, с
+
+TRANSPORT_LABELS = {
+    "COM-порты": "serial",
+    "Псевдотерминал": "pty",
+    "Память": "pipe",
+}
+
+
+def open_serial(port, baudrate, timeout=PORT_TIMEOUT):
+    """Открытие COM-порта через pyserial.
+
+    Ошибки открытия - serial.SerialException, подкласс OSError, поэтому
+    вызывающему коду достаточно перехватывать OSError.
+    """
+    import serial
+
+    return serial.Serial(port, baudrate=baudrate, timeout=timeout)
+
+
+class FdPort:
+    """Порт поверх файлового дескриптора (конец псевдотерминала)."""
+
+    def __init__(self, fd, baudrate, timeout=PORT_TIMEOUT, name=None):
+        self.fd = fd
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.name = name
+        self.is_open = True
+
+    def fileno(self):
+        return self.fd
+
+    @property
+    def in_waiting(self):
+        import fcntl
+        import termios
+
+        return struct.unpack('I', fcntl.ioctl(self.fd, termios.FIONREAD, b'\0\0\0\0'))[0]
+
+    def write(self, data):
+        view = memoryview(data)
+        while view:
+            written = os.write(self.fd, view)
+            view = view[written:]
+        return len(data)
+
+    def read(self, size=1):
+        out = bytearray(size)
+        del out[self.readinto(out):]
+        return bytes(out)
+
+    def readinto(self, buffer):
+        """Чтение прямо в buffer (os.readv, без промежуточных bytes)."""
+        view = memoryview(buffer)
+        filled = 0
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while filled < len(view):
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not select.select([self.fd], [], [], remaining)[0]:
+                break
+            count = os.readv(self.fd, [view[filled:]])
+            if not count:
+                break
+            filled += count
+        return filled
+
+    def flush(self):
+        pass
+
+    def close(self):
+        if self.is_open:
+            self.is_open = False
+            os.close(self.fd)
+
+
+class _PipeBuffer:
+    """Очередь буферов одного направления канала в памяти."""
+
+    def __init__(self):
+        self.chunks = collections.deque()
+        self.size = 0
+        self.offset = 0  # Сколько байт первого буфера уже прочитано
+        self.ready = threading.Condition()
+
+
+class PipePort:
+    """Конец канала в памяти: write() передаёт ссылку на буфер, не копируя его.
+
+    Канал дуплексный: порт читает из buffer и пишет в peer_buffer.
+    """
+
+    def __init__(self, buffer, peer_buffer, baudrate, timeout=PORT_TIMEOUT, name=None):
+        self.buffer = buffer
+        self.peer_buffer = peer_buffer
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.name = name
+        self.is_open = True
+
+    @property
+    def in_waiting(self):
+        return self.buffer.size
+
+    def write(self, data):
+        if not self.is_open:
+            raise OSError("Порт закрыт")
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        buffer = self.peer_buffer
+        with buffer.ready:
+            buffer.chunks.append(data)
+            buffer.size += len(data)
+            buffer.ready.notify_all()
+        return len(data)
+
+    def read(self, size=1):
+        buffer = self.buffer
+        with buffer.ready:
+            if not buffer.ready.wait_for(lambda: buffer.size or not self.is_open, self.timeout):
+                return b''
+            if len(buffer.chunks) == 1 and buffer.offset == 0 and len(buffer.chunks[0]) <= size:
+                # Весь буфер целиком - отдаём тот же объект без копирования
+                data = buffer.chunks.popleft()
+                buffer.size -= len(data)
+                return bytes(data)
+            out = bytearray()
+            while buffer.chunks and len(out) < size:
+                chunk = buffer.chunks[0]
+                take = min(size - len(out), len(chunk) - buffer.offset)
+                out += memoryview(chunk)[buffer.offset:buffer.offset + take]
+                buffer.offset += take
+                if buffer.offset == len(chunk):
+                    buffer.chunks.popleft()
+                    buffer.offset = 0
+            buffer.size -= len(out)
+            return bytes(out)
+
+    def readinto(self, target):
+        """Копирование принятых байт прямо в target."""
+        view = memoryview(target)
+        buffer = self.buffer
+        with buffer.ready:
+            if not buffer.ready.wait_for(lambda: buffer.size or not self.is_open, self.timeout):
+                return 0
+            filled = 0
+            while buffer.chunks and filled < len(view):
+                chunk = buffer.chunks[0]
+                take = min(len(view) - filled, len(chunk) - buffer.offset)
+                view[filled:filled + take] = memoryview(chunk)[buffer.offset:buffer.offset + take]
+                filled += take
+                buffer.offset += take
+                if buffer.offset == len(chunk):
+                    buffer.chunks.popleft()
+                    buffer.offset = 0
+            buffer.size -= filled
+            return filled
+
+    def flush(self):
+        pass
+
+    def close(self):
+        with self.buffer.ready:
+            self.is_open = False
+            self.buffer.ready.notify_all()
+
+
+def open_pty_pair(baudrate, timeout=PORT_TIMEOUT):
+    """Пара портов на псевдотерминале: запись в первый читается из второго."""
+    if not hasattr(os, 'openpty'):
+        raise OSError("Псевдотерминалы недоступны на этой платформе")
+    import tty
+
+    master, slave = os.openpty()
+    tty.setraw(slave)
+    name = os.ttyname(slave)
+    return FdPort(master, baudrate, timeout, name), FdPort(slave, baudrate, timeout, name)
+
+
+def open_pipe_pair(baudrate, timeout=PORT_TIMEOUT):
+    """Пара портов на канале в памяти: запись в один читается из другого."""
+    forward, backward = _PipeBuffer(), _PipeBuffer()
+    return (PipePort(backward, forward, baudrate, timeout, "pipe"),
+            PipePort(forward, backward, baudrate, timeout, "pipe"))
+
+
+def open_link(transport, send_port, receive_port, baudrate, timeout=PORT_TIMEOUT):
+    """Открывает передающий и принимающий порт выбранного транспорта.
+
+    transport - "serial", "pty", "pipe" или подпись из TRANSPORT_LABELS.
+    Имена портов нужны только для COM-портов.
+    """
+    transport = TRANSPORT_LABELS.get(transport, transport)
+    if transport == "serial":
+        tx = open_serial(send_port, baudrate, timeout)
+        try:
+            rx = open_serial(receive_port, baudrate, timeout)
+        except OSError:
+            tx.close()
+            raise
+        return tx, rx
+    if transport == "pty":
+        return open_pty_pair(baudrate, timeout)
+    if transport == "pipe":
+        return open_pipe_pair(baudrate, timeout)
+    raise ValueError(f"Неизвестный транспорт: {transport}")
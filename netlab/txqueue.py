@@ -0,0 +1,107 @@
+"""Ограниченная очередь передачи с одним потоком-обработчиком.
+
+Вместо потока на каждый кадр кадры ставятся в очередь и передаются по
+одному в порядке постановки (FIFO) одним долгоживущим потоком, поэтому
+запись в порт, счётчики и вывод не гоняются между собой. Глубина
+очереди ограничена; что делать с кадром, когда она заполнена, задаёт
+политика:
+  block    - submit ждёт свободного места (не дольше timeout);
+  drop_new - новый кадр не принимается, submit возвращает False;
+  drop_old - из начала очереди выбрасывается самый старый кадр.
+С реестром метрик очередь ведёт глубину, время ожидания в очереди и
+число принятых и отброшенных кадров.
+"""
+import collections
+import threading
+import time
+
+QUEUE_SIZE = 16
+POLICIES = ("block", "drop_new", "drop_old")
+
+
+class TxQueue:
+    """Очередь кадров на передачу, обслуживаемая потоком handler(кадр).
+
+    on_drop(кадр) вызывается для кадров, отброшенных политикой,
+    on_error(e) - при любом исключении в handler (ошибка порта и т.п.);
+    после этого поток продолжает обслуживать очередь.
+    """
+
+    def __init__(self, handler, maxsize=QUEUE_SIZE, policy="block", metrics=None, name="tx_queue",
+                 on_drop=None, on_error=None):
+        if policy not in POLICIES:
+            raise ValueError(f"Неизвестная политика очереди: {policy}")
+        self.handler = handler
+        self.maxsize = maxsize
+        self.policy = policy
+        self.on_drop = on_drop
+        self.on_error = on_error
+        self.items = collections.deque()  # (кадр, момент постановки)
+        self.condition = threading.Condition()
+        self.closed = False
+        self.depth = self.wait = self.enqueued = self.dropped = None
+        if metrics is not None:
+            self.depth = metrics.gauge(f"{name}_depth", "Кадров в очереди передачи")
+            self.wait = metrics.histogram(f"{name}_wait_seconds", "Ожидание кадра в очереди передачи, с")
+            self.enqueued = metrics.counter(f"{name}_enqueued", "Кадров поставлено в очередь передачи")
+            self.dropped = metrics.counter(f"{name}_dropped", "Кадров отброшено очередью передачи")
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def __len__(self):
+        return len(self.items)
+
+    def submit(self, item, timeout=None):
+        """Ставит кадр в конец очереди; False, если он не принят."""
+        evicted = None
+        accepted = True
+        with self.condition:
+            if self.closed:
+                return False
+            if len(self.items) >= self.maxsize:
+                if self.policy == "block":
+                    self.condition.wait_for(lambda: len(self.items) < self.maxsize or self.closed, timeout)
+                    accepted = not self.closed and len(self.items) < self.maxsize
+                elif self.policy == "drop_new":
+                    accepted = False
+                else:
+                    evicted = self.items.popleft()[0]
+                if not accepted:
+                    evicted = item
+                if evicted is not None and self.dropped is not None:
+                    self.dropped.inc()
+            if accepted:
+                self.items.append((item, time.perf_counter()))
+                if self.enqueued is not None:
+                    self.enqueued.inc()
+                    self.depth.set(len(self.items))
+                self.condition.notify_all()
+        if evicted is not None and self.on_drop:
+            self.on_drop(evicted)
+        return accepted
+
+    def close(self, wait=False):
+        """Останавливает поток после передачи уже поставленных кадров."""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        if wait:
+            self.thread.join()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.items or self.closed)
+                if not self.items:
+                    break
+                item, queued = self.items.popleft()
+                if self.depth is not None:
+                    self.depth.set(len(self.items))
+                self.condition.notify_all()  # Освободилось место для block
+            if self.wait is not None:
+                self.wait.record(time.perf_counter() - queued)
+            try:
+                self.handler(item)
+            except Exception as e:  # Единственный поток не должен молча завершиться - иначе очередь просто заполнится
+                if self.on_error:
+                    self.on_error(e)
@@ -0,0 +1,37 @@
+"""Выделение кадров netlab.deframer.Deframer."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from netlab.deframer import Deframer
+from netlab.frame import DATA_LENGTH, HEADER_LENGTH, create_frame
+from netlab.stuffing import byte_destuffing
+
+FRAME_LENGTH = HEADER_LENGTH + DATA_LENGTH + 1
+
+
+def test_escaped_flag_in_data_is_not_a_frame_start():
+    """Приёмник включился посреди кадра с '$f' в данных: ложного кадра нет, следующие не теряются."""
+    first = create_frame("x$fyz", "COM1", "COM2")
+    second = create_frame("hello", "COM1", "COM2")
+    third = create_frame("h", "COM1", "COM2")
+    frames = Deframer(FRAME_LENGTH).feed(first[5:] + second + third)
+    assert frames == [byte_destuffing(second), byte_destuffing(third)]
+
+
+def test_frames_split_between_chunks():
+    frames = [create_frame(text, "COM1", "COM2") for text in ("$f", "\x1b", "a$\x1b$f")]
+    stream = b"".join(frames)
+    deframer = Deframer(FRAME_LENGTH)
+    received = []
+    for i in range(len(stream)):
+        received += deframer.feed(stream[i:i + 1])
+    assert received == [byte_destuffing(frame) for frame in frames]
+
+
+def test_gap_between_frames():
+    gaps = []
+    frame = create_frame("hi", "COM1", "COM2")
+    frames = Deframer(FRAME_LENGTH, on_gap=gaps.append).feed(frame + b"JAM" + frame)
+    assert len(frames) == 2
+    assert b"".join(gaps) == b"JAM"